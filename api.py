@@ -0,0 +1,310 @@
+"""Optional local JSON API serving the dashboard's numbers to other tools.
+
+A small ASGI app (Starlette, installed with Streamlit) over the same
+Streamlit-free modules the dashboard uses, so a request costs one filter
+and one aggregation instead of a full script rerun::
+
+    python api.py --port 8600                 # needs uvicorn (pip install uvicorn)
+    uvicorn api:app --port 8600 --workers 1
+
+Endpoints (GET):
+
+    /api/health                    dataset version and row count
+    /api/count                     postings matching the filters
+    /api/top/<dimension>           top skills, companies, cities or titles (?n=10&weight=applicants)
+    /api/summary                   the summary report (?format=json|markdown|html)
+    /api/forecast                  Prophet forecast (?by=overall|city|skill&value=...&days=90)
+
+Filters mirror the sidebar: repeat ``skill``, ``city`` and ``experience``;
+``salary``, ``experience_years`` and ``applicants`` take ``low,high``;
+``open_on`` a date; ``distinct=true`` drops cross-portal duplicates and
+``q`` is a keyword search.
+
+A response is fully determined by the dataset version and the request, so
+its ETag is derived from those alone: a conditional request whose
+``If-None-Match`` matches gets a 304 before anything is computed, and
+bodies are kept in an LRU keyed the same way. A changed dataset file is
+reloaded on the next request, which changes every ETag. Forecast fits run
+on the background job runner; until one finishes the endpoint answers 202
+with the job status, so clients poll.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from job_data import DATA_PATH, JobDataset, count_values, dataset_version, version_timestamp
+from job_runner import JobRunner
+from reporting import summarize, summary_html, summary_markdown
+from telemetry import TELEMETRY
+
+API_VERSION = 1  # part of every ETag, so a changed response format invalidates clients' copies
+CACHE_SIZE = 512
+MAX_TOP = 100
+DIMENSIONS = {'companies': 'Company Name', 'cities': 'Job Location', 'titles': 'Job Title'}
+RANGE_FILTERS = {'salary': 'salary_range', 'experience_years': 'experience_range', 'applicants': 'applicants_range'}
+FORECAST_BY = ('overall', 'city', 'skill')
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class DatasetHolder:
+    """The dataset, reloaded when the file's version changes."""
+
+    def __init__(self, path=DATA_PATH):
+        self.path = path
+        self._dataset = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = dataset_version(self.path)
+        if self._dataset is None or self._dataset.version != version:
+            with self._lock:
+                if self._dataset is None or self._dataset.version != version:
+                    self._dataset = JobDataset.load(self.path)
+        return self._dataset
+
+
+class ResponseCache:
+    """LRU of encoded response bodies keyed by dataset version and request."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def _range(text, name):
+    try:
+        low, high = (int(part) for part in text.split(','))
+    except ValueError:
+        raise BadRequest(name + " must be 'low,high'")
+    return low, high
+
+
+def parse_filters(params):
+    """``JobDataset.filter_rows`` arguments from query parameters."""
+    filters = {'skills': tuple(params.getlist('skill')), 'cities': tuple(params.getlist('city')),
+               'experience': tuple(params.getlist('experience'))}
+    for name, argument in RANGE_FILTERS.items():
+        if params.get(name):
+            filters[argument] = _range(params[name], name)
+    if params.get('open_on'):
+        try:
+            filters['open_on'] = pd.Timestamp(params['open_on']).date()
+        except ValueError:
+            raise BadRequest("open_on must be a date")
+    filters['distinct'] = params.get('distinct', '').lower() in ('1', 'true', 'yes')
+    filters['query'] = params.get('q', '')
+    return filters
+
+
+def _int_param(params, name, default, low, high):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(name + " must be an integer")
+    return min(max(value, low), high)
+
+
+def canonical(params):
+    return tuple(sorted(params.multi_items()))
+
+
+def request_key(request):
+    """The request in canonical form: path plus sorted query parameters."""
+    return (API_VERSION, request.url.path, canonical(request.query_params))
+
+
+def etag_for(version, key):
+    return '"' + hashlib.sha1(repr((version, key)).encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def _json(payload):
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class JobMarketAPI:
+    """Endpoint implementations; ``routes`` wires them into the Starlette app."""
+
+    def __init__(self, path=DATA_PATH, runner=None, cache_size=CACHE_SIZE):
+        self.datasets = DatasetHolder(path)
+        self.cache = ResponseCache(cache_size)
+        self.runner = runner or JobRunner(max_workers=2)
+
+    def endpoint(self, name, compute):
+        """Wrap ``compute(dataset, params, **path_params)`` -> (status, media type, body) with ETags and caching."""
+        def handle(request):
+            started = time.perf_counter()
+            try:
+                dataset = self.datasets.get()
+            except Exception as e:
+                logging.error(f"API could not load the dataset: {str(e)}")
+                return JSONResponse({"error": "dataset unavailable"}, status_code=503)
+            key = request_key(request)
+            etag = etag_for(dataset.version, key)
+            headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Dataset-Version": dataset.version}
+            if etag in [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(',')]:
+                TELEMETRY.record("API", name + " (304)", time.perf_counter() - started)
+                return Response(status_code=304, headers=headers)
+            entry = self.cache.get((dataset.version, key))
+            TELEMETRY.cache_event("API." + name, entry is not None)
+            if entry is None:
+                try:
+                    status, media_type, body = compute(dataset, request.query_params, **request.path_params)
+                except BadRequest as e:
+                    return JSONResponse({"error": str(e)}, status_code=400)
+                except Exception as e:
+                    logging.error(f"API error in {name}: {str(e)}")
+                    return JSONResponse({"error": str(e)}, status_code=500)
+                if status != 200:
+                    # Pending results (a forecast still fitting) are neither cached nor tagged.
+                    return Response(body, status_code=status, media_type=media_type)
+                entry = (media_type, body)
+                self.cache.put((dataset.version, key), entry)
+            TELEMETRY.record("API", name, time.perf_counter() - started)
+            return Response(entry[1], media_type=entry[0], headers=headers)
+        return handle
+
+    def health(self, dataset, params):
+        return 200, "application/json", _json({"version": dataset.version, "rows": len(dataset)})
+
+    def count(self, dataset, params):
+        rows = dataset.filter_rows(**parse_filters(params))
+        return 200, "application/json", _json({"version": dataset.version,
+                                               "count": len(dataset) if rows is None else len(rows),
+                                               "total": len(dataset)})
+
+    def top(self, dataset, params, dimension):
+        if dimension != 'skills' and dimension not in DIMENSIONS:
+            raise BadRequest("dimension must be one of skills, " + ", ".join(DIMENSIONS))
+        n = _int_param(params, 'n', 10, 1, MAX_TOP)
+        weight = params.get('weight', 'postings')
+        if weight not in ('postings', 'applicants'):
+            raise BadRequest("weight must be postings or applicants")
+        rows = dataset.filter_rows(**parse_filters(params))
+        weights = dataset.applicants(rows).astype(np.int64) if weight == 'applicants' else None
+        if dimension == 'skills':
+            counts = dataset.skills.top(rows, n, weights)
+        else:
+            counts = count_values(dataset.select(rows)[DIMENSIONS[dimension]], weights).head(n)
+        items = [{"name": str(name), "count": int(count)} for name, count in counts.items()]
+        return 200, "application/json", _json({"version": dataset.version, "dimension": dimension,
+                                               "weight": weight, "items": items})
+
+    def summary(self, dataset, params):
+        output = params.get('format', 'json')
+        summary = summarize(dataset, dataset.filter_rows(**parse_filters(params)))
+        # Dated by the dataset rather than the clock, so a body served again after a 304 stays the same.
+        generated = version_timestamp(dataset.version)
+        if output == 'markdown':
+            return 200, "text/markdown; charset=utf-8", summary_markdown(summary, generated=generated).encode('utf-8')
+        if output == 'html':
+            return 200, "text/html; charset=utf-8", summary_html(summary, generated=generated).encode('utf-8')
+        if output != 'json':
+            raise BadRequest("format must be json, markdown or html")
+        return 200, "application/json", _json({
+            "version": dataset.version, "total_jobs": summary['Total Jobs'],
+            "top_skills": [{"name": name, "count": count} for name, count in summary['Top Skills']],
+            "top_cities": [{"name": str(name), "count": count} for name, count in summary['Top Cities'].items()],
+            "top_companies": [{"name": str(name), "count": count}
+                              for name, count in summary['Top Companies'].items()]})
+
+    def forecast(self, dataset, params):
+        # Prophet is slow to import, so it is only loaded when a forecast is requested.
+        from forecasting import FORECAST_DAYS, daily_counts, fit_forecast, forecast_table
+        by = params.get('by', 'overall')
+        if by not in FORECAST_BY:
+            raise BadRequest("by must be one of " + ", ".join(FORECAST_BY))
+        days = _int_param(params, 'days', FORECAST_DAYS, 1, 365)
+        value = params.get('value', '')
+        if by == 'overall':
+            ts_df = daily_counts(dataset.select(dataset.filter_rows(**parse_filters(params)))['Posted Date'])
+        elif not value:
+            raise BadRequest("value is required for by=" + by)
+        elif by == 'city':
+            frame = dataset.frame
+            ts_df = daily_counts(frame.loc[frame['Job Location'] == value, 'Posted Date'])
+        else:
+            ts_df = dataset.skill_timeline.daily_counts(value)
+        if len(ts_df) < 2 or ts_df['y'].sum() == 0:
+            raise BadRequest("not enough postings to forecast")
+        job_id = self.runner.submit(("forecast", dataset.version, canonical(params), days),
+                                    fit_forecast, ts_df, days)
+        job = self.runner.get(job_id)
+        if not job.done:
+            return 202, "application/json", _json({"status": job.status, "job": job_id,
+                                                   "seconds": round(job.elapsed, 1)})
+        if job.error is not None:
+            raise job.error
+        _, forecast = job.result
+        table = forecast_table(forecast)
+        table['Date'] = table['Date'].dt.strftime('%Y-%m-%d')
+        return 200, "application/json", _json({"version": dataset.version, "by": by, "value": value or None,
+                                               "days": days, "forecast": table.to_dict(orient='records')})
+
+    def routes(self):
+        return [Route("/api/health", self.endpoint("health", self.health)),
+                Route("/api/count", self.endpoint("count", self.count)),
+                Route("/api/top/{dimension}", self.endpoint("top", self.top)),
+                Route("/api/summary", self.endpoint("summary", self.summary)),
+                Route("/api/forecast", self.endpoint("forecast", self.forecast))]
+
+
+def create_app(path=DATA_PATH, runner=None):
+    """The ASGI app; the dataset is loaded on the first request."""
+    api = JobMarketAPI(path, runner)
+    app = Starlette(routes=api.routes())
+    app.state.api = api
+    return app
+
+
+def __getattr__(name):
+    # ``uvicorn api:app`` builds the app (and its job runner) on first access rather than at import,
+    # so main() and other importers do not start a second one.
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the job market API locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--data", default=DATA_PATH, help="dataset CSV (default: %(default)s)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The API server needs uvicorn: pip install uvicorn")
+    uvicorn.run(create_app(args.data), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ from collections import Counter
 import plotly.express as px
 from streamlit_lottie import st_lottie
 import requests
-from prophet import Prophet
 from prophet.plot import plot_plotly
 import matplotlib.pyplot as plt
 import os
@@ -15,8 +14,26 @@ from datetime import datetime
 import plotly.graph_objects as go
 import json
 import time
+import uuid
 import logging
 import io
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from chatbot import FALLBACK_RESPONSE, chatbot_reply
+from facets import FACETS
+from forecasting import (BACKTEST_FOLDS, BACKTEST_HORIZON, ENGINE_SETTINGS, FORECAST_DAYS, TRUSTED_COVERAGE,
+                         TRUSTED_MAPE, backtest, backtest_series, daily_counts, fit_forecast, forecast_table)
+from job_data import DATA_PATH, JobDataset, count_values, recent_postings
+from job_runner import JobRunner
+from memory import SessionRegistry, deep_sizeof, format_bytes, session_footprint
+from plotting import MAX_SCATTER_POINTS, scatter_data
+from recommender import DEFAULT_RECOMMENDATIONS
+from reporting import report_bundle, summarize, summary_markdown
+from search import tokenize
+from skills import SkillTrends
+from storage import (FEEDBACK_HEADER, FEEDBACK_PATH, UNRECOGNIZED_HEADER, UNRECOGNIZED_PATH, BackgroundWriter,
+                     load_profiles, profile_user, save_profile)
+from telemetry import TELEMETRY, RerunProfiler, pyinstrument_available
+from tracker import STATUSES, TRACKER_PATH, ApplicationTracker
 
 # Configure Logging
 logging.basicConfig(filename='app.log', level=logging.INFO,
@@ -25,6 +42,22 @@ logging.basicConfig(filename='app.log', level=logging.INFO,
 # Page Config
 st.set_page_config(page_title="India Job Market Dashboard", layout="wide", initial_sidebar_state="expanded")
 
+# Rerun Instrumentation
+rerun_started = time.perf_counter()
+rerun_profiler = None
+if "rerun_profiler" in st.session_state:
+    # The profiled run ended early (st.rerun, st.stop or an exception); keep what it captured.
+    st.session_state.profile_report = st.session_state.pop("rerun_profiler").stop()
+if st.session_state.pop("profile_next_rerun", None):
+    try:
+        rerun_profiler = RerunProfiler(st.session_state.get("profile_engine", "cprofile"))
+        rerun_profiler.start()
+        st.session_state.rerun_profiler = rerun_profiler
+    except Exception as e:
+        # Another session may already hold the interpreter-wide profiler.
+        logging.warning(f"Rerun profiling unavailable: {str(e)}")
+        rerun_profiler = None
+
 # Advanced CSS for Modern UI
 st.markdown("""
     <style>
@@ -165,7 +198,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load Lottie Animation
-@st.cache_data
+@TELEMETRY.track_cache("load_lottie_url", st.cache_data)
 def load_lottie_url(url):
     try:
         response = requests.get(url)
@@ -225,18 +258,48 @@ lang_dict = {
 lang = lang_dict[language]
 
 # Load Data
-@st.cache_data
+# A resource (not data) cache: the table is built once per process and every
+# session gets the same object instead of an unpickled copy.
+@TELEMETRY.track_cache("load_data", st.cache_resource)
 def load_data():
+    # A failure raises out of the cache, so the next rerun tries again.
+    return JobDataset.load(os.environ.get("JOB_MARKET_DATA", DATA_PATH))
+
+@st.cache_resource
+def get_session_registry():
+    return SessionRegistry()
+
+@st.cache_resource
+def get_writer():
+    return BackgroundWriter(flush_interval=1.0, fsync=False)
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(max_workers=2)
+
+@st.cache_resource
+def get_tracker():
+    return ApplicationTracker(TRACKER_PATH)
+
+# Saved profiles are read once per process and their default recommendations computed in one
+# batch on the job runner, so returning users restore their profile and find the list ready.
+@st.cache_resource
+def get_saved_profiles():
+    profiles = load_profiles()
+    if profiles:
+        get_job_runner().submit("recommendations:saved_profiles", dataset.recommender.recommend_batch,
+                                list(profiles.values())[-dataset.recommender.cache_size:], DEFAULT_RECOMMENDATIONS)
+    return profiles
+
+with TELEMETRY.stage("App", "data load"):
     try:
-        df = pd.read_csv("data/india_job_market_dataset.csv")
-        logging.info("Dataset loaded successfully")
-        return df
+        dataset = load_data()
     except Exception as e:
         logging.error(f"Error loading dataset: {str(e)}")
         st.error(f"Failed to load dataset: {str(e)}")
-        return pd.DataFrame()
-
-df = load_data()
+        st.stop()
+    saved_profiles = get_saved_profiles()
+df = dataset.frame
 
 # Sidebar Navigation with Icons
 st.sidebar.title("📂 Navigation")
@@ -244,6 +307,7 @@ page = st.sidebar.radio("Go to", [
     "🏠 Home",
     "🏢 Company Insights",
     "💡 Skill Insights",
+    "🏁 Competitiveness",
     "🤖 ML Analysis",
     "📈 Forecasting",
     "📊 Power BI Reports",
@@ -252,32 +316,142 @@ page = st.sidebar.radio("Go to", [
     "🎓 Skill Gap Analysis",
     "📝 Feedback Submission",
     "👤 User Profile"
-], label_visibility="collapsed")
+] + (["🩺 Diagnostics"] if "diagnostics" in st.query_params else []), label_visibility="collapsed")
 
 # Sidebar Filters
 st.sidebar.header(lang["filter_jobs"])
-selected_skills = st.sidebar.multiselect(lang["skills_required"], sorted(df['Skills Required'].dropna().unique()))
-selected_city = st.sidebar.multiselect(lang["job_location"], sorted(df['Job Location'].dropna().unique()))
-selected_experience = st.sidebar.multiselect(lang["experience_required"],
-                                            sorted(df['Experience Required'].dropna().unique()))
+search_query = st.sidebar.text_input("🔍 Search", key="search_query", placeholder="e.g. data scientist pyth pune",
+                                     help="Matches words in job titles, companies, cities and skills by prefix "
+                                          "or substring. Every word must match.").strip()
+# The facet multiselects are drawn here but filled in below, once the other filters are known.
+facet_box = st.sidebar.container()
+
+def range_slider(label, limits, key):
+    """Sidebar range slider that returns None while it spans the full extent."""
+    low, high = limits
+    if low >= high:
+        return None
+    value = st.sidebar.slider(label, low, high, (low, high), key=key)
+    return None if value == (low, high) else value
+
+salary_range = range_slider("💰 Salary (LPA)", dataset.band_limits['salary'], "salary_range")
+experience_range = range_slider("🧭 Experience (Years)", dataset.band_limits['experience'], "experience_range")
+applicants_range = range_slider("👥 Number of Applicants", (int(df['Number of Applicants'].min()),
+                                                           int(df['Number of Applicants'].max())), "applicants_range")
+open_on = None
+if st.sidebar.checkbox("🟢 Open for applications", key="open_now"):
+    first_day = df['Posted Date'].min().date()
+    last_day = df['Application Deadline'].max().date()
+    open_on = st.sidebar.date_input("Open on", value=min(max(datetime.now().date(), first_day), last_day),
+                                    min_value=first_day, max_value=last_day, key="open_on")
+deduplicate = st.sidebar.toggle("🧹 Deduplicated counts", key="deduplicate",
+                                help="Count a job listed on several portals once. Near-duplicate postings "
+                                     "(same role, company, city and skills, posted days apart) are matched "
+                                     "with MinHash/LSH.")
+
+# Facet counts: each skill, city and experience band with the postings it would match under the
+# other active filters, from intersected per-value bitmaps. Shared by all sessions with the same filters.
+facet_selection = {facet: tuple(st.session_state.get("facet_" + facet, ())) for facet in FACETS}
+other_filters = {'salary_range': salary_range, 'experience_range': experience_range,
+                 'applicants_range': applicants_range, 'open_on': open_on, 'distinct': deduplicate,
+                 'query': search_query}
+with TELEMETRY.stage("App", "facet counts"):
+    facet_counts = dataset.cached("facet_counts", (dataset.version, tuple(facet_selection.items()),
+                                                  tuple(other_filters.items())),
+                                  lambda: dataset.facet_counts(**facet_selection, **other_filters))
+
+def facet_multiselect(label, facet, shown=6):
+    """A facet filter with its largest live counts underneath.
+
+    The options stay plain values: the browser sends a selection back as the option's label,
+    so a label carrying a count would stop matching once another filter changed the count.
+    """
+    counts = facet_counts[facet]
+    selected = st.multiselect(label, list(counts.index), key="facet_" + facet)
+    top = counts[counts > 0].sort_values(ascending=False, kind='stable')
+    if not top.empty:
+        more = " · +" + str(len(top) - shown) + " more" if len(top) > shown else ""
+        st.caption(" · ".join(str(value) + " " + f"{count:,}" for value, count in top.head(shown).items()) + more)
+    return selected
+
+with facet_box:
+    selected_skills = facet_multiselect(lang["skills_required"], "skills")
+    selected_city = facet_multiselect(lang["job_location"], "cities")
+    selected_experience = facet_multiselect(lang["experience_required"], "experience")
 
 # Apply Filters
-filtered_df = df.copy()
-if selected_skills:
-    filtered_df = filtered_df[filtered_df['Skills Required'].apply(
-        lambda x: any(skill.lower() in [s.strip().lower() for s in x.split(',')] for skill in selected_skills)
-    )]
-if selected_city:
-    filtered_df = filtered_df[filtered_df['Job Location'].isin(selected_city)]
-if selected_experience:
-    filtered_df = filtered_df[filtered_df['Experience Required'].isin(selected_experience)]
+# Sessions keep only the selected row positions; the rows themselves are taken
+# from the shared table for this rerun and never stored in session state.
+filter_key = (dataset.version, tuple(selected_skills), tuple(selected_city), tuple(selected_experience),
+              salary_range, experience_range, applicants_range, open_on, deduplicate, search_query)
+TELEMETRY.cache_event("filter_selection", hit=st.session_state.get("filter_key") == filter_key)
+with TELEMETRY.stage("App", "filter"):
+    if st.session_state.get("filter_key") != filter_key:
+        st.session_state.filter_key = filter_key
+        st.session_state.filtered_rows = dataset.filter_rows(selected_skills, selected_city, selected_experience,
+                                                             salary_range, experience_range, applicants_range,
+                                                             open_on, deduplicate, search_query)
+    filtered_df = dataset.select(st.session_state.filtered_rows)
+if deduplicate:
+    st.sidebar.caption(f"{int(dataset.duplicates.flags.sum()):,} cross-portal duplicate postings hidden")
+
+# Memory Accounting
+def streamlit_cache_stats():
+    """Bytes held by each st.cache_data function, as reported by the runtime."""
+    try:
+        stats = st.runtime.get_instance().stats_mgr.get_stats()
+    except Exception as e:
+        logging.warning(f"Cache statistics unavailable: {str(e)}")
+        return {}
+    if isinstance(stats, dict):
+        stats = [stat for family in stats.values() for stat in family]
+    sizes = {}
+    for stat in stats:
+        if getattr(stat, "category_name", None) == "st_cache_data":
+            sizes[stat.cache_name] = sizes.get(stat.cache_name, 0) + stat.byte_length
+    return sizes
+
+def memory_report():
+    caches = [{"Cache": "load_data (shared dataset)", "Bytes": dataset.nbytes},
+              {"Cache": "get_session_registry", "Bytes": deep_sizeof(session_registry)}]
+    caches += [{"Cache": name, "Bytes": size} for name, size in streamlit_cache_stats().items()]
+    return pd.DataFrame(caches), pd.DataFrame(session_registry.snapshot())
+
+# Instrumented Helpers
+# Pages build their charts through these so every page reports aggregation,
+# figure build and HTML export time separately.
+def aggregate(series, weights=None):
+    with TELEMETRY.stage(page, "aggregation"):
+        return count_values(series, weights)
+
+def build_figure(factory, *args, **kwargs):
+    with TELEMETRY.stage(page, "figure build"):
+        return factory(*args, **kwargs)
+
+def export_html(fig):
+    with TELEMETRY.stage(page, "serialization"):
+        return fig.to_html()
+
+# Background Job Status
+# Re-runs only this fragment every two seconds while a job is in flight, then
+# reruns the page once the result is ready.
+@st.fragment(run_every=2)
+def job_progress(job_id, label):
+    job = get_job_runner().get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    st.info("⏳ " + label + " is " + job.status + " (" + f"{job.elapsed:.0f}" + "s). "
+            "You can keep using the dashboard; the result will appear here when it is done.")
+
+session_registry = get_session_registry()
+run_ctx = get_script_run_ctx()
+if run_ctx is not None:
+    session_registry.record(run_ctx.session_id, session_footprint(st.session_state))
 
 # Real-Time Notification System
 def check_new_jobs():
     try:
-        new_jobs = filtered_df[filtered_df['Posted Date'].apply(
-            lambda x: pd.to_datetime(x) > pd.Timestamp.now() - pd.Timedelta(days=1)
-        )]
+        new_jobs = recent_postings(filtered_df, days=1)
         if not new_jobs.empty:
             st.markdown(f"<div class='notification'>🔔 {len(new_jobs)} new jobs match your filters!</div>",
                         unsafe_allow_html=True)
@@ -306,88 +480,18 @@ def get_chatbot_response(user_input):
             return "Please enter a question to get a response."
 
         logging.info(f"Processing chatbot input: {user_input}")
-        doc = nlp(user_input)
-
-        responses = {
-            "top_skills": {
-                "keywords": ["top skills", "in-demand skills", "popular skills", "best skills"],
-                "response": "Based on the dataset, top in-demand skills include Python, Java, SQL, AWS, and Machine Learning. Check the Skill Insights page for a detailed analysis!"
-            },
-            "top_companies": {
-                "keywords": ["top companies", "hiring companies", "best companies", "major employers"],
-                "response": "Top hiring companies include TCS, Infosys, and Wipro. Visit the Company Insights page for a bar chart of top companies."
-            },
-            "job_locations": {
-                "keywords": ["job locations", "popular cities", "job cities", "where are jobs"],
-                "response": "Popular job locations are Bangalore, Hyderabad, Mumbai, and Delhi. The Company Insights page shows a pie chart of job distributions by city."
-            },
-            "how_to_use": {
-                "keywords": ["how to use", "use dashboard", "navigate dashboard", "dashboard guide"],
-                "response": "Use the sidebar to navigate pages, apply filters for skills, locations, or experience, and explore visualizations. Try the ML Analysis page for predictive insights!"
-            },
-            "salary_prediction": {
-                "keywords": ["salary prediction", "predict salary", "salary range", "how much can i earn"],
-                "response": "Go to the ML Analysis page and select Salary Prediction to input job details and get a predicted salary range."
-            },
-            "dashboard_info": {
-                "keywords": ["what is this dashboard", "dashboard purpose", "about dashboard", "dashboard info",
-                             "who built this dashboard", "who created this"],
-                "response": "This is an India Job Market Dashboard built by Harsh Dwivedi and Radhika Verma. It analyzes job postings, skills, companies, and more using data visualizations and ML models."
-            },
-            "highest_paying_jobs": {
-                "keywords": ["highest paying job roles", "high paying jobs", "best paying roles", "top salary jobs"],
-                "response": "High-paying roles include Data Scientist, Machine Learning Engineer, and Software Architect, often offering 12-20 LPA or more. Check the ML Analysis page for salary predictions."
-            },
-            "most_job_opportunities": {
-                "keywords": ["most job opportunities", "cities with most jobs", "job opportunities",
-                             "where are most jobs"],
-                "response": "Bangalore, Hyderabad, and Mumbai have the most job opportunities. Explore the Company Insights page for a pie chart of job distributions by city."
-            },
-            "improve_prospects": {
-                "keywords": ["improve job prospects", "better job", "job chances", "career prospects"],
-                "response": "Learn in-demand skills like Python, AWS, or Data Science, and gain 2-5 years of experience. Use the Skill Insights and ML Analysis pages to identify trends and network on LinkedIn."
-            },
-            "job_trend": {
-                "keywords": ["job market trend", "trend for", "skill trend", "market trend"],
-                "response": "To see trends for a specific skill, go to the Forecasting page, select Skill-wise forecasting, and choose your skill for a 90-day job posting forecast."
-            },
-            "skills_to_learn": {
-                "keywords": ["skills to learn", "learn skills", "job skills", "skills for jobs",
-                             "skills should i learn"],
-                "response": "Focus on Python, SQL, AWS, Java, and Machine Learning for technical roles, plus soft skills like communication. Visit the Skill Insights page for top skills."
-            },
-            "fresher_jobs": {
-                "keywords": ["hiring freshers", "fresher jobs", "entry level jobs", "jobs for freshers"],
-                "response": "Companies like TCS, Infosys, and Wipro hire freshers (0-2 years experience). Filter by 0-2 years in the sidebar and check Company Insights for top companies."
-            },
-            "ml_accuracy": {
-                "keywords": ["ml predictions accurate", "prediction accuracy", "how accurate", "ml reliability"],
-                "response": "ML predictions like salary ranges are mock models for demonstration. Real accuracy depends on data and training. See ML Analysis for confidence scores."
-            }
-        }
 
-        for key, value in responses.items():
-            for keyword in value["keywords"]:
-                if keyword in user_input:
-                    logging.info(f"Matched keyword: {keyword} for response: {key}")
-                    return value["response"]
-
-        skills = set()
-        for skills_list in df['Skills Required'].dropna():
-            skills.update(skill.strip().lower() for skill in skills_list.split(','))
-        for token in doc:
-            if token.text in skills:
-                logging.info(f"Matched skill: {token.text}")
-                return "Trends for " + token.text.capitalize() + ": Check the Forecasting page for a 90-day forecast."
+        response = chatbot_reply(user_input, nlp, dataset.skills.lookup)
+        if response is not None:
+            return response
 
         try:
-            with open("unrecognized_inputs.csv", "a", encoding='utf-8') as f:
-                f.write(str(pd.Timestamp.now()) + "," + user_input + "\n")
+            get_writer().append_csv(UNRECOGNIZED_PATH, [str(pd.Timestamp.now()), user_input], UNRECOGNIZED_HEADER)
             logging.info(f"Unrecognized input logged: {user_input}")
         except Exception as e:
             logging.error(f"Error logging unrecognized input: {str(e)}")
 
-        return "I'm not sure how to answer that. Try asking about skills, companies, or locations!"
+        return FALLBACK_RESPONSE
     except Exception as e:
         logging.error(f"Error in chatbot: {str(e)}")
         return f"Error: {str(e)}. Please try again."
@@ -395,31 +499,7 @@ def get_chatbot_response(user_input):
 # Generate Summary Report
 def generate_summary_report():
     try:
-        summary = {
-            "Total Jobs": len(filtered_df),
-            "Top Skills": Counter([skill.strip() for skills in filtered_df['Skills Required'].dropna() for skill in
-                                   skills.split(',')]).most_common(5),
-            "Top Cities": filtered_df['Job Location'].value_counts().head(5).to_dict(),
-            "Top Companies": filtered_df['Company Name'].value_counts().head(5).to_dict()
-        }
-        summary_text = """
-        # Job Market Summary Report
-        *Generated on*: """ + pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S') + """
-
-        ## Overview
-        - *Total Job Postings*: """ + str(summary['Total Jobs']) + """
-
-        ## Top 5 In-Demand Skills
-        """ + ''.join(["- " + skill + ": " + str(count) + " postings\n" for skill, count in summary['Top Skills']]) + """
-
-        ## Top 5 Job Locations
-        """ + ''.join(
-            ["- " + city + ": " + str(count) + " postings\n" for city, count in summary['Top Cities'].items()]) + """
-
-        ## Top 5 Hiring Companies
-        """ + ''.join(
-            ["- " + company + ": " + str(count) + " postings\n" for company, count in summary['Top Companies'].items()])
-        return summary_text
+        return summary_markdown(summarize(dataset, st.session_state.filtered_rows))
     except Exception as e:
         logging.error(f"Error generating summary report: {str(e)}")
         return None
@@ -439,6 +519,17 @@ if page == "🏠 Home":
     st.subheader("🗂 Full Dataset Preview")
     st.dataframe(df.head(20), use_container_width=True)
 
+    if tokenize(search_query):
+        st.subheader("🔍 Top Matches for \"" + search_query + "\"")
+        with TELEMETRY.stage(page, "aggregation"):
+            # The filtered rows already match the search; this ranks them. The table below keeps dataset order.
+            match_rows, match_scores = dataset.search_index.search(search_query, st.session_state.filtered_rows)
+        if not len(match_rows):
+            st.info("ℹ No postings match every word of the search.")
+        else:
+            st.dataframe(dataset.select(match_rows).assign(Relevance=match_scores), use_container_width=True,
+                         hide_index=True, column_config={"Relevance": st.column_config.NumberColumn(format="%.2f")})
+
     st.subheader("📊 Filtered Job Results")
     if filtered_df.empty:
         st.warning(lang["no_data"])
@@ -449,7 +540,7 @@ if page == "🏠 Home":
 
     st.subheader("🗺 Job Locations Map")
     try:
-        city_counts = filtered_df['Job Location'].value_counts().reset_index()
+        city_counts = aggregate(filtered_df['Job Location']).reset_index()
         city_counts.columns = ['City', 'Count']
         city_coords = {
             'Bangalore': [12.9716, 77.5946], 'Hyderabad': [17.3850, 78.4867], 'Mumbai': [19.0760, 72.8777],
@@ -457,11 +548,11 @@ if page == "🏠 Home":
         }
         city_counts['lat'] = city_counts['City'].map(lambda x: city_coords.get(x, [0, 0])[0])
         city_counts['lon'] = city_counts['City'].map(lambda x: city_coords.get(x, [0, 0])[1])
-        fig = px.scatter_mapbox(city_counts, lat="lat", lon="lon", size="Count", hover_name="City",
-                                color="Count", zoom=3, height=400)
+        fig = build_figure(px.scatter_mapbox, city_counts, lat="lat", lon="lon", size="Count", hover_name="City",
+                           color="Count", zoom=3, height=400)
         fig.update_layout(mapbox_style="open-street-map")
         st.plotly_chart(fig, use_container_width=True)
-        map_html = fig.to_html()
+        map_html = export_html(fig)
         st.download_button("📥 Download Map as HTML", data=map_html, file_name="job_locations_map.html",
                            mime="text/html")
         st.markdown(
@@ -479,16 +570,22 @@ elif page == "🏢 Company Insights":
     if animations["company"]:
         st_lottie(animations["company"], height=250)
 
+    demand_metric = st.radio("Demand metric", ["Postings", "Applicants"], horizontal=True, key="company_metric",
+                             help="Applicants weights each posting by its number of applicants.")
+    demand_weights = filtered_df['Number of Applicants'] if demand_metric == "Applicants" else None
+    count_label = "Count" if demand_metric == "Postings" else "Applicants"
+
     st.subheader("🔝 Top Companies & Job Titles")
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### 🏆 Top Hiring Companies")
-        company_chart = filtered_df['Company Name'].value_counts().head(10).reset_index()
-        company_chart.columns = ['Company', 'Postings']
-        fig1 = px.bar(company_chart, x='Company', y='Postings', color='Postings', color_continuous_scale='Viridis')
+        company_chart = aggregate(filtered_df['Company Name'], demand_weights).head(10).reset_index()
+        company_chart.columns = ['Company', count_label]
+        fig1 = build_figure(px.bar, company_chart, x='Company', y=count_label, color=count_label,
+                            color_continuous_scale='Viridis')
         st.plotly_chart(fig1, use_container_width=True)
-        fig1_html = fig1.to_html()
+        fig1_html = export_html(fig1)
         st.download_button("📥 Download Companies Chart", data=fig1_html, file_name="top_companies.html",
                            mime="text/html")
         st.markdown(
@@ -496,38 +593,41 @@ elif page == "🏢 Company Insights":
             unsafe_allow_html=True)
 
         st.markdown("#### 💼 Popular Job Titles")
-        title_chart = filtered_df['Job Title'].value_counts().head(10).reset_index()
-        title_chart.columns = ['Title', 'Count']
-        fig2 = px.bar(title_chart, x='Title', y='Count', color='Count', color_continuous_scale='Plasma')
+        title_chart = aggregate(filtered_df['Job Title'], demand_weights).head(10).reset_index()
+        title_chart.columns = ['Title', count_label]
+        fig2 = build_figure(px.bar, title_chart, x='Title', y=count_label, color=count_label,
+                            color_continuous_scale='Plasma')
         st.plotly_chart(fig2, use_container_width=True)
-        fig2_html = fig2.to_html()
+        fig2_html = export_html(fig2)
         st.download_button("📥 Download Job Titles Chart", data=fig2_html, file_name="job_titles.html", mime="text/html")
 
     with col2:
         st.markdown("#### 📍 Jobs by City")
-        city_chart = filtered_df['Job Location'].value_counts().head(10).reset_index()
-        city_chart.columns = ['City', 'Count']
-        fig3 = px.pie(city_chart, names='City', values='Count', color_discrete_sequence=px.colors.qualitative.Pastel)
+        city_chart = aggregate(filtered_df['Job Location'], demand_weights).head(10).reset_index()
+        city_chart.columns = ['City', count_label]
+        fig3 = build_figure(px.pie, city_chart, names='City', values=count_label,
+                            color_discrete_sequence=px.colors.qualitative.Pastel)
         st.plotly_chart(fig3, use_container_width=True)
-        fig3_html = fig3.to_html()
+        fig3_html = export_html(fig3)
         st.download_button("📥 Download City Chart", data=fig3_html, file_name="jobs_by_city.html", mime="text/html")
 
         st.markdown("#### 🎯 Experience Demand")
-        experience_chart = filtered_df['Experience Required'].value_counts().reset_index()
-        experience_chart.columns = ['Experience', 'Count']
-        fig4 = px.line(experience_chart.sort_values('Experience'), x='Experience', y='Count', markers=True,
-                       color_discrete_sequence=['#FF5722'])
+        experience_chart = aggregate(filtered_df['Experience Required'], demand_weights).reset_index()
+        experience_chart.columns = ['Experience', count_label]
+        fig4 = build_figure(px.line, experience_chart.sort_values('Experience'), x='Experience', y=count_label,
+                            markers=True, color_discrete_sequence=['#FF5722'])
         st.plotly_chart(fig4, use_container_width=True)
-        fig4_html = fig4.to_html()
+        fig4_html = export_html(fig4)
         st.download_button("📥 Download Experience Chart", data=fig4_html, file_name="experience_demand.html",
                            mime="text/html")
 
     st.subheader("🧾 Job Type Distribution")
-    job_type_chart = filtered_df['Job Type'].value_counts().reset_index()
-    job_type_chart.columns = ['Job Type', 'Count']
-    fig5 = px.pie(job_type_chart, names='Job Type', values='Count', color_discrete_sequence=px.colors.qualitative.Set2)
+    job_type_chart = aggregate(filtered_df['Job Type'], demand_weights).reset_index()
+    job_type_chart.columns = ['Job Type', count_label]
+    fig5 = build_figure(px.pie, job_type_chart, names='Job Type', values=count_label,
+                        color_discrete_sequence=px.colors.qualitative.Set2)
     st.plotly_chart(fig5, use_container_width=True)
-    fig5_html = fig5.to_html()
+    fig5_html = export_html(fig5)
     st.download_button("📥 Download Job Type Chart", data=fig5_html, file_name="job_types.html", mime="text/html")
 
 # ====================
@@ -538,26 +638,189 @@ elif page == "💡 Skill Insights":
     if animations["skills"]:
         st_lottie(animations["skills"], height=250)
 
-    all_skills = []
-    for row in filtered_df['Skills Required'].dropna():
-        all_skills.extend([s.strip() for s in row.split(',')])
+    skill_metric = st.radio("Demand metric", ["Postings", "Applicants"], horizontal=True, key="skill_metric",
+                            help="Applicants weights each posting by its number of applicants.")
+    skill_label = "Count" if skill_metric == "Postings" else "Applicants"
+    with TELEMETRY.stage(page, "aggregation"):
+        skill_weights = (dataset.applicants(st.session_state.filtered_rows).astype(np.int64)
+                         if skill_metric == "Applicants" else None)
+        top_skills = dataset.skills.top(st.session_state.filtered_rows, 10, skill_weights)
 
-    if all_skills:
-        top_skills = Counter(all_skills).most_common(10)
-        skills_df = pd.DataFrame(top_skills, columns=['Skill', 'Count'])
+    if not top_skills.empty:
+        skills_df = top_skills.rename_axis('Skill').reset_index(name=skill_label)
         st.markdown("#### 🔝 Top 10 In-Demand Skills")
-        fig = px.bar(skills_df, x='Skill', y='Count', color='Count', color_continuous_scale='Viridis')
+        fig = build_figure(px.bar, skills_df, x='Skill', y=skill_label, color=skill_label,
+                           color_continuous_scale='Viridis')
         st.plotly_chart(fig, use_container_width=True)
-        fig_html = fig.to_html()
+        fig_html = export_html(fig)
         st.download_button("📥 Download Skills Chart", data=fig_html, file_name="top_skills.html", mime="text/html")
+
+        st.markdown("#### 📈 Daily Postings per Skill (last 90 days)")
+        with TELEMETRY.stage(page, "aggregation"):
+            trends = dataset.skill_timeline.trends(skills_df['Skill'], counts=dataset.skill_counts_by_day(
+                st.session_state.filtered_rows, filter_key))
+        skills_df['Trend'] = skills_df['Skill'].map(trends)
+        st.dataframe(skills_df, use_container_width=True, hide_index=True, column_config={
+            "Trend": st.column_config.LineChartColumn("Trend", y_min=0)
+        })
         st.markdown(
             "<div class='insight-box'>*Insight*: Programming and cloud skills are highly sought after, indicating a tech-driven market.</div>",
             unsafe_allow_html=True)
     else:
         st.info("ℹ No skill data available for selected filters.")
 
+    st.subheader("🔗 Skill Relationships")
+    try:
+        # Xᵀ·X over the filtered postings, shared by every session with the same filters.
+        with TELEMETRY.stage(page, "aggregation"):
+            cooccurrence = dataset.cooccurrence(st.session_state.filtered_rows, filter_key)
+        ranked_skills = cooccurrence.top_skills(len(cooccurrence.vocabulary))
+        if len(ranked_skills) < 2:
+            st.info("ℹ Not enough skills in the selected postings to relate them.")
+        else:
+            rel_col1, rel_col2 = st.columns([1, 2])
+            with rel_col1:
+                anchor_skill = st.selectbox("Skill", ranked_skills, key="related_skill")
+                rank_metric = st.radio("Rank by", ["Lift", "Postings together"], horizontal=True, key="related_metric",
+                                       help="Lift favours skills that appear with this one far more than by chance; "
+                                            "postings together favours the most common companions.")
+                min_together = st.slider("Minimum postings together", 1, 100, 5, key="related_min")
+            with rel_col2:
+                related = cooccurrence.related(anchor_skill, k=10, min_count=min_together,
+                                               by='Lift' if rank_metric == "Lift" else 'Together')
+                st.markdown("#### Skills most often required with " + anchor_skill)
+                st.dataframe(related, use_container_width=True, hide_index=True, column_config={
+                    "Confidence": st.column_config.ProgressColumn(
+                        "Share of " + anchor_skill + " postings", min_value=0.0, max_value=1.0, format="%.2f"),
+                    "Lift": st.column_config.NumberColumn(format="%.2f"),
+                    "PMI": st.column_config.NumberColumn(format="%.2f")
+                })
+
+            graph_size = st.slider("Skills in heatmap and network", 5, min(30, len(ranked_skills)),
+                                   min(15, len(ranked_skills)), key="related_size")
+            graph_skills = ranked_skills[:graph_size]
+            heat_col, net_col = st.columns(2)
+            with heat_col:
+                st.markdown("#### 🌡 Co-occurrence Lift")
+                fig_heat = build_figure(px.imshow, cooccurrence.matrix(graph_skills, 'lift'),
+                                        color_continuous_scale='RdBu_r', color_continuous_midpoint=1.0,
+                                        labels={'color': 'Lift'})
+                st.plotly_chart(fig_heat, use_container_width=True)
+            with net_col:
+                st.markdown("#### 🕸 Skill Network")
+                edges = cooccurrence.pairs(graph_skills, min_lift=1.0)
+                angles = np.linspace(0, 2 * np.pi, len(graph_skills), endpoint=False)
+                node_x = dict(zip(graph_skills, np.cos(angles)))
+                node_y = dict(zip(graph_skills, np.sin(angles)))
+                edge_traces = [go.Scatter(x=[node_x[edge.Source], node_x[edge.Target]],
+                                          y=[node_y[edge.Source], node_y[edge.Target]], mode='lines',
+                                          line={'width': 1 + 2 * min(edge.Lift - 1, 2), 'color': '#90A4AE'},
+                                          hoverinfo='text', showlegend=False,
+                                          text=edge.Source + " + " + edge.Target + ": lift " + f"{edge.Lift:.2f}")
+                               for edge in edges.itertuples()]
+                support = np.array([cooccurrence.support[cooccurrence.lookup[s.lower()]] for s in graph_skills])
+                node_trace = go.Scatter(x=list(node_x.values()), y=list(node_y.values()), mode='markers+text',
+                                        text=graph_skills, textposition='top center', showlegend=False,
+                                        marker={'size': 10 + 30 * support / max(support.max(), 1),
+                                                'color': support, 'colorscale': 'Viridis'},
+                                        hovertext=[s + ": " + str(int(c)) + " postings"
+                                                   for s, c in zip(graph_skills, support)], hoverinfo='text')
+                fig_net = build_figure(go.Figure, data=edge_traces + [node_trace],
+                                       layout={'xaxis': {'visible': False}, 'yaxis': {'visible': False},
+                                               'height': 500, 'margin': {'l': 10, 'r': 10, 't': 10, 'b': 10}})
+                st.plotly_chart(fig_net, use_container_width=True)
+                st.caption("Edges join skills that appear together more often than chance (lift above 1).")
+    except Exception as e:
+        logging.error(f"Error in skill relationship analysis: {str(e)}")
+        st.error(f"Failed to analyze skill relationships: {str(e)}")
+
+    st.subheader("🚀 Emerging & Declining Skills")
+    try:
+        trend_col1, trend_col2 = st.columns(2)
+        with trend_col1:
+            trend_window = st.radio("Window", list(SkillTrends.WINDOWS), index=1, horizontal=True,
+                                    format_func=lambda days: str(days) + " days", key="trend_window")
+        with trend_col2:
+            trend_min = st.slider("Minimum postings in window", 1, 500, 20, key="trend_min")
+        with TELEMETRY.stage(page, "aggregation"):
+            skill_trends = dataset.skill_trends(st.session_state.filtered_rows, filter_key)
+            emerging = skill_trends.emerging(trend_window, k=10, min_postings=trend_min)
+            declining = skill_trends.declining(trend_window, k=10, min_postings=trend_min)
+        if not skill_trends.has_history(trend_window):
+            st.caption("ℹ The selected postings span " + str(skill_trends.days) + " days, less than two " +
+                       str(trend_window) + "-day windows, so the earlier window is partial.")
+        trend_config = {
+            "Share": st.column_config.NumberColumn("Share", format="%.3f"),
+            "Previous Share": st.column_config.NumberColumn("Previous Share", format="%.3f"),
+            "Growth": st.column_config.NumberColumn("Growth", format="percent"),
+            "Z": st.column_config.NumberColumn("Significance (z)", format="%.1f"),
+            "Trend": st.column_config.LineChartColumn("Daily Postings", y_min=0)
+        }
+        for column, title, movers in [(trend_col1, "#### 📈 Emerging", emerging),
+                                      (trend_col2, "#### 📉 Declining", declining)]:
+            with column:
+                st.markdown(title)
+                if movers.empty:
+                    st.info("ℹ No significant movers for this window.")
+                else:
+                    trends = dataset.skill_timeline.trends(movers['Skill'], days=2 * trend_window,
+                                                           counts=dataset.skill_counts_by_day(
+                                                               st.session_state.filtered_rows, filter_key))
+                    st.dataframe(movers.assign(Trend=movers['Skill'].map(trends)), use_container_width=True,
+                                 hide_index=True, column_config=trend_config)
+        st.caption("Share is the fraction of postings in the window requiring the skill; growth compares it "
+                   "with the window before. |z| above 2 is unlikely to be noise.")
+    except Exception as e:
+        logging.error(f"Error in emerging skills analysis: {str(e)}")
+        st.error(f"Failed to analyze emerging skills: {str(e)}")
+
+# ====================
+# PAGE 4: COMPETITIVENESS
+# ====================
+elif page == "🏁 Competitiveness":
+    st.title("🏁 Competition for Jobs")
+    st.markdown("How many candidates apply to each posting, by title, city, skill and portal. "
+                "A high ratio means a crowded field; a low one, an easier market to stand out in.")
+
+    comp_col1, comp_col2 = st.columns(2)
+    with comp_col1:
+        compete_by = st.selectbox("Group by", ["Job Title", "Job Location", "Skill", "Job Portal"],
+                                  key="compete_by")
+    with comp_col2:
+        min_postings = st.slider("Minimum postings per group", 1, 500, 10, key="compete_min")
+    try:
+        with TELEMETRY.stage(page, "aggregation"):
+            competition = dataset.competitiveness(compete_by, st.session_state.filtered_rows)
+        competition = competition[competition['Postings'] >= min_postings]
+        total_postings = len(filtered_df)
+        total_applicants = int(dataset.applicants(st.session_state.filtered_rows).sum())
+        metric_col1, metric_col2, metric_col3 = st.columns(3)
+        metric_col1.metric("Postings", f"{total_postings:,}")
+        metric_col2.metric("Applicants", f"{total_applicants:,}")
+        metric_col3.metric("Applicants per Posting", f"{total_applicants / max(total_postings, 1):.1f}")
+        if open_on is not None:
+            st.caption("Only postings open for applications on " + open_on.strftime('%d %b %Y') + " are counted.")
+
+        if competition.empty:
+            st.info("ℹ No groups with enough postings for the selected filters.")
+        else:
+            chart_df = pd.concat([competition.head(10), competition.tail(10)]).drop_duplicates(compete_by)
+            st.markdown("#### Most and least competitive")
+            fig_comp = build_figure(px.bar, chart_df.sort_values('Applicants per Posting'), x='Applicants per Posting',
+                                    y=compete_by, orientation='h', color='Applicants per Posting',
+                                    color_continuous_scale='RdYlGn_r', hover_data=['Postings', 'Applicants'])
+            st.plotly_chart(fig_comp, use_container_width=True)
+            st.download_button("📥 Download Competitiveness Chart", data=export_html(fig_comp),
+                               file_name="competitiveness.html", mime="text/html")
+            st.dataframe(competition, use_container_width=True, hide_index=True, column_config={
+                "Applicants per Posting": st.column_config.NumberColumn(format="%.1f")
+            })
+    except Exception as e:
+        logging.error(f"Error in competitiveness analysis: {str(e)}")
+        st.error(f"Failed to analyze competitiveness: {str(e)}")
+
 # ====================
-# PAGE 4: ML ANALYSIS
+# PAGE 5: ML ANALYSIS
 # ====================
 elif page == "🤖 ML Analysis":
     st.title("🤖 Machine Learning Analysis")
@@ -578,7 +841,7 @@ elif page == "🤖 ML Analysis":
             pred_job_location = st.selectbox("Job Location", sorted(df['Job Location'].unique()))
 
         with col2:
-            pred_experience = st.selectbox("Experience Required", sorted(df['Experience Required'].unique()))
+            pred_experience = st.selectbox("Experience Required", list(df['Experience Required'].cat.categories))
             pred_education = st.selectbox("Education Level",
                                           ["Bachelor's", "Master's", "PhD", "MBA", "High School", "Diploma"])
             all_skills = set()
@@ -606,15 +869,15 @@ elif page == "🤖 ML Analysis":
                         'Salary Range': salary_brackets,
                         'Probability': normalized_scores
                     })
-                    fig = px.bar(pred_df, x='Salary Range', y='Probability',
-                                 color='Probability',
-                                 labels={'Probability': 'Confidence'},
-                                 color_continuous_scale=px.colors.sequential.Viridis)
+                    fig = build_figure(px.bar, pred_df, x='Salary Range', y='Probability',
+                                       color='Probability',
+                                       labels={'Probability': 'Confidence'},
+                                       color_continuous_scale=px.colors.sequential.Viridis)
                     top_prediction = salary_brackets[normalized_scores.index(max(normalized_scores))]
                     st.plotly_chart(fig, use_container_width=True)
                     st.markdown(
                         "**Most likely salary range: **" + top_prediction + " (Confidence: " + f"{max(normalized_scores):.2%})")
-                    fig_html = fig.to_html()
+                    fig_html = export_html(fig)
                     st.download_button("📥 Download Salary Chart", data=fig_html, file_name="salary_prediction.html",
                                        mime="text/html")
                 with col2:
@@ -649,87 +912,119 @@ elif page == "🤖 ML Analysis":
                                          ["Skills", "Experience", "Location", "Job Type", "Company Size"],
                                          default=["Skills", "Experience"])
             visualization_type = st.selectbox("Visualization Type", ["2D Plot", "3D Plot", "Dendrogram"])
-        if st.button("Run Clustering Analysis"):
-            try:
-                st.info("🧮 Performing clustering analysis...")
-                progress_bar = st.progress(0)
-                for i in range(100):
-                    time.sleep(0.02)
-                    progress_bar.progress(i + 1)
-                n_samples = 1000
-                np.random.seed(42)
-                mock_features = np.random.rand(n_samples, 2)
-                mock_clusters = np.random.randint(0, n_clusters, size=n_samples)
-                cluster_df = pd.DataFrame({
+            large_plot = st.selectbox("Above " + f"{MAX_SCATTER_POINTS:,}" + " Points, Show",
+                                      ["Density bins", "Stratified sample"],
+                                      help="Large plots are reduced on the server so the browser stays responsive.")
+        def run_mock_clustering(n_clusters, algorithm, features, job_titles, n_samples=1000, seed=42):
+            rng = np.random.RandomState(seed)
+            mock_features = rng.rand(n_samples, 3)
+            mock_clusters = rng.randint(0, n_clusters, size=n_samples)
+            return {
+                "n_clusters": n_clusters,
+                "algorithm": algorithm,
+                "features": features,
+                "cluster_df": pd.DataFrame({
                     'x': mock_features[:, 0],
                     'y': mock_features[:, 1],
+                    'z': mock_features[:, 2],
                     'cluster': mock_clusters
-                })
-                st.success("✅ Clustering complete!")
-                st.subheader("Clustering Results")
-                viz_col1, viz_col2 = st.columns([2, 1])
-                with viz_col1:
-                    if visualization_type == "2D Plot":
-                        fig = px.scatter(cluster_df, x='x', y='y', color='cluster',
-                                         color_continuous_scale=px.colors.qualitative.G10,
-                                         labels={'cluster': 'Job Cluster'},
-                                         title="Job Market Clusters using " + clustering_algorithm)
-                        st.plotly_chart(fig, use_container_width=True)
-                        fig_html = fig.to_html()
-                        st.download_button("📥 Download Cluster Plot", data=fig_html, file_name="job_clusters.html",
-                                           mime="text/html")
-                    elif visualization_type == "3D Plot":
-                        cluster_df['z'] = np.random.rand(n_samples)
-                        fig = px.scatter_3d(cluster_df, x='x', y='y', z='z', color='cluster',
-                                            color_continuous_scale=px.colors.qualitative.G10)
-                        st.plotly_chart(fig, use_container_width=True)
-                        fig_html = fig.to_html()
-                        st.download_button("📥 Download 3D Cluster Plot", data=fig_html,
-                                           file_name="job_clusters_3d.html", mime="text/html")
-                    else:
-                        fig, ax = plt.subplots(figsize=(10, 8))
-                        from scipy.cluster import hierarchy
-                        from scipy.spatial.distance import pdist
-
-                        mock_data = np.random.rand(50, 2)
-                        mock_linkage = hierarchy.linkage(pdist(mock_data), method='ward')
-                        hierarchy.dendrogram(mock_linkage, ax=ax)
-                        ax.set_title('Hierarchical Clustering Dendrogram')
-                        st.pyplot(fig)
-                with viz_col2:
-                    st.markdown("### Cluster Interpretation")
-                    for i in range(n_clusters):
-                        with st.expander("Cluster " + str(i + 1) + " Characteristics"):
-                            st.markdown("*Size*: " + str(np.sum(mock_clusters == i)) + " jobs")
-                            if "Skills" in feature_set:
-                                skill_groups = [
-                                    "Python, SQL, Data Analysis",
-                                    "Java, Spring Boot, Microservices",
-                                    "Frontend: React, Angular, JavaScript",
-                                    "ML/AI: TensorFlow, PyTorch, NLP",
-                                    "Cloud: AWS, Azure, DevOps"
-                                ]
-                                st.markdown("*Key Skills*: " + skill_groups[i % len(skill_groups)])
-                            if "Experience" in feature_set:
-                                exp_groups = ["0-2 years", "3-5 years", "5-8 years", "8+ years"]
-                                st.markdown("*Experience Level*: " + exp_groups[i % len(exp_groups)])
-                            if "Location" in feature_set:
-                                location_groups = ["Bangalore, Hyderabad", "Mumbai, Pune", "Delhi NCR",
-                                                   "Chennai, Kolkata"]
-                                st.markdown("*Common Locations*: " + location_groups[i % len(location_groups)])
-                            salary_ranges = ["4-7 LPA", "8-12 LPA", "12-18 LPA", "18-25 LPA", "25+ LPA"]
-                            st.markdown("*Salary Range*: " + salary_ranges[i % len(salary_ranges)])
-                cluster_result_df = pd.DataFrame({
-                    'Job Title': np.random.choice(df['Job Title'].unique(), size=n_samples),
+                }),
+                "dendrogram_data": rng.rand(50, 2),
+                "results": pd.DataFrame({
+                    'Job Title': rng.choice(job_titles, size=n_samples),
                     'Cluster': mock_clusters,
-                    'Similarity Score': np.random.uniform(0.6, 0.99, size=n_samples)
+                    'Similarity Score': rng.uniform(0.6, 0.99, size=n_samples)
                 })
-                csv = cluster_result_df.to_csv(index=False).encode('utf-8')
-                st.download_button("📥 Download Cluster Results",
-                                   data=csv,
-                                   file_name="job_clusters.csv",
-                                   mime="text/csv")
-                logging.info("Clustering analysis completed successfully")
+            }
+
+        if st.button("Run Clustering Analysis"):
+            st.session_state.clustering_job = get_job_runner().submit(
+                ("clustering", dataset.version, n_clusters, clustering_algorithm, tuple(feature_set)),
+                run_mock_clustering, n_clusters, clustering_algorithm, list(feature_set),
+                list(df['Job Title'].dropna().unique()))
+        clustering_job = get_job_runner().get(st.session_state.get("clustering_job", ""))
+        if clustering_job is not None:
+            try:
+                if not clustering_job.done:
+                    job_progress(clustering_job.id, "Clustering analysis")
+                elif clustering_job.error is not None:
+                    raise clustering_job.error
+                else:
+                    clustering = clustering_job.result
+                    cluster_df = clustering['cluster_df']
+                    mock_clusters = cluster_df['cluster'].to_numpy()
+                    cluster_result_df = clustering['results']
+                    st.success("✅ Clustering complete!")
+                    st.subheader("Clustering Results")
+                    viz_col1, viz_col2 = st.columns([2, 1])
+                    # Plots over MAX_SCATTER_POINTS points are binned or sampled first; the reduced
+                    # frame is cached per clustering result, so reruns only rebuild the figure.
+                    reduce = 'bins' if large_plot == "Density bins" else 'sample'
+                    if visualization_type in ["2D Plot", "3D Plot"]:
+                        z = 'z' if visualization_type == "3D Plot" else None
+                        plot_df, plot_options = dataset.cached(
+                            "cluster_scatter", (clustering_job.id, z, reduce),
+                            lambda: scatter_data(cluster_df, 'x', 'y', color='cluster', z=z, reduce=reduce))
+                        if len(plot_df) < len(cluster_df):
+                            st.caption(f"{len(cluster_df):,} points shown as " + f"{len(plot_df):,} " +
+                                       ("density cells sized by their point count"
+                                        if 'size' in plot_options else "sampled points, in proportion per cluster"))
+                    with viz_col1:
+                        if visualization_type == "2D Plot":
+                            fig = build_figure(px.scatter, plot_df, x='x', y='y', color='cluster',
+                                               color_continuous_scale=px.colors.qualitative.G10,
+                                               labels={'cluster': 'Job Cluster'},
+                                               title="Job Market Clusters using " + clustering['algorithm'],
+                                               **plot_options)
+                            st.plotly_chart(fig, use_container_width=True)
+                            fig_html = export_html(fig)
+                            st.download_button("📥 Download Cluster Plot", data=fig_html,
+                                               file_name="job_clusters.html", mime="text/html")
+                        elif visualization_type == "3D Plot":
+                            fig = build_figure(px.scatter_3d, plot_df, x='x', y='y', z='z', color='cluster',
+                                               color_continuous_scale=px.colors.qualitative.G10, **plot_options)
+                            st.plotly_chart(fig, use_container_width=True)
+                            fig_html = export_html(fig)
+                            st.download_button("📥 Download 3D Cluster Plot", data=fig_html,
+                                               file_name="job_clusters_3d.html", mime="text/html")
+                        else:
+                            fig, ax = plt.subplots(figsize=(10, 8))
+                            from scipy.cluster import hierarchy
+                            from scipy.spatial.distance import pdist
+
+                            mock_linkage = hierarchy.linkage(pdist(clustering['dendrogram_data']), method='ward')
+                            hierarchy.dendrogram(mock_linkage, ax=ax)
+                            ax.set_title('Hierarchical Clustering Dendrogram')
+                            st.pyplot(fig)
+                    with viz_col2:
+                        st.markdown("### Cluster Interpretation")
+                        for i in range(clustering['n_clusters']):
+                            with st.expander("Cluster " + str(i + 1) + " Characteristics"):
+                                st.markdown("*Size*: " + str(np.sum(mock_clusters == i)) + " jobs")
+                                if "Skills" in clustering['features']:
+                                    skill_groups = [
+                                        "Python, SQL, Data Analysis",
+                                        "Java, Spring Boot, Microservices",
+                                        "Frontend: React, Angular, JavaScript",
+                                        "ML/AI: TensorFlow, PyTorch, NLP",
+                                        "Cloud: AWS, Azure, DevOps"
+                                    ]
+                                    st.markdown("*Key Skills*: " + skill_groups[i % len(skill_groups)])
+                                if "Experience" in clustering['features']:
+                                    exp_groups = ["0-2 years", "3-5 years", "5-8 years", "8+ years"]
+                                    st.markdown("*Experience Level*: " + exp_groups[i % len(exp_groups)])
+                                if "Location" in clustering['features']:
+                                    location_groups = ["Bangalore, Hyderabad", "Mumbai, Pune", "Delhi NCR",
+                                                       "Chennai, Kolkata"]
+                                    st.markdown("*Common Locations*: " + location_groups[i % len(location_groups)])
+                                salary_ranges = ["4-7 LPA", "8-12 LPA", "12-18 LPA", "18-25 LPA", "25+ LPA"]
+                                st.markdown("*Salary Range*: " + salary_ranges[i % len(salary_ranges)])
+                    csv = cluster_result_df.to_csv(index=False).encode('utf-8')
+                    st.download_button("📥 Download Cluster Results",
+                                       data=csv,
+                                       file_name="job_clusters.csv",
+                                       mime="text/csv")
+                    logging.info("Clustering analysis completed successfully")
             except Exception as e:
                 logging.error(f"Error in clustering analysis: {str(e)}")
                 st.error(f"Failed to perform clustering: {str(e)}")
@@ -741,12 +1036,12 @@ elif page == "🤖 ML Analysis":
 
         with exp_col1:
             st.markdown("#### Job Postings by Experience Level")
-            exp_chart = filtered_df['Experience Required'].value_counts().reset_index()
+            exp_chart = aggregate(filtered_df['Experience Required']).reset_index()
             exp_chart.columns = ['Experience', 'Count']
-            fig_exp = px.bar(exp_chart.sort_values('Experience'), x='Experience', y='Count',
-                             color='Count', color_continuous_scale='Blues')
+            fig_exp = build_figure(px.bar, exp_chart.sort_values('Experience'), x='Experience', y='Count',
+                                   color='Count', color_continuous_scale='Blues')
             st.plotly_chart(fig_exp, use_container_width=True)
-            fig_exp_html = fig_exp.to_html()
+            fig_exp_html = export_html(fig_exp)
             st.download_button("📥 Download Experience Chart", data=fig_exp_html,
                                file_name="experience_postings.html", mime="text/html")
             st.markdown(
@@ -755,7 +1050,7 @@ elif page == "🤖 ML Analysis":
 
         with exp_col2:
             st.markdown("#### Mock Salary Impact by Experience")
-            exp_input = st.selectbox("Select Experience Level", sorted(df['Experience Required'].unique()))
+            exp_input = st.selectbox("Select Experience Level", list(df['Experience Required'].cat.categories))
             if st.button("Estimate Salary Impact"):
                 try:
                     st.info("🧠 Estimating salary impact...")
@@ -776,13 +1071,13 @@ elif page == "🤖 ML Analysis":
                         'Salary Range': salary_ranges,
                         'Probability': probabilities
                     })
-                    fig_salary = px.bar(salary_df, x='Salary Range', y='Probability',
-                                        color='Probability', color_continuous_scale='Reds')
+                    fig_salary = build_figure(px.bar, salary_df, x='Salary Range', y='Probability',
+                                              color='Probability', color_continuous_scale='Reds')
                     st.plotly_chart(fig_salary, use_container_width=True)
                     top_salary = salary_ranges[probabilities.index(max(probabilities))]
                     st.markdown(
                         "*Estimated Salary Range*: " + top_salary + " (Confidence: " + f"{max(probabilities):.2%})")
-                    fig_salary_html = fig_salary.to_html()
+                    fig_salary_html = export_html(fig_salary)
                     st.download_button("📥 Download Salary Impact Chart", data=fig_salary_html,
                                        file_name="experience_salary_impact.html", mime="text/html")
                     st.success("✅ Estimation complete!")
@@ -824,10 +1119,10 @@ elif page == "🤖 ML Analysis":
                     if all_skills:
                         skill_counts = Counter(all_skills).most_common(10)
                         skill_df = pd.DataFrame(skill_counts, columns=['Skill', 'Count'])
-                        fig_skill = px.bar(skill_df, x='Skill', y='Count',
-                                           color='Count', color_continuous_scale='Greens')
+                        fig_skill = build_figure(px.bar, skill_df, x='Skill', y='Count',
+                                                 color='Count', color_continuous_scale='Greens')
                         st.plotly_chart(fig_skill, use_container_width=True)
-                        fig_skill_html = fig_skill.to_html()
+                        fig_skill_html = export_html(fig_skill)
                         st.download_button("📥 Download Skill Demand Chart", data=fig_skill_html,
                                            file_name="skill_demand.html", mime="text/html")
                         st.markdown(
@@ -843,7 +1138,7 @@ elif page == "🤖 ML Analysis":
                     st.error(f"Failed to analyze skills: {str(e)}")
 
 # ====================
-# PAGE 5: FORECASTING
+# PAGE 6: FORECASTING
 # ====================
 elif page == "📈 Forecasting":
     st.title("📈 Forecasting Job Postings")
@@ -854,56 +1149,108 @@ elif page == "📈 Forecasting":
         st.error("❌ 'Posted Date' column not found in dataset.")
     else:
         try:
-            df['Posted Date'] = pd.to_datetime(df['Posted Date'], errors='coerce')
-            df = df.dropna(subset=['Posted Date'])
 
             st.subheader("🔎 Choose Forecast Category")
             forecast_type = st.radio("Forecast by", ["Overall", "City-wise", "Skill-wise"], horizontal=True)
 
             if forecast_type == "Overall":
-                forecast_df = filtered_df.copy()
+                ts_df = daily_counts(filtered_df['Posted Date'])
+                forecast_selection = filter_key
             elif forecast_type == "City-wise":
                 city_option = st.selectbox("Select City", sorted(df['Job Location'].dropna().unique()))
-                forecast_df = df[df['Job Location'] == city_option]
+                city_df = dataset.select(dataset.duplicates.distinct()) if deduplicate else df
+                ts_df = daily_counts(city_df.loc[city_df['Job Location'] == city_option, 'Posted Date'])
+                forecast_selection = (city_option, deduplicate)
             elif forecast_type == "Skill-wise":
-                skill_option = st.selectbox("Select Skill", sorted(
-                    {skill.strip() for skills in df['Skills Required'].dropna() for skill in skills.split(',')}))
-                forecast_df = df[df['Skills Required'].str.contains(skill_option, case=False, na=False)]
+                # Exact skill tokens: the series is a column of the precomputed date x skill matrix.
+                skill_option = st.selectbox("Select Skill", dataset.skills.vocabulary)
+                ts_df = dataset.skill_timeline.daily_counts(skill_option,
+                                                            dataset.duplicates.distinct() if deduplicate else None)
+                forecast_selection = (skill_option, deduplicate)
 
-            forecast_df = forecast_df[['Posted Date']].copy()
-            if forecast_df.empty:
+            if ts_df.empty or ts_df['y'].sum() == 0:
                 st.warning("⚠ No job postings available for the selected criteria.")
             else:
-                forecast_df['Count'] = 1
-                ts_df = forecast_df.groupby('Posted Date').count().reset_index()
-                ts_df.columns = ['ds', 'y']
-                model = Prophet()
-                model.fit(ts_df)
-                future = model.make_future_dataframe(periods=90)
-                forecast = model.predict(future)
-                st.subheader("📊 Forecasted Job Postings (Next 90 Days)")
-                fig = plot_plotly(model, forecast)
-                st.plotly_chart(fig, use_container_width=True)
-                fig_html = fig.to_html()
-                st.download_button("📥 Download Forecast Chart", data=fig_html, file_name="job_forecast.html",
-                                   mime="text/html")
-                forecast_csv = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].rename(
-                    columns={'ds': 'Date', 'yhat': 'Forecasted Count'}
-                )
-                csv = forecast_csv.to_csv(index=False).encode('utf-8')
-                st.download_button("📥 Download Forecast CSV", data=csv, file_name="forecast_data.csv", mime="text/csv")
-                with st.expander("📉 Trend & Seasonality Breakdown"):
-                    st.pyplot(model.plot_components(forecast))
-                st.markdown(
-                    "<div class='insight-box'>*Insight*: Forecast trends help identify upcoming hiring surges.</div>",
-                    unsafe_allow_html=True)
-                logging.info("Forecasting completed successfully")
+                # Fits run on the shared job runner: identical requests from any session
+                # share one fit, and reruns poll for it instead of restarting it.
+                forecast_key = ("forecast", dataset.version, forecast_type, forecast_selection)
+                forecast_job = get_job_runner().submit(forecast_key, fit_forecast, ts_df, FORECAST_DAYS)
+                job = get_job_runner().get(forecast_job)
+                if not job.done:
+                    job_progress(forecast_job, "Forecast for " + forecast_type + " postings")
+                elif job.error is not None:
+                    raise job.error
+                else:
+                    model, forecast = job.result
+                    st.subheader("📊 Forecasted Job Postings (Next " + str(FORECAST_DAYS) + " Days)")
+                    fig = plot_plotly(model, forecast)
+                    st.plotly_chart(fig, use_container_width=True)
+                    fig_html = export_html(fig)
+                    st.download_button("📥 Download Forecast Chart", data=fig_html, file_name="job_forecast.html",
+                                       mime="text/html")
+                    csv = forecast_table(forecast).to_csv(index=False).encode('utf-8')
+                    st.download_button("📥 Download Forecast CSV", data=csv, file_name="forecast_data.csv",
+                                       mime="text/csv")
+                    with st.expander("📉 Trend & Seasonality Breakdown"):
+                        st.pyplot(model.plot_components(forecast))
+                    st.markdown(
+                        "<div class='insight-box'>*Insight*: Forecast trends help identify upcoming hiring surges.</div>",
+                        unsafe_allow_html=True)
+                    logging.info("Forecasting completed successfully")
         except Exception as e:
             logging.error(f"Error in forecasting: {str(e)}")
             st.error(f"Failed to generate forecast: {str(e)}")
 
+        # Backtest: rolling-origin accuracy of the overall, city-wise and skill-wise series under each
+        # engine setting. One background job per dataset version and selection, shared by all sessions.
+        st.subheader("🧪 Forecast Accuracy (Backtest)")
+        st.caption("Each series is refitted at several past origins and scored on the days that followed. "
+                   "A forecast is marked trustworthy when its MAPE is at most " + f"{TRUSTED_MAPE:.0%}" +
+                   " and at least " + f"{TRUSTED_COVERAGE:.0%}" + " of actual days fall inside its interval.")
+        bt_col1, bt_col2 = st.columns(2)
+        with bt_col1:
+            backtest_horizon = st.slider("Horizon (days)", 1, 30, BACKTEST_HORIZON, key="backtest_horizon")
+        with bt_col2:
+            backtest_folds = st.slider("Origins per series", 1, 10, BACKTEST_FOLDS, key="backtest_folds")
+        if st.button("Run Backtest"):
+            series = backtest_series(dataset, st.session_state.filtered_rows, deduplicate)
+            st.session_state.backtest_job = get_job_runner().submit(
+                ("backtest", dataset.version, filter_key, backtest_horizon, backtest_folds),
+                backtest, series, ENGINE_SETTINGS, backtest_horizon, backtest_folds)
+        backtest_job = get_job_runner().get(st.session_state.get("backtest_job", ""))
+        if backtest_job is not None:
+            try:
+                if not backtest_job.done:
+                    job_progress(backtest_job.id, "Backtest")
+                elif backtest_job.error is not None:
+                    raise backtest_job.error
+                elif backtest_job.result.empty:
+                    st.warning("⚠ The series are too short to backtest with this horizon.")
+                else:
+                    accuracy_df = backtest_job.result
+                    best = accuracy_df.sort_values('MAPE').drop_duplicates(['Kind', 'Series'])
+                    acc_col1, acc_col2, acc_col3 = st.columns(3)
+                    acc_col1.metric("Series Backtested", f"{len(best):,}")
+                    acc_col2.metric("Trustworthy (Best Setting)", f"{int(best['Trustworthy'].sum()):,}")
+                    acc_col3.metric("Median MAPE (Best Setting)", f"{best['MAPE'].median():.1%}")
+                    view = st.radio("Show", ["Best setting per series", "All settings"], horizontal=True,
+                                    key="backtest_view")
+                    table = best if view == "Best setting per series" else accuracy_df
+                    st.dataframe(table, use_container_width=True, hide_index=True, column_config={
+                        "MAPE": st.column_config.NumberColumn(format="percent"),
+                        "MAE": st.column_config.NumberColumn(format="%.1f"),
+                        "Coverage": st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1),
+                        "Trustworthy": st.column_config.CheckboxColumn()
+                    })
+                    st.download_button("📥 Download Backtest CSV",
+                                       data=accuracy_df.to_csv(index=False).encode('utf-8'),
+                                       file_name="forecast_backtest.csv", mime="text/csv")
+            except Exception as e:
+                logging.error(f"Error in forecast backtest: {str(e)}")
+                st.error(f"Failed to backtest forecasts: {str(e)}")
+
 # ====================
-# PAGE 6: POWER BI REPORTS
+# PAGE 7: POWER BI REPORTS
 # ====================
 elif page == "📊 Power BI Reports":
     st.title("📊 Power BI Analytics Reports")
@@ -950,7 +1297,7 @@ elif page == "📊 Power BI Reports":
         st.error(f"Failed to load Power BI reports: {str(e)}")
 
 # ====================
-# PAGE 7: CHATBOT ASSISTANT
+# PAGE 8: CHATBOT ASSISTANT
 # ====================
 elif page == "🤖 Chatbot Assistant":
     st.title("🤖 Job Market Chatbot Assistant")
@@ -998,92 +1345,148 @@ elif page == "🤖 Chatbot Assistant":
             st.session_state.chat_history.append({"role": "assistant", "content": f"Error: {str(e)}"})
 
 # ====================
-# PAGE 8: JOB APPLICATION TRACKER
+# PAGE 9: JOB APPLICATION TRACKER
 # ====================
 elif page == "📋 Job Application Tracker":
     st.title("📋 Job Application Tracker")
     st.markdown("<div class='card'>Save and track your job applications with detailed statuses.</div>",
                 unsafe_allow_html=True)
 
-    if "saved_jobs" not in st.session_state:
-        st.session_state.saved_jobs = []
+    tracker = get_tracker()
+    profile = st.session_state.get("user_profile", {})
+    tracker_user = st.text_input("Your Email or Username",
+                                 value=profile.get("email") or profile.get("name") or "").strip()
+    if not tracker_user:
+        # Anonymous visitors each get their own rows, kept for this browser session only.
+        if "guest_id" not in st.session_state:
+            st.session_state.guest_id = "guest-" + uuid.uuid4().hex
+        tracker_user = st.session_state.guest_id
+        st.caption("ℹ Without a username, saved jobs are only kept for this browser session.")
+
+    def job_label(position):
+        return (str(df['Job Title'].iat[position]) + " at " + str(df['Company Name'].iat[position]) + " (" +
+                str(df['Job Location'].iat[position]) + ", #" + str(df['Job ID'].iat[position]) + ")")
 
     st.subheader("Save a Job")
-    job_index = st.selectbox("Select Job to Save", filtered_df.index, format_func=lambda
-        x: filtered_df.loc[x, 'Job Title'] + " at " + filtered_df.loc[x, 'Company Name'])
-    status = st.selectbox("Application Status", ["Not Applied", "Applied", "Interview", "Offer", "Rejected"])
+    job_query = st.text_input("Search Jobs", placeholder="Job title, company or city...")
+    if job_query.strip():
+        candidates = dataset.find(job_query, st.session_state.filtered_rows)
+    elif st.session_state.filtered_rows is None:
+        candidates = np.arange(min(50, len(df)))
+    else:
+        candidates = st.session_state.filtered_rows[:50]
+    st.caption("Showing the first " + str(len(candidates)) + " matching jobs. Refine the search to narrow them down.")
+    job_position = st.selectbox("Select Job to Save", candidates, format_func=job_label)
+    status = st.selectbox("Application Status", STATUSES)
     notes = st.text_area("Notes", placeholder="Add any notes about this application...")
     if st.button("Save Job"):
         try:
-            job_data = filtered_df.loc[job_index].to_dict()
-            job_data.update({
-                "Status": status,
-                "Notes": notes,
-                "Saved Date": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-            st.session_state.saved_jobs.append(job_data)
-            st.success("✅ Job saved successfully!")
-            logging.info(f"Job saved: {job_data['Job Title']} at {job_data['Company Name']}")
+            if job_position is None:
+                st.warning(lang["no_data"])
+            else:
+                tracker.save(tracker_user, df['Job ID'].iat[job_position], status, notes)
+                st.success("✅ Job saved successfully!")
+                logging.info(f"Job saved for {tracker_user}: {job_label(job_position)}")
         except Exception as e:
             logging.error(f"Error saving job: {str(e)}")
             st.error(f"Failed to save job: {str(e)}")
 
     st.subheader("Your Saved Jobs")
-    if st.session_state.saved_jobs:
-        saved_df = pd.DataFrame(st.session_state.saved_jobs)
-        st.dataframe(saved_df[['Job Title', 'Company Name', 'Job Location', 'Status', 'Saved Date', 'Notes']],
-                     use_container_width=True)
+    try:
+        saved_df = tracker.saved_with_details(tracker_user, dataset)
+    except Exception as e:
+        logging.error(f"Error loading saved jobs: {str(e)}")
+        st.error(f"Failed to load saved jobs: {str(e)}")
+        saved_df = pd.DataFrame()
+    if not saved_df.empty:
+        st.dataframe(saved_df[['Job ID', 'Job Title', 'Company Name', 'Job Location', 'Status', 'Saved Date',
+                               'Updated Date', 'Notes']], use_container_width=True, hide_index=True)
         csv = saved_df.to_csv(index=False).encode('utf-8')
         st.download_button("📥 Download Saved Jobs", data=csv, file_name="saved_jobs.csv", mime="text/csv")
+
+        st.markdown("#### Bulk Update")
+        saved_labels = dict(zip(saved_df['Job ID'].tolist(), saved_df['Job Title'].astype(str) + " at " +
+                                saved_df['Company Name'].astype(str) + " (#" + saved_df['Job ID'].astype(str) + ")"))
+        bulk_ids = st.multiselect("Saved Jobs", list(saved_labels), format_func=saved_labels.get)
+        bulk_col1, bulk_col2, bulk_col3 = st.columns([2, 1, 1])
+        bulk_status = bulk_col1.selectbox("New Status", STATUSES, key="bulk_status")
+        if bulk_col2.button("Update Status", disabled=not bulk_ids):
+            try:
+                changed = tracker.update_status(tracker_user, bulk_ids, bulk_status)
+                logging.info(f"Bulk status update for {tracker_user}: {changed} jobs set to {bulk_status}")
+                st.rerun()
+            except Exception as e:
+                logging.error(f"Error updating saved jobs: {str(e)}")
+                st.error(f"Failed to update saved jobs: {str(e)}")
+        if bulk_col3.button("Remove Selected", disabled=not bulk_ids):
+            try:
+                tracker.remove(tracker_user, bulk_ids)
+                logging.info(f"Removed {len(bulk_ids)} saved jobs for {tracker_user}")
+                st.rerun()
+            except Exception as e:
+                logging.error(f"Error removing saved jobs: {str(e)}")
+                st.error(f"Failed to remove saved jobs: {str(e)}")
     else:
         st.info("ℹ No jobs saved yet.")
 
 # ====================
-# PAGE 9: SKILL GAP ANALYSIS
+# PAGE 10: SKILL GAP ANALYSIS
 # ====================
 elif page == "🎓 Skill Gap Analysis":
     st.title("🎓 Skill Gap Analysis")
     st.markdown("<div class='card'>Identify gaps between your skills and job market demands.</div>",
                 unsafe_allow_html=True)
 
+    role_skills = dataset.role_skills
+
     st.subheader("Your Skills")
-    user_skills = st.multiselect("Select Your Skills", sorted(
-        {skill.strip() for skills in df['Skills Required'].dropna() for skill in skills.split(',')}))
+    user_skills = st.multiselect("Select Your Skills", dataset.skills.vocabulary)
 
     st.subheader("Target Job Role")
-    target_role = st.selectbox("Select Target Job Role", sorted(df['Job Title'].unique()))
+    target_role = st.selectbox("Select Target Job Role", role_skills.roles)
+    if len(role_skills.roles) > 1:
+        top_k = st.slider("Closest Roles to Show", 1, len(role_skills.roles), min(5, len(role_skills.roles)))
+    else:
+        # A slider needs min < max; with a single role there is nothing to choose.
+        top_k = len(role_skills.roles)
 
     if st.button("Analyze Skill Gap"):
         try:
-            role_skills = set()
-            for skills in df[df['Job Title'] == target_role]['Skills Required'].dropna():
-                role_skills.update([s.strip().lower() for s in skills.split(',')])
-            user_skills_set = set([s.lower() for s in user_skills])
-            missing_skills = role_skills - user_skills_set
-            matched_skills = role_skills & user_skills_set
+            matched_skills, missing_skills = role_skills.gap(target_role, user_skills)
+            scores = role_skills.score(user_skills).set_index('Role')
 
             st.subheader("Analysis Results")
+            metric_col1, metric_col2, metric_col3 = st.columns(3)
+            metric_col1.metric("Weighted Coverage", f"{scores.loc[target_role, 'Coverage']:.0%}")
+            metric_col2.metric("Weighted Jaccard", f"{scores.loc[target_role, 'Jaccard']:.2f}")
+            metric_col3.metric("Role Postings", int(scores.loc[target_role, 'Postings']))
+
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("### ✅ Matched Skills")
-                if matched_skills:
-                    for skill in matched_skills:
-                        st.markdown("- " + skill.capitalize())
+                if not matched_skills.empty:
+                    for skill, share in matched_skills.items():
+                        st.markdown("- " + skill + " (" + f"{share:.0%}" + " of postings)")
                 else:
                     st.info("No matching skills found.")
             with col2:
                 st.markdown("### ❗ Missing Skills")
-                if missing_skills:
-                    for skill in missing_skills:
-                        st.markdown("- " + skill.capitalize())
+                if not missing_skills.empty:
+                    for skill, share in missing_skills.items():
+                        st.markdown("- " + skill + " (" + f"{share:.0%}" + " of postings)")
                 else:
                     st.success("You have all required skills!")
 
-            if missing_skills:
+            st.markdown("### 🧭 Roles Closest to Your Skills")
+            closest = role_skills.closest_roles(user_skills, top_k)
+            st.dataframe(closest.style.format({'Coverage': '{:.0%}', 'Jaccard': '{:.2f}'}),
+                         use_container_width=True, hide_index=True)
+
+            if not missing_skills.empty:
                 st.markdown("### 📚 Learning Recommendations")
-                for skill in missing_skills:
-                    with st.expander("Learn " + skill.capitalize()):
-                        st.write("*Resources for " + skill.capitalize() + ":*")
+                for skill in missing_skills.index:
+                    with st.expander("Learn " + skill):
+                        st.write("*Resources for " + skill + ":*")
                         st.markdown("- Online courses (e.g., Coursera, Udemy)")
                         st.markdown("- Official documentation or books")
                         st.markdown("- Practice projects or certifications")
@@ -1093,7 +1496,7 @@ elif page == "🎓 Skill Gap Analysis":
             st.error(f"Failed to analyze skill gap: {str(e)}")
 
 # ====================
-# PAGE 10: FEEDBACK SUBMISSION
+# PAGE 11: FEEDBACK SUBMISSION
 # ====================
 elif page == "📝 Feedback Submission":
     st.title("📝 Feedback Submission")
@@ -1107,8 +1510,7 @@ elif page == "📝 Feedback Submission":
             st.warning(lang["feedback_comments"])
         else:
             try:
-                with open("feedback.csv", "a", encoding='utf-8') as f:
-                    f.write(str(pd.Timestamp.now()) + "," + str(rating) + "," + feedback.replace(',', ' ') + "\n")
+                get_writer().append_csv(FEEDBACK_PATH, [str(pd.Timestamp.now()), rating, feedback], FEEDBACK_HEADER)
                 st.success(lang["feedback_success"])
                 logging.info(f"Feedback submitted: Rating {rating}, Comments: {feedback[:50]}...")
             except Exception as e:
@@ -1116,7 +1518,7 @@ elif page == "📝 Feedback Submission":
                 st.error(lang["feedback_error"])
 
 # ====================
-# PAGE 11: USER PROFILE
+# PAGE 12: USER PROFILE
 # ====================
 elif page == "👤 User Profile":
     st.title("👤 User Profile")
@@ -1127,20 +1529,35 @@ elif page == "👤 User Profile":
             "name": "",
             "email": "",
             "preferred_city": "",
-            "preferred_skills": []
+            "preferred_skills": [],
+            "experience": "",
+            "remote_preference": ""
         }
+    profile = st.session_state.user_profile
 
     st.subheader("Profile Details")
-    name = st.text_input("Name", value=st.session_state.user_profile["name"])
-    email = st.text_input("Email", value=st.session_state.user_profile["email"])
-    preferred_city = st.selectbox("Preferred Job Location", sorted(df['Job Location'].dropna().unique()),
-                                  index=df['Job Location'].dropna().unique().tolist().index(
-                                      st.session_state.user_profile["preferred_city"])
-                                  if st.session_state.user_profile["preferred_city"] in df[
-                                      'Job Location'].dropna().unique() else 0)
-    preferred_skills = st.multiselect("Preferred Skills", sorted(
-        {skill.strip() for skills in df['Skills Required'].dropna() for skill in skills.split(',')}),
-                                      default=st.session_state.user_profile["preferred_skills"])
+    name = st.text_input("Name", value=profile["name"])
+    email = st.text_input("Email", value=profile["email"])
+    user = profile_user({"name": name, "email": email})
+    if user in saved_profiles and user != profile_user(profile):
+        # A returning user: the widgets below take their defaults from the restored profile.
+        st.session_state.user_profile = dict(profile, **saved_profiles[user])
+        st.rerun()
+    city_options = sorted(df['Job Location'].dropna().unique())
+    preferred_city = st.selectbox("Preferred Job Location", city_options,
+                                  index=city_options.index(profile["preferred_city"])
+                                  if profile["preferred_city"] in city_options else 0)
+    preferred_skills = st.multiselect("Preferred Skills", dataset.skills.vocabulary,
+                                      default=[s for s in profile["preferred_skills"]
+                                               if s in dataset.skills.vocabulary])
+    experience_options = list(df['Experience Required'].cat.categories)
+    experience = st.selectbox("Your Experience", experience_options,
+                              index=experience_options.index(profile.get("experience"))
+                              if profile.get("experience") in experience_options else 0)
+    remote_options = sorted(df['Remote/Onsite'].dropna().unique())
+    remote_preference = st.selectbox("Preferred Work Mode", remote_options,
+                                     index=remote_options.index(profile.get("remote_preference"))
+                                     if profile.get("remote_preference") in remote_options else 0)
 
     if st.button(lang["save_profile"]):
         try:
@@ -1148,16 +1565,37 @@ elif page == "👤 User Profile":
                 "name": name,
                 "email": email,
                 "preferred_city": preferred_city,
-                "preferred_skills": preferred_skills
+                "preferred_skills": preferred_skills,
+                "experience": experience,
+                "remote_preference": remote_preference
             }
-            with open("user_profile.json", "w", encoding='utf-8') as f:
-                json.dump(st.session_state.user_profile, f)
+            if user:
+                save_profile(get_writer(), st.session_state.user_profile)
+                saved_profiles[user] = st.session_state.user_profile
+            else:
+                st.info("ℹ Enter a name or email to restore your profile in a later session.")
             st.success(lang["profile_updated"])
             logging.info(f"User profile updated: {name}, {email}")
         except Exception as e:
             logging.error(f"Error saving profile: {str(e)}")
             st.error(lang["profile_error"])
 
+    st.subheader("🎯 Recommended Jobs for You")
+    rec_count = st.slider("Number of Recommendations", 5, 50, DEFAULT_RECOMMENDATIONS, step=5)
+    try:
+        recommendations = dataset.recommender.recommend({
+            "preferred_city": preferred_city,
+            "preferred_skills": preferred_skills,
+            "experience": experience,
+            "remote_preference": remote_preference
+        }, k=rec_count)
+        st.dataframe(recommendations[['Job Title', 'Company Name', 'Job Location', 'Experience Required',
+                                      'Remote/Onsite', 'Salary Range', 'Skills Required', 'Match Score']],
+                     use_container_width=True, hide_index=True)
+    except Exception as e:
+        logging.error(f"Error generating recommendations: {str(e)}")
+        st.error(f"Failed to generate recommendations: {str(e)}")
+
     st.subheader("Generate Summary Report")
     if st.button("Download Summary Report"):
         try:
@@ -1178,4 +1616,84 @@ elif page == "👤 User Profile":
                 st.error("Failed to generate summary report.")
         except Exception as e:
             logging.error(f"Error downloading summary report: {str(e)}")
-            st.error(f"Failed to download report: {str(e)}")
\ No newline at end of file
+            st.error(f"Failed to download report: {str(e)}")
+
+    st.subheader("Segment Reports")
+    st.write("One report per city, company and job title within the current filters, bundled as a ZIP.")
+    if st.button("Build Segment Reports"):
+        try:
+            with TELEMETRY.stage(page, "segment reports"):
+                bundle = report_bundle(dataset, ['Job Location', 'Company Name', 'Job Title'],
+                                       st.session_state.filtered_rows)
+            st.download_button(
+                label="📦 Download Segment Reports",
+                data=bundle,
+                file_name="job_market_segment_reports.zip",
+                mime="application/zip"
+            )
+            logging.info("Segment report bundle generated")
+        except Exception as e:
+            logging.error(f"Error generating segment reports: {str(e)}")
+            st.error(f"Failed to generate segment reports: {str(e)}")
+
+# ====================
+# PAGE 13: DIAGNOSTICS (hidden; open the app with ?diagnostics in the URL)
+# ====================
+elif page == "🩺 Diagnostics":
+    st.title("🩺 Diagnostics")
+    st.markdown("<div class='card'>Process-wide timings, cache hit rates and memory, shared by all sessions.</div>",
+                unsafe_allow_html=True)
+
+    cache_mem, session_mem = memory_report()
+    metrics = TELEMETRY.snapshot({
+        "memory": {"caches": cache_mem.to_dict(orient="records"), "sessions": session_mem.to_dict(orient="records")}
+    })
+    diag_col1, diag_col2, diag_col3, diag_col4 = st.columns(4)
+    diag_col1.metric("Process RSS", format_bytes(metrics["rss_bytes"]) if metrics["rss_bytes"] else "n/a")
+    diag_col2.metric("Uptime", f"{metrics['uptime_s'] / 60:.1f} min")
+    diag_col3.metric("Live Sessions", len(session_mem))
+    diag_col4.metric("Dataset", format_bytes(dataset.nbytes))
+
+    st.subheader("⏱ Stage Timings")
+    stages_df = pd.DataFrame(metrics["stages"])
+    if stages_df.empty:
+        st.info("ℹ No timings recorded yet.")
+    else:
+        st.dataframe(stages_df.sort_values("total_s", ascending=False), use_container_width=True, hide_index=True)
+
+    st.subheader("🗃 Cache Hit Rates")
+    st.dataframe(pd.DataFrame(metrics["caches"]), use_container_width=True, hide_index=True)
+
+    st.subheader("⚙ Background Jobs")
+    jobs_df = pd.DataFrame(get_job_runner().summary())
+    if jobs_df.empty:
+        st.info("ℹ No background jobs submitted yet.")
+    else:
+        st.dataframe(jobs_df, use_container_width=True, hide_index=True)
+
+    st.subheader("🧠 Memory")
+    st.dataframe(cache_mem.assign(Size=cache_mem['Bytes'].map(format_bytes)), use_container_width=True,
+                 hide_index=True)
+    if not session_mem.empty:
+        st.dataframe(session_mem.assign(Size=session_mem['Bytes'].map(format_bytes)), use_container_width=True,
+                     hide_index=True)
+
+    st.download_button("📥 Download Metrics JSON", data=json.dumps(metrics, indent=2, default=str),
+                       file_name="dashboard_metrics.json", mime="application/json")
+
+    st.subheader("🔬 Profile a Rerun")
+    engines = ["cprofile"] + (["pyinstrument"] if pyinstrument_available() else [])
+    profile_engine = st.radio("Profiler", engines, horizontal=True)
+    if st.button("Profile Next Rerun"):
+        st.session_state.profile_next_rerun = True
+        st.session_state.profile_engine = profile_engine
+        st.info("ℹ The next page interaction in this session will be profiled. Come back here to see the report.")
+    if st.session_state.get("profile_report"):
+        st.code(st.session_state.profile_report, language="text")
+
+# Rerun Instrumentation
+rerun_seconds = time.perf_counter() - rerun_started
+TELEMETRY.record("App", "rerun", rerun_seconds)
+TELEMETRY.record(page, "rerun", rerun_seconds)
+if rerun_profiler is not None:
+    st.session_state.profile_report = st.session_state.pop("rerun_profiler").stop()
@@ -0,0 +1,209 @@
+"""Benchmarks of the dashboard's hot paths on synthetic datasets of growing size.
+
+For each size a synthetic CSV is generated (and kept under ``--data-dir``
+for later runs), loaded the way the dashboard loads it, and the code
+behind each page is timed without Streamlit::
+
+    python benchmark.py                          # 20k and 200k rows
+    python benchmark.py --sizes 20k 200k 2M 20M --output results.json
+    python benchmark.py --compare baseline.json  # flag regressions
+
+Results are written as JSON with per-stage count/mean/p50/p95/max in
+milliseconds, dataset and process memory, and the git commit, so runs of
+different versions can be compared. A size that fails (e.g. runs out of
+memory) is recorded with its error and the run moves on to the next size.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from chatbot import chatbot_reply
+from job_data import JobDataset, count_values, recent_postings
+from plotting import scatter_data
+from reporting import report_bundle, summarize, summary_markdown
+from skills import SkillTimeline, SkillTrends
+from synthetic_data import SIZES, parse_size, write_csv
+from telemetry import StageStats, current_rss
+
+CHATBOT_QUESTIONS = ["what are the top skills right now?", "is python still worth learning",
+                     "tell me a joke about recruiters"]
+SEARCH_QUERIES = ["python", "data sci", "script", "engineer bangalore"]
+SEGMENT_COLUMNS = ['Job Location', 'Company Name', 'Job Title']
+COMPANY_COLUMNS = ['Company Name', 'Job Title', 'Job Location', 'Experience Required', 'Job Type']
+
+
+def measure(fn, repeat):
+    """Run ``fn`` ``repeat`` times; return its timing summary and last result."""
+    stats = StageStats()
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        stats.add(time.perf_counter() - start)
+    return stats.summary(), result
+
+
+def sidebar_selection(dataset):
+    """A typical sidebar filter: one popular skill, the top three cities and two bands."""
+    frame = dataset.frame
+    return {
+        'skills': (dataset.skills.vocabulary[int(np.argmax(dataset.skills.counts()))],),
+        'cities': tuple(count_values(frame['Job Location']).index[:3]),
+        'experience': tuple(frame['Experience Required'].cat.categories[:2]),
+        'salary_range': (5, 20),
+        'applicants_range': (50, 400),
+    }
+
+
+def load_nlp():
+    """The dashboard's spaCy model, or a blank English tokenizer when it is not installed."""
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        logging.warning("en_core_web_sm not installed; timing the chatbot with a blank English pipeline")
+        return spacy.blank("en")
+
+
+def benchmark_size(path, rows, repeat, forecast, nlp):
+    stages = {}
+    load_repeat = 1 if rows >= SIZES['2M'] else repeat
+    stages['load'], dataset = measure(lambda: JobDataset.load(path), load_repeat)
+    stages['skill matrix build'], _ = measure(lambda: dataset.skills, 1)
+
+    stages['facet index build'], _ = measure(lambda: dataset.facets, 1)
+    selection = sidebar_selection(dataset)
+    stages['sidebar filter'], filtered_rows = measure(lambda: dataset.filter_rows(**selection), repeat)
+    stages['facet counts'], _ = measure(lambda: dataset.facet_counts(**selection), repeat)
+    stages['search index build'], _ = measure(lambda: dataset.search_index, 1)
+    stages['keyword search'], _ = measure(
+        lambda: [dataset.find(query, filtered_rows) for query in SEARCH_QUERIES], repeat)
+    stages['duplicate detection build'], _ = measure(lambda: dataset.duplicates, 1)
+    stages['deduplicated filter'], _ = measure(lambda: dataset.filter_rows(**selection, distinct=True), repeat)
+    stages['select filtered rows'], filtered_df = measure(lambda: dataset.select(filtered_rows), repeat)
+    latest = dataset.frame['Posted Date'].max()
+    stages['check_new_jobs'], _ = measure(lambda: len(recent_postings(filtered_df, days=1, now=latest)), repeat)
+    stages['company insights aggregations'], _ = measure(
+        lambda: [count_values(filtered_df[column]) for column in COMPANY_COLUMNS], repeat)
+    stages['skill counting'], _ = measure(lambda: dataset.skills.top(filtered_rows, 10), repeat)
+    stages['skill timeline build'], _ = measure(lambda: dataset.skill_timeline, 1)
+    stages['emerging skills'], _ = measure(
+        lambda: [SkillTrends(dataset.skill_timeline, filtered_rows).scores(window) for window in SkillTrends.WINDOWS],
+        repeat)
+    # New postings folded into a copy of the timeline; the trend sums only recompute from the day they landed on.
+    timeline = SkillTimeline(dataset.skills, dataset.frame['Posted Date'])
+    incremental_trends = SkillTrends(timeline)
+    arrivals = dataset.frame['Skills Required'].tail(max(len(dataset) // 1000, 1))
+    stages['skill trends after ingest'], _ = measure(
+        lambda: (timeline.add(arrivals, [latest + pd.Timedelta(days=1)] * len(arrivals)),
+                 incremental_trends.scores(30)), repeat)
+    stages['skill sparklines'], _ = measure(
+        lambda: dataset.skill_timeline.trends(dataset.skills.top(filtered_rows, 10).index, filtered_rows), repeat)
+    points = pd.DataFrame({'x': dataset.frame['Posted Date'].to_numpy().astype('datetime64[D]').astype(np.int64),
+                           'y': dataset.frame['Number of Applicants'].to_numpy(dtype=float),
+                           'group': dataset.frame['Job Location'].cat.codes.to_numpy()})
+    stages['scatter density grid'], _ = measure(lambda: scatter_data(points, 'x', 'y', 'group'), repeat)
+    stages['scatter stratified sample'], _ = measure(
+        lambda: scatter_data(points, 'x', 'y', 'group', reduce='sample'), repeat)
+    stages['chatbot response'], _ = measure(
+        lambda: [chatbot_reply(question, nlp, dataset.skills.lookup) for question in CHATBOT_QUESTIONS], repeat)
+    stages['summary report'], _ = measure(
+        lambda: summary_markdown(summarize(dataset, filtered_rows)), repeat)
+    stages['segment report bundle'], _ = measure(lambda: report_bundle(dataset, SEGMENT_COLUMNS), repeat)
+    if forecast:
+        from forecasting import FORECAST_DAYS, backtest, daily_counts, fit_forecast
+        stages['forecast series'], ts_df = measure(lambda: daily_counts(dataset.frame['Posted Date']), repeat)
+        stages['skill forecast series'], _ = measure(
+            lambda: dataset.skill_timeline.daily_counts(selection['skills'][0]), repeat)
+        stages['forecast fit'], _ = measure(lambda: fit_forecast(ts_df, FORECAST_DAYS), 1)
+        stages['forecast backtest'], _ = measure(lambda: backtest({'overall': ts_df}), 1)
+
+    return {"rows": len(dataset), "filtered_rows": len(filtered_df), "csv_bytes": os.path.getsize(path),
+            "dataset_bytes": dataset.nbytes, "rss_bytes": current_rss(), "stages": stages}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current, threshold):
+    """Print p50 changes per size and stage; return the number of regressions."""
+    before = {(run["label"], stage): stats["p50_ms"] for run in previous["runs"]
+              for stage, stats in run.get("stages", {}).items()}
+    regressions = 0
+    print(f"{'size':>6}  {'stage':<30} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for run in current["runs"]:
+        for stage, stats in run.get("stages", {}).items():
+            old = before.get((run["label"], stage))
+            if not old:
+                continue
+            ratio = stats["p50_ms"] / old
+            flag = "  REGRESSION" if ratio > threshold else ""
+            regressions += bool(flag)
+            print(f"{run['label']:>6}  {stage:<30} {old:>10.2f} {stats['p50_ms']:>10.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["20k", "200k"],
+                        help="row counts, e.g. 20k 200k 2M 20M (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage (default: %(default)s)")
+    parser.add_argument("--data-dir", default="bench_data", help="where synthetic CSVs are kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-forecast", action="store_true", help="skip the Prophet fit")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="p50 ratio above which a stage counts as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    nlp = load_nlp()
+    results = {"timestamp": time.time(), "git_commit": git_commit(),
+               "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                               "pandas": pd.__version__, "numpy": np.__version__, "cpus": os.cpu_count()},
+               "repeat": args.repeat, "seed": args.seed, "runs": []}
+    for label in args.sizes:
+        rows = parse_size(label)
+        path = os.path.join(args.data_dir, f"synthetic_{rows}_seed{args.seed}.csv")
+        run = {"label": label, "rows": rows}
+        try:
+            if not os.path.exists(path):
+                logging.info(f"Generating {rows} synthetic postings at {path}")
+                write_csv(rows, path, seed=args.seed)
+            logging.info(f"Benchmarking {label} rows")
+            run.update(benchmark_size(path, rows, args.repeat, not args.no_forecast, nlp))
+        except Exception as e:
+            logging.error(f"Benchmark for {label} rows failed: {str(e)}")
+            run["error"] = f"{type(e).__name__}: {str(e)}"
+        results["runs"].append(run)
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+
+    for run in results["runs"]:
+        for stage, stats in run.get("stages", {}).items():
+            print(f"{run['label']:>6}  {stage:<30} p50 {stats['p50_ms']:>10.2f} ms  max {stats['max_ms']:>10.2f} ms")
+    logging.info(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            return 1 if compare(json.load(f), results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Keyword and skill matching behind the dashboard's chatbot.
+
+Kept free of Streamlit so replies can be produced (and benchmarked)
+outside the dashboard. The caller owns the spaCy pipeline and decides what
+to do with unrecognised questions.
+"""
+import logging
+
+RESPONSES = {
+    "top_skills": {
+        "keywords": ["top skills", "in-demand skills", "popular skills", "best skills"],
+        "response": "Based on the dataset, top in-demand skills include Python, Java, SQL, AWS, and Machine Learning. Check the Skill Insights page for a detailed analysis!"
+    },
+    "top_companies": {
+        "keywords": ["top companies", "hiring companies", "best companies", "major employers"],
+        "response": "Top hiring companies include TCS, Infosys, and Wipro. Visit the Company Insights page for a bar chart of top companies."
+    },
+    "job_locations": {
+        "keywords": ["job locations", "popular cities", "job cities", "where are jobs"],
+        "response": "Popular job locations are Bangalore, Hyderabad, Mumbai, and Delhi. The Company Insights page shows a pie chart of job distributions by city."
+    },
+    "how_to_use": {
+        "keywords": ["how to use", "use dashboard", "navigate dashboard", "dashboard guide"],
+        "response": "Use the sidebar to navigate pages, apply filters for skills, locations, or experience, and explore visualizations. Try the ML Analysis page for predictive insights!"
+    },
+    "salary_prediction": {
+        "keywords": ["salary prediction", "predict salary", "salary range", "how much can i earn"],
+        "response": "Go to the ML Analysis page and select Salary Prediction to input job details and get a predicted salary range."
+    },
+    "dashboard_info": {
+        "keywords": ["what is this dashboard", "dashboard purpose", "about dashboard", "dashboard info",
+                     "who built this dashboard", "who created this"],
+        "response": "This is an India Job Market Dashboard built by Harsh Dwivedi and Radhika Verma. It analyzes job postings, skills, companies, and more using data visualizations and ML models."
+    },
+    "highest_paying_jobs": {
+        "keywords": ["highest paying job roles", "high paying jobs", "best paying roles", "top salary jobs"],
+        "response": "High-paying roles include Data Scientist, Machine Learning Engineer, and Software Architect, often offering 12-20 LPA or more. Check the ML Analysis page for salary predictions."
+    },
+    "most_job_opportunities": {
+        "keywords": ["most job opportunities", "cities with most jobs", "job opportunities",
+                     "where are most jobs"],
+        "response": "Bangalore, Hyderabad, and Mumbai have the most job opportunities. Explore the Company Insights page for a pie chart of job distributions by city."
+    },
+    "improve_prospects": {
+        "keywords": ["improve job prospects", "better job", "job chances", "career prospects"],
+        "response": "Learn in-demand skills like Python, AWS, or Data Science, and gain 2-5 years of experience. Use the Skill Insights and ML Analysis pages to identify trends and network on LinkedIn."
+    },
+    "job_trend": {
+        "keywords": ["job market trend", "trend for", "skill trend", "market trend"],
+        "response": "To see trends for a specific skill, go to the Forecasting page, select Skill-wise forecasting, and choose your skill for a 90-day job posting forecast."
+    },
+    "skills_to_learn": {
+        "keywords": ["skills to learn", "learn skills", "job skills", "skills for jobs",
+                     "skills should i learn"],
+        "response": "Focus on Python, SQL, AWS, Java, and Machine Learning for technical roles, plus soft skills like communication. Visit the Skill Insights page for top skills."
+    },
+    "fresher_jobs": {
+        "keywords": ["hiring freshers", "fresher jobs", "entry level jobs", "jobs for freshers"],
+        "response": "Companies like TCS, Infosys, and Wipro hire freshers (0-2 years experience). Filter by 0-2 years in the sidebar and check Company Insights for top companies."
+    },
+    "ml_accuracy": {
+        "keywords": ["ml predictions accurate", "prediction accuracy", "how accurate", "ml reliability"],
+        "response": "ML predictions like salary ranges are mock models for demonstration. Real accuracy depends on data and training. See ML Analysis for confidence scores."
+    }
+}
+
+FALLBACK_RESPONSE = "I'm not sure how to answer that. Try asking about skills, companies, or locations!"
+
+
+def chatbot_reply(user_input, nlp, skills):
+    """Answer a lower-cased, stripped question, or return ``None`` if nothing matches.
+
+    ``skills`` is any container of lower-case skill names (e.g. ``SkillMatrix.lookup``).
+    """
+    for key, value in RESPONSES.items():
+        for keyword in value["keywords"]:
+            if keyword in user_input:
+                logging.info(f"Matched keyword: {keyword} for response: {key}")
+                return value["response"]
+
+    for token in nlp(user_input):
+        if token.text in skills:
+            logging.info(f"Matched skill: {token.text}")
+            return "Trends for " + token.text.capitalize() + ": Check the Forecasting page for a 90-day forecast."
+    return None
@@ -0,0 +1,228 @@
+"""Headless reports, forecasts and chart exports, e.g. for cron jobs.
+
+Reuses the dashboard's loading, filtering, reporting and forecasting code
+without importing Streamlit. The dataset is loaded once and every segment
+is written to its own directory under ``--out``::
+
+    python cli.py --out out --city Bangalore --skills Python SQL
+    python cli.py --out out --split-by "Job Location" --formats md csv
+    python cli.py --out out --segments segments.json --forecast --charts
+    python cli.py --out out --batch "Job Location" "Company Name" "Job Title"
+    python cli.py --out out --backtest --backtest-horizon 7 --backtest-folds 3
+    python cli.py --out out --recommendations --top 20
+
+A segments file is a JSON list of objects with a ``name`` and any of the
+filter keys ``skills``, ``cities``, ``experience`` (lists) and
+``salary_range``, ``experience_range``, ``applicants_range`` (``[low, high]``).
+Segment filters override the command-line filters. Each segment is written
+to a directory named after it, with a numeric suffix when two names slug
+alike ("C++" and "C"); ``segments.csv`` maps every segment to its directory.
+
+``--batch`` writes a single ``summary_bundle.zip`` with a report for every
+value of each listed column (within the command-line filters) and an
+index, all computed in one grouped pass.
+
+``--backtest`` writes ``forecast_backtest.csv`` with the rolling-origin
+accuracy (MAPE, MAE, interval coverage) of the overall, city-wise and
+skill-wise forecasts under each engine setting, fitted in parallel.
+
+``--recommendations`` writes ``recommendations.csv`` with the top postings
+for every profile saved from the dashboard, scored in one batch.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from job_data import DATA_PATH, JobDataset
+from recommender import DEFAULT_RECOMMENDATIONS
+from reporting import (CHARTS, export_chart, report_bundle, slugify, summarize, summary_html, summary_markdown,
+                       summary_table, unique_slugs)
+from storage import PROFILES_PATH, load_profiles
+
+FILTER_KEYS = ['skills', 'cities', 'experience', 'salary_range', 'experience_range', 'applicants_range']
+FORMATS = ['md', 'html', 'csv']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH, help="dataset CSV (default: %(default)s)")
+    parser.add_argument("--out", default="reports/cli", help="output directory (default: %(default)s)")
+    parser.add_argument("--skills", nargs="+", default=[], metavar="SKILL")
+    parser.add_argument("--cities", "--city", nargs="+", default=[], metavar="CITY")
+    parser.add_argument("--experience", nargs="+", default=[], metavar="BAND", help='e.g. "2-5 years"')
+    parser.add_argument("--salary-range", nargs=2, type=int, metavar=("LOW", "HIGH"), help="in LPA")
+    parser.add_argument("--experience-range", nargs=2, type=int, metavar=("LOW", "HIGH"), help="in years")
+    parser.add_argument("--applicants-range", nargs=2, type=int, metavar=("LOW", "HIGH"))
+    parser.add_argument("--segments", help="JSON file listing segments to report on")
+    parser.add_argument("--split-by", metavar="COLUMN", help="one segment per value of a column")
+    parser.add_argument("--batch", nargs="+", metavar="COLUMN",
+                        help="write one bundle of reports for every value of these columns")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--jobs", action="store_true", help="also write the matching postings as CSV")
+    parser.add_argument("--charts", action="store_true", help="also export the dashboard charts as HTML")
+    parser.add_argument("--forecast", action="store_true", help="also fit a Prophet forecast per segment")
+    parser.add_argument("--forecast-days", type=int, default=None)
+    parser.add_argument("--backtest", action="store_true",
+                        help="write the rolling-origin accuracy of the overall, city and skill forecasts")
+    parser.add_argument("--backtest-horizon", type=int, default=None, metavar="DAYS")
+    parser.add_argument("--backtest-folds", type=int, default=None, metavar="N", help="origins per series")
+    parser.add_argument("--workers", type=int, default=None, help="parallel backtest fits (default: CPU count)")
+    parser.add_argument("--recommendations", action="store_true",
+                        help="write the top postings for every saved user profile")
+    parser.add_argument("--profiles", default=PROFILES_PATH, help="saved user profiles (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=DEFAULT_RECOMMENDATIONS, help="recommendations per profile")
+    parser.add_argument("--cdn", action="store_true", help="load plotly.js from a CDN instead of embedding it")
+    return parser.parse_args(argv)
+
+
+def base_filters(args):
+    return {key: (tuple(value) if isinstance(value, list) else value)
+            for key, value in ((key, getattr(args, key)) for key in FILTER_KEYS) if value}
+
+
+def load_segments(args, dataset):
+    """Return ``[(name, rows)]`` for every segment requested on the command line."""
+    base = base_filters(args)
+    if args.segments:
+        with open(args.segments, encoding='utf-8') as f:
+            specs = json.load(f)
+        segments = []
+        for i, spec in enumerate(specs):
+            filters = dict(base, **{key: tuple(spec[key]) for key in FILTER_KEYS if spec.get(key)})
+            segments.append((spec.get('name') or 'segment-' + str(i + 1), dataset.filter_rows(**filters)))
+    else:
+        segments = [("all" if not base else "filtered", dataset.filter_rows(**base))]
+    if args.split_by:
+        segments = [(name + " " + str(value) if len(segments) > 1 else str(value), split)
+                    for name, rows in segments for value, split in split_rows(dataset, rows, args.split_by)]
+    return segments
+
+
+def split_rows(dataset, rows, column):
+    """Positions of ``rows`` for each value of ``column``, most postings first."""
+    if column not in dataset.frame.columns:
+        raise SystemExit("Unknown column for --split-by: " + column)
+    values = dataset.select(rows)[column].astype('category')
+    positions = np.arange(len(dataset)) if rows is None else np.asarray(rows)
+    codes = values.cat.codes.to_numpy()
+    # One stable sort groups the rows of every value; the counts give the group boundaries.
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+    starts = np.concatenate([[np.count_nonzero(codes < 0)], np.count_nonzero(codes < 0) + np.cumsum(counts)])
+    return [(values.cat.categories[code], positions[order[starts[code]:starts[code + 1]]])
+            for code in np.argsort(-counts, kind='stable') if counts[code]]
+
+
+def write_segment(dataset, name, rows, args, directory):
+    """Write the requested outputs for one segment into ``directory``; return a row for the index."""
+    path = os.path.join(args.out, directory)
+    os.makedirs(path, exist_ok=True)
+    summary = summarize(dataset, rows)
+    title = "Job Market Summary Report: " + name
+    if 'md' in args.formats:
+        with open(os.path.join(path, "summary.md"), "w", encoding='utf-8') as f:
+            f.write(summary_markdown(summary, title))
+    if 'html' in args.formats:
+        with open(os.path.join(path, "summary.html"), "w", encoding='utf-8') as f:
+            f.write(summary_html(summary, title))
+    if 'csv' in args.formats:
+        summary_table(summary).to_csv(os.path.join(path, "summary.csv"), index=False)
+    if args.jobs:
+        dataset.select(rows).to_csv(os.path.join(path, "filtered_job_data.csv"), index=False)
+    plotlyjs = 'cdn' if args.cdn else True
+    if args.charts:
+        for chart in CHARTS:
+            with open(os.path.join(path, chart + ".html"), "w", encoding='utf-8') as f:
+                f.write(export_chart(chart, dataset, rows, include_plotlyjs=plotlyjs))
+    if args.forecast:
+        write_forecast(dataset.select(rows), path, args.forecast_days, plotlyjs)
+    return {"Segment": name, "Directory": directory, "Total Jobs": summary['Total Jobs']}
+
+
+def write_forecast(frame, path, days, plotlyjs):
+    # Prophet is slow to import, so it is only loaded when a forecast is requested.
+    from forecasting import FORECAST_DAYS, daily_counts, fit_forecast, forecast_table
+    ts_df = daily_counts(frame['Posted Date'])
+    if len(ts_df) < 2:
+        logging.warning(f"Skipping forecast for {path}: fewer than two days of postings")
+        return
+    model, forecast = fit_forecast(ts_df, days or FORECAST_DAYS)
+    forecast_table(forecast).to_csv(os.path.join(path, "forecast_data.csv"), index=False)
+    try:
+        from prophet.plot import plot_plotly
+        chart_html = plot_plotly(model, forecast).to_html(include_plotlyjs=plotlyjs)
+        with open(os.path.join(path, "job_forecast.html"), "w", encoding='utf-8') as f:
+            f.write(chart_html)
+    except Exception as e:
+        logging.error(f"Error exporting forecast chart for {path}: {str(e)}")
+
+
+def write_backtest(dataset, args):
+    from forecasting import BACKTEST_FOLDS, BACKTEST_HORIZON, backtest, backtest_series
+    series = backtest_series(dataset, dataset.filter_rows(**base_filters(args)))
+    accuracy = backtest(series, horizon=args.backtest_horizon or BACKTEST_HORIZON,
+                        folds=args.backtest_folds or BACKTEST_FOLDS, max_workers=args.workers)
+    path = os.path.join(args.out, "forecast_backtest.csv")
+    accuracy.to_csv(path, index=False)
+    logging.info(f"Backtested {len(series)} series; {int(accuracy['Trustworthy'].sum())} of {len(accuracy)} "
+                 f"series/setting pairs are trustworthy. Wrote {path}")
+
+
+def write_recommendations(dataset, args):
+    profiles = load_profiles(args.profiles)
+    if not profiles:
+        raise SystemExit(f"No saved profiles in {args.profiles}")
+    users = list(profiles)
+    recommendations = dataset.recommender.recommend_batch([profiles[user] for user in users], k=args.top)
+    recommendations.insert(0, 'User', np.asarray(users, dtype=object)[recommendations.pop('Profile').to_numpy(int)])
+    path = os.path.join(args.out, "recommendations.csv")
+    recommendations[['User', 'Job Title', 'Company Name', 'Job Location', 'Experience Required', 'Remote/Onsite',
+                     'Salary Range', 'Match Score']].to_csv(path, index=False)
+    logging.info(f"Wrote {args.top} recommendations for each of {len(users)} profiles to {path}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    dataset = JobDataset.load(args.data)
+    os.makedirs(args.out, exist_ok=True)
+    if args.backtest:
+        write_backtest(dataset, args)
+        return 0
+    if args.recommendations:
+        write_recommendations(dataset, args)
+        return 0
+    if args.batch:
+        unknown = [column for column in args.batch if column not in dataset.frame.columns]
+        if unknown:
+            raise SystemExit("Unknown column for --batch: " + ", ".join(unknown))
+        path = os.path.join(args.out, "summary_bundle.zip")
+        with open(path, "wb") as f:
+            f.write(report_bundle(dataset, args.batch, dataset.filter_rows(**base_filters(args)), args.formats))
+        logging.info(f"Wrote {path} in {time.perf_counter() - started:.1f}s")
+        return 0
+    segments = load_segments(args, dataset)
+    index, failed = [], 0
+    for (name, rows), directory in zip(segments, unique_slugs(name for name, _ in segments)):
+        if directory != slugify(name):
+            logging.warning(f"Segment {name} shares its directory name with another segment; writing to {directory}")
+        try:
+            index.append(write_segment(dataset, name, rows, args, directory))
+        except Exception as e:
+            failed += 1
+            logging.error(f"Error writing segment {name}: {str(e)}")
+    pd.DataFrame(index, columns=["Segment", "Directory", "Total Jobs"]).to_csv(
+        os.path.join(args.out, "segments.csv"), index=False)
+    logging.info(f"Wrote {len(index)} segments to {args.out} in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Cross-portal duplicate postings, found with MinHash signatures and LSH.
+
+The same job is often listed on LinkedIn, Indeed and Naukri.com under
+different Job IDs. Each posting is reduced to a set of tokens (title words,
+company, city, the three together, each skill, the whole skill set and the
+week it was posted) and summarised by a
+MinHash signature, whose agreement with another signature estimates the
+Jaccard similarity of the two token sets.
+
+Signatures are never stored per row. The minimum over a union of sets is
+the minimum of the per-set minima, so each distinct field value (a title, a
+skill list, a date) is hashed once and a posting's signature is the
+element-wise minimum of its fields' signatures, gathered through integer
+codes. Locality-sensitive hashing splits signatures into bands; postings
+sharing a band are linked to the first posting seen with that band, links
+below the similarity ``threshold`` are dropped and the rest are joined into
+clusters. Build and ``add`` are linear in the number of new postings apart
+from sorting their band keys.
+
+Within a cluster the k-th posting of each portal is taken to be the same
+job as the k-th posting of every other portal, so a cluster counts as many
+jobs as its busiest portal has postings. The first-seen posting of each job
+is kept; the others are flagged as duplicates.
+"""
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from skills import split_skills
+
+NUM_PERM = 64
+BANDS = 8
+THRESHOLD = 0.8
+NO_HASH = np.iinfo(np.uint32).max  # signature of a missing value: neutral under min
+DAY_NS = 86_400 * 10 ** 9
+
+
+def _words(text):
+    return str(text).lower().split()
+
+
+def _single(text):
+    return [str(text).strip().lower()]
+
+
+def _skills(text):
+    # Each skill, plus the whole set so that postings differing in any one skill stay apart.
+    skills = sorted({skill.lower() for skill in split_skills(text)})
+    return skills + ["|".join(skills)] if skills else []
+
+
+def _weeks(day):
+    # Two week grids three days apart, so postings a day or two apart share at least one token.
+    return [str(day // 7), "+" + str((day + 3) // 7)]
+
+
+FIELDS = {'Job Title': _words, 'Company Name': _single, 'Job Location': _single, 'Skills Required': _skills}
+
+
+class DuplicateDetector:
+    """Clusters of near-duplicate postings and the resulting duplicate flags."""
+
+    def __init__(self, frame, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=1,
+                 chunk_size=250_000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.chunk_size = chunk_size
+        rng = np.random.default_rng(seed)
+        self._masks = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._odds = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._band_mult = rng.integers(0, 2 ** 63, size=self.rows_per_band, dtype=np.uint64) * np.uint64(2) + \
+            np.uint64(1)
+        self._fields = list(FIELDS) + ['Role', 'Posted Date']
+        self._values = {field: {} for field in self._fields}  # field value -> code (0 is missing)
+        self._tables = {field: np.full((1, num_perm), NO_HASH, dtype=np.uint32) for field in self._fields}
+        self._tokens = {field: {} for field in self._fields}  # token -> column of the value x token sets
+        self._sets = {field: sparse.csr_matrix((1, 0), dtype=np.int32) for field in self._fields}
+        self._codes = {field: np.empty(0, dtype=np.int32) for field in self._fields}
+        self._portal_codes = {}
+        self.portals = np.empty(0, dtype=np.int32)
+        self._band_keys = [np.empty(0, dtype=np.uint64) for _ in range(bands)]
+        self._band_reps = [np.empty(0, dtype=np.int32) for _ in range(bands)]
+        self.clusters = np.empty(0, dtype=np.int32)  # smallest position of each row's cluster
+        self.revision = 0
+        self._flags = None
+        self._lock = threading.Lock()
+        self.add(frame)
+
+    def __len__(self):
+        return len(self.clusters)
+
+    def _token_signature(self, tokens):
+        hashes = np.array([int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+                           for token in tokens], dtype=np.uint64)
+        if not len(hashes):
+            return np.full(len(self._masks), NO_HASH, dtype=np.uint32)
+        # Multiply-shift hashing: one cheap permutation per signature slot.
+        permuted = ((hashes[:, None] ^ self._masks) * self._odds) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _encode(self, field, column, tokenize):
+        """Global codes of ``column``'s values, hashing values not seen before."""
+        column = column.astype('category')
+        values = self._values[field]
+        new = [value for value in column.cat.categories if value not in values]
+        if new:
+            token_lists = [[field + ":" + token for token in tokenize(value)] for value in new]
+            self._tables[field] = np.vstack([self._tables[field]] + [self._token_signature(tokens)
+                                                                     for tokens in token_lists])
+            self._sets[field] = self._token_sets(field, token_lists)
+            for value in new:
+                values[value] = len(values) + 1
+        lookup = np.array([values[value] for value in column.cat.categories] + [0], dtype=np.int32)
+        return lookup[column.cat.codes.to_numpy()]
+
+    def _token_sets(self, field, token_lists):
+        """The field's value x token incidence matrix with rows for ``token_lists`` appended."""
+        columns = self._tokens[field]
+        indices = [columns.setdefault(token, len(columns)) for tokens in token_lists for token in dict.fromkeys(tokens)]
+        indptr = np.cumsum([0] + [len(dict.fromkeys(tokens)) for tokens in token_lists])
+        old = self._sets[field]
+        old.resize(old.shape[0], len(columns))
+        added = sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr),
+                                  shape=(len(token_lists), len(columns)))
+        return sparse.vstack([old, added], format='csr')
+
+    def _signatures(self, positions, columns=slice(None)):
+        return np.minimum.reduce([self._tables[field][:, columns][self._codes[field][positions]]
+                                  for field in self._fields])
+
+    def add(self, frame):
+        """Index newly appended postings, linking them to earlier ones and to each other."""
+        start = len(self.clusters)
+        positions = np.arange(start, start + len(frame), dtype=np.int32)
+        for field, tokenize in FIELDS.items():
+            column = frame[field] if field in frame.columns else pd.Series(np.nan, index=frame.index)
+            self._codes[field] = np.concatenate([self._codes[field], self._encode(field, column, tokenize)])
+        # One token for title, company and city together, so a different employer or city weighs
+        # more than a different date. Global codes are stable, so they can be packed into one key.
+        title, company, city = (self._codes[field][start:].astype(np.int64) for field in list(FIELDS)[:3])
+        role = pd.Series((title << 42) | (company << 21) | city)
+        self._codes['Role'] = np.concatenate([self._codes['Role'], self._encode('Role', role, lambda key: [str(key)])])
+        posted = pd.to_datetime(frame['Posted Date']).dt.normalize()
+        self._codes['Posted Date'] = np.concatenate([
+            self._codes['Posted Date'], self._encode('Posted Date', posted, lambda day: _weeks(day.value // DAY_NS))])
+        portals = frame['Job Portal'].astype('category') if 'Job Portal' in frame.columns else \
+            pd.Series(pd.Categorical([None] * len(frame)))
+        for portal in portals.cat.categories:
+            self._portal_codes.setdefault(portal, len(self._portal_codes))
+        lookup = np.array([self._portal_codes[p] for p in portals.cat.categories] + [-1], dtype=np.int32)
+        self.portals = np.concatenate([self.portals, lookup[portals.cat.codes.to_numpy()]])
+        self.clusters = np.concatenate([self.clusters, positions])
+
+        # Each row's representative in every band; a representative shared by several bands is checked once.
+        reps = np.sort(np.column_stack([self._band_reps_of(band, positions) for band in range(self.bands)]), axis=1)
+        candidate = reps != positions[:, None]
+        candidate[:, 1:] &= reps[:, 1:] != reps[:, :-1]
+        rows = np.broadcast_to(positions[:, None], reps.shape)[candidate]
+        self._merge(*self._verified(rows, reps[candidate]))
+        with self._lock:
+            self.revision += 1
+            self._flags = None
+
+    def _band_reps_of(self, band, positions):
+        """For each row, the first-seen row with the same ``band`` of its signature (possibly itself)."""
+        columns = slice(band * self.rows_per_band, (band + 1) * self.rows_per_band)
+        keys = np.concatenate([(self._signatures(positions[i:i + self.chunk_size], columns).astype(np.uint64)
+                                * self._band_mult).sum(axis=1, dtype=np.uint64)
+                               for i in range(0, len(positions), self.chunk_size)] or [np.empty(0, np.uint64)])
+        order = np.argsort(keys, kind='stable')
+        keys, members = keys[order], positions[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        unique_keys = keys[first]
+        # Keys already in the band table link to their stored representative;
+        # new keys are represented by their first row here and inserted.
+        known, known_reps = self._band_keys[band], self._band_reps[band]
+        slot = np.searchsorted(known, unique_keys)
+        found = slot < len(known)
+        found[found] = known[slot[found]] == unique_keys[found]
+        reps = members[first]
+        reps[found] = known_reps[slot[found]]
+        self._band_keys[band] = np.insert(known, slot[~found], unique_keys[~found])
+        self._band_reps[band] = np.insert(known_reps, slot[~found], reps[~found])
+        result = np.empty(len(positions), dtype=np.int32)
+        result[order] = reps[np.cumsum(first) - 1]
+        return result
+
+    def _verified(self, rows, reps):
+        """Keep candidate links whose exact Jaccard similarity reaches the threshold.
+
+        Fields have disjoint tokens, so intersection and union sizes add up
+        over fields; only fields whose values differ need a set intersection.
+        """
+        shared = np.zeros(len(rows), dtype=np.int64)
+        total = np.zeros(len(rows), dtype=np.int64)
+        for field in self._fields:
+            sets = self._sets[field]
+            sizes = np.diff(sets.indptr)
+            a, b = self._codes[field][rows], self._codes[field][reps]
+            common = np.where(a == b, sizes[a], 0)
+            differ = np.flatnonzero(a != b)
+            for i in range(0, len(differ), self.chunk_size):
+                part = differ[i:i + self.chunk_size]
+                common[part] = np.asarray(sets[a[part]].multiply(sets[b[part]]).sum(axis=1)).ravel()
+            shared += common
+            total += sizes[a] + sizes[b] - common
+        keep = shared >= self.threshold * np.maximum(total, 1)
+        return rows[keep], reps[keep]
+
+    def _merge(self, rows, reps):
+        """Join the clusters at both ends of each link; a cluster is labelled by its smallest position."""
+        if not len(rows):
+            return
+        ends = np.concatenate([self.clusters[rows], self.clusters[reps]])
+        nodes, index = np.unique(ends, return_inverse=True)
+        graph = sparse.coo_matrix((np.ones(len(rows)), (index[:len(rows)], index[len(rows):])),
+                                  shape=(len(nodes), len(nodes)))
+        _, component = connected_components(graph, directed=False)
+        roots = np.full(component.max() + 1, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(roots, component, nodes)
+        affected = np.isin(self.clusters, nodes)
+        self.clusters[affected] = roots[component[np.searchsorted(nodes, self.clusters[affected])]]
+
+    @property
+    def flags(self):
+        """Boolean array, True for postings that repeat a job already listed on another portal."""
+        with self._lock:
+            if self._flags is None:
+                self._flags = self._duplicate_flags()
+            return self._flags
+
+    def _duplicate_flags(self):
+        flags = np.zeros(len(self.clusters), dtype=bool)
+        rows = np.flatnonzero(np.bincount(self.clusters, minlength=len(self.clusters))[self.clusters] > 1)
+        if not len(rows):
+            return flags
+        # Rank each posting within its (cluster, portal) in order of position...
+        rows = rows[np.lexsort((rows, self.portals[rows], self.clusters[rows]))]
+        group = np.ones(len(rows), dtype=bool)
+        group[1:] = (self.clusters[rows[1:]] != self.clusters[rows[:-1]]) | \
+            (self.portals[rows[1:]] != self.portals[rows[:-1]])
+        starts = np.flatnonzero(group)
+        rank = np.arange(len(rows)) - np.repeat(starts, np.diff(np.append(starts, len(rows))))
+        # ...then equal ranks across portals are one job: keep the first-seen posting.
+        order = np.lexsort((rows, rank, self.clusters[rows]))
+        rows, rank = rows[order], rank[order]
+        repeat = np.zeros(len(rows), dtype=bool)
+        repeat[1:] = (self.clusters[rows[1:]] == self.clusters[rows[:-1]]) & (rank[1:] == rank[:-1])
+        flags[rows[repeat]] = True
+        return flags
+
+    def distinct(self, rows=None):
+        """Positions of ``rows`` (all rows for ``None``) that are not duplicates."""
+        flags = self.flags
+        if rows is None:
+            return np.flatnonzero(~flags).astype(np.int32)
+        rows = np.asarray(rows)
+        return rows[~flags[rows]]
@@ -0,0 +1,144 @@
+"""Prophet forecasts of daily job posting counts.
+
+Kept free of Streamlit so the dashboard, the background job runner and
+command-line tools share the same series construction and model settings.
+
+``backtest`` measures how good those forecasts are with rolling-origin
+evaluation: each series is cut at several origins, Prophet is fitted on the
+days up to the origin and scored on the ``horizon`` days after it. Every
+(series, engine setting, origin) fit is independent, so they run on a pool;
+Prophet's sampling happens in a CmdStan subprocess, so threads keep several
+cores busy (``processes=True`` is there for the pure-Python part).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+
+from telemetry import TELEMETRY
+
+FORECAST_DAYS = 90
+BACKTEST_HORIZON = 7
+BACKTEST_FOLDS = 3
+BACKTEST_TOP_SKILLS = 10
+# Prophet settings compared by the backtest; "default" is what the Forecasting page fits.
+ENGINE_SETTINGS = {
+    'default': {},
+    'flexible trend': {'changepoint_prior_scale': 0.5},
+    'no weekly seasonality': {'weekly_seasonality': False},
+}
+# A series' forecast is called trustworthy when its backtest errors stay within these.
+TRUSTED_MAPE = 0.25
+TRUSTED_COVERAGE = 0.7  # of days inside the 80% interval Prophet draws by default
+
+
+def daily_counts(dates):
+    """Postings per day as the ``ds``/``y`` frame Prophet expects."""
+    counts = pd.Series(dates).dropna().value_counts().sort_index()
+    return pd.DataFrame({'ds': counts.index, 'y': counts.to_numpy()})
+
+
+def fit_forecast(ts_df, periods=FORECAST_DAYS, **prophet_kwargs):
+    """Fit Prophet to a daily series and predict ``periods`` days ahead.
+
+    Returns the fitted model and its forecast frame.
+    """
+    model = Prophet(**prophet_kwargs)
+    with TELEMETRY.stage("Forecasting", "prophet fit"):
+        model.fit(ts_df)
+    future = model.make_future_dataframe(periods=periods)
+    with TELEMETRY.stage("Forecasting", "prophet predict"):
+        forecast = model.predict(future)
+    return model, forecast
+
+
+def forecast_table(forecast):
+    """The forecast columns offered for download."""
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].rename(
+        columns={'ds': 'Date', 'yhat': 'Forecasted Count'}
+    )
+
+
+def backtest_series(dataset, rows=None, distinct=False, top_skills=BACKTEST_TOP_SKILLS):
+    """The Forecasting page's series: overall (within ``rows``), every city and the top skills.
+
+    Returns ``{(kind, name): ds/y frame}``.
+    """
+    base_rows = dataset.duplicates.distinct() if distinct else None
+    cities = dataset.select(base_rows)
+    series = {('Overall', 'All postings' if rows is None else 'Filtered postings'):
+              daily_counts(dataset.select(rows)['Posted Date'])}
+    for city, dates in cities.groupby('Job Location', observed=True)['Posted Date']:
+        series[('City', str(city))] = daily_counts(dates)
+    for skill in dataset.skills.top(base_rows, top_skills).index:
+        series[('Skill', skill)] = dataset.skill_timeline.daily_counts(skill, base_rows)
+    return series
+
+
+def backtest_cutoffs(ts_df, horizon=BACKTEST_HORIZON, folds=BACKTEST_FOLDS):
+    """Rolling origins ``horizon`` days apart, ending one horizon before the last day.
+
+    Origins leaving less than two horizons of history are dropped.
+    """
+    if ts_df.empty:
+        return []
+    first, last = ts_df['ds'].min(), ts_df['ds'].max()
+    step = pd.Timedelta(days=horizon)
+    return [last - step * k for k in range(folds, 0, -1) if last - step * k - first >= 2 * step]
+
+
+def backtest_fold(ts_df, cutoff, horizon, prophet_kwargs):
+    """Fit on the days up to ``cutoff`` and predict the following ``horizon`` days that have data."""
+    train = ts_df[ts_df['ds'] <= cutoff]
+    test = ts_df[(ts_df['ds'] > cutoff) & (ts_df['ds'] <= cutoff + pd.Timedelta(days=horizon))]
+    model = Prophet(**prophet_kwargs)
+    with TELEMETRY.stage("Forecasting", "backtest fit"):
+        model.fit(train)
+        predicted = model.predict(test[['ds']])
+    return pd.DataFrame({'y': test['y'].to_numpy(), 'yhat': predicted['yhat'].to_numpy(),
+                         'yhat_lower': predicted['yhat_lower'].to_numpy(),
+                         'yhat_upper': predicted['yhat_upper'].to_numpy()})
+
+
+def accuracy(scored):
+    """MAPE (over days with postings), MAE and interval coverage of scored backtest points."""
+    y, yhat = scored['y'].to_numpy(dtype=float), scored['yhat'].to_numpy()
+    nonzero = y > 0
+    return {'Points': len(y),
+            'MAPE': float(np.mean(np.abs(y[nonzero] - yhat[nonzero]) / y[nonzero])) if nonzero.any() else np.nan,
+            'MAE': float(np.mean(np.abs(y - yhat))) if len(y) else np.nan,
+            'Coverage': float(np.mean((scored['yhat_lower'] <= y) & (y <= scored['yhat_upper'])))
+            if len(y) else np.nan}
+
+
+def backtest(series, settings=ENGINE_SETTINGS, horizon=BACKTEST_HORIZON, folds=BACKTEST_FOLDS,
+             max_workers=None, processes=False):
+    """Rolling-origin accuracy of every series under every engine setting.
+
+    ``series`` maps keys (``(kind, name)`` tuples or strings) to ds/y
+    frames; ``settings`` maps setting names to Prophet keyword arguments.
+    Returns one row per series and setting with the number of origins and
+    points scored, MAPE, MAE, interval coverage and whether the forecast is
+    trustworthy. Series too short for a single origin are skipped.
+    """
+    tasks = [(key, setting, cutoff) for key, ts_df in series.items()
+             for cutoff in backtest_cutoffs(ts_df, horizon, folds) for setting in settings]
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        futures = [executor.submit(backtest_fold, series[key], cutoff, horizon, settings[setting])
+                   for key, setting, cutoff in tasks]
+        scored = [future.result() for future in futures]
+    groups = {}
+    for (key, setting, cutoff), points in zip(tasks, scored):
+        groups.setdefault((key, setting), []).append(points)
+    rows = []
+    for (key, setting), points in groups.items():
+        kind, name = key if isinstance(key, tuple) else ('', key)
+        row = {'Kind': kind, 'Series': name, 'Setting': setting, 'Origins': len(points)}
+        row.update(accuracy(pd.concat(points, ignore_index=True)))
+        row['Trustworthy'] = bool(row['MAPE'] <= TRUSTED_MAPE and row['Coverage'] >= TRUSTED_COVERAGE)
+        rows.append(row)
+    return pd.DataFrame(rows, columns=['Kind', 'Series', 'Setting', 'Origins', 'Points', 'MAPE', 'MAE',
+                                       'Coverage', 'Trustworthy'])
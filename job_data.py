@@ -0,0 +1,411 @@
+"""Loading and filtering of the job postings dataset.
+
+The dataset is loaded once per process and shared read-only by every
+session. Sessions never copy it; they keep an array of row positions
+(their filter selection) and materialise rows only when a page needs them.
+
+At load time the text columns are stored as categoricals, ``Job ID`` as an
+integer, and the banded ``Salary Range`` / ``Experience Required`` columns
+as ordered categoricals whose numeric bounds are kept in sorted indexes for
+range filtering.
+"""
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from dedup import DuplicateDetector
+from facets import FacetIndex
+from recommender import JobRecommender
+from search import SearchIndex, tokenize
+from skills import RoleSkillProfile, SkillCooccurrence, SkillMatrix, SkillTimeline, SkillTrends
+from telemetry import TELEMETRY
+
+DATA_PATH = "data/india_job_market_dataset.csv"
+DATE_COLUMNS = ['Posted Date', 'Application Deadline']
+BAND_COLUMNS = {'Salary Range': 'salary', 'Experience Required': 'experience'}
+OPEN_BOUND = np.iinfo(np.int16).max  # upper bound of open-ended bands such as "20+ LPA"
+MISSING_BOUND = -1
+MISSING_DAY = np.iinfo(np.int64).min
+SELECTION_CACHE_SIZE = 32  # results derived from a filter selection, shared by all sessions
+
+# pandas 2.x needs Copy-on-Write switched on so that derived frames never
+# write through to the shared table; pandas 3 always behaves this way.
+if int(pd.__version__.split('.')[0]) == 2:
+    pd.set_option('mode.copy_on_write', True)
+
+_BAND_RE = re.compile(r"(\d+)\s*(?:-\s*(\d+)|(\+))")
+
+
+def parse_band(text):
+    """Parse "5-8 LPA" to (5, 8) and "10+ years" to (10, OPEN_BOUND)."""
+    match = _BAND_RE.search(str(text))
+    if not match:
+        return MISSING_BOUND, MISSING_BOUND
+    lower = int(match.group(1))
+    return lower, OPEN_BOUND if match.group(3) else int(match.group(2))
+
+
+def band_categorical(series):
+    """Store a banded text column as a categorical ordered by its numeric bounds."""
+    labels = sorted(series.dropna().unique(), key=lambda label: (parse_band(label), label))
+    return pd.Categorical(series, categories=labels, ordered=True)
+
+
+def band_bounds(series):
+    """Return int16 lower and upper bound arrays for a banded categorical column."""
+    labels = list(series.cat.categories)
+    bounds = np.array([parse_band(label) for label in labels] + [(MISSING_BOUND, MISSING_BOUND)],
+                      dtype=np.int16).reshape(-1, 2)
+    codes = series.cat.codes.to_numpy()  # -1 (missing) picks the trailing sentinel row
+    return bounds[codes, 0], bounds[codes, 1]
+
+
+def compact_frame(df):
+    """Convert a raw postings frame to the compact typed schema."""
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    if 'Job ID' in df.columns:
+        ids = pd.to_numeric(df['Job ID'].astype(str).str.extract(r"(\d+)$")[0], errors='coerce')
+        if ids.notna().all() and ids.is_unique:
+            df['Job ID'] = pd.to_numeric(ids, downcast='integer')
+    if 'Number of Applicants' in df.columns:
+        df['Number of Applicants'] = pd.to_numeric(df['Number of Applicants'], errors='coerce',
+                                                   downcast='integer')
+    for column in df.columns:
+        if column in BAND_COLUMNS:
+            df[column] = band_categorical(df[column])
+        elif column != 'Job ID' and (df[column].dtype == object or pd.api.types.is_string_dtype(df[column])):
+            if df[column].nunique() <= len(df) // 2:
+                df[column] = df[column].astype('category')
+    return df
+
+
+def dataset_version(path=DATA_PATH):
+    """Identify the dataset file contents by size and modification time."""
+    stat = os.stat(path)
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def version_timestamp(version):
+    """The dataset file's modification time (local) recorded in ``version``, or None."""
+    try:
+        return pd.Timestamp.fromtimestamp(int(version.rsplit('-', 1)[1], 16) / 1e9)
+    except (IndexError, ValueError):
+        return None
+
+
+def read_dataset(path=DATA_PATH):
+    """Read the CSV and convert it to the compact typed schema, once, at load time."""
+    return compact_frame(pd.read_csv(path))
+
+
+def count_values(series, weights=None):
+    """``value_counts`` that leaves out categories with no rows in ``series``.
+
+    With ``weights`` (aligned with ``series``) each value is ranked by its
+    summed weight instead, e.g. applicants-weighted demand.
+    """
+    if weights is None:
+        counts = series.value_counts()
+    else:
+        weights = pd.Series(np.asarray(weights), index=series.index).fillna(0)
+        counts = weights.groupby(series, observed=True).sum().sort_values(ascending=False, kind='stable')
+    return counts[counts > 0]
+
+
+def recent_postings(frame, days=1, now=None):
+    """Rows of ``frame`` posted within the last ``days`` days (before ``now``)."""
+    now = pd.Timestamp.now() if now is None else now
+    return frame[frame['Posted Date'] > now - pd.Timedelta(days=days)]
+
+
+def _finite_extent(lower, upper):
+    upper = upper[(upper != OPEN_BOUND) & (upper != MISSING_BOUND)]
+    finite = np.concatenate([lower[lower != MISSING_BOUND], upper])
+    return (int(finite.min()), int(finite.max())) if len(finite) else (0, 0)
+
+
+class SortedIndex:
+    """Row positions ordered by a numeric key, so range lookups are a binary search."""
+
+    def __init__(self, values):
+        self.order = np.argsort(values, kind='stable').astype(np.int32)
+        self.keys = np.asarray(values)[self.order]
+
+    def between(self, low=None, high=None):
+        """Positions of rows whose key lies in ``[low, high]``."""
+        start = 0 if low is None else np.searchsorted(self.keys, low, side='left')
+        stop = len(self.keys) if high is None else np.searchsorted(self.keys, high, side='right')
+        return self.order[start:stop]
+
+
+class IntervalIndex:
+    """Row positions ordered by interval start, for "which intervals contain t" queries.
+
+    No interval is longer than ``max_length``, so only rows starting in
+    ``[t - max_length, t]`` can contain ``t``: a binary search finds that
+    slice and only its ends are checked. Rows with a missing bound are not
+    indexed.
+    """
+
+    def __init__(self, starts, ends):
+        starts, ends = np.asarray(starts), np.asarray(ends)
+        valid = np.flatnonzero((starts != MISSING_DAY) & (ends != MISSING_DAY) & (ends >= starts))
+        order = valid[np.argsort(starts[valid], kind='stable')]
+        self.order = order.astype(np.int32)
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.max_length = int((self.ends - self.starts).max()) if len(order) else 0
+
+    def containing(self, point):
+        """Positions of rows whose ``[start, end]`` contains ``point``."""
+        lo = np.searchsorted(self.starts, point - self.max_length, side='left')
+        hi = np.searchsorted(self.starts, point, side='right')
+        return self.order[lo:hi][self.ends[lo:hi] >= point]
+
+
+def day_numbers(dates):
+    """Dates as int64 day numbers (days since 1970-01-01), ``MISSING_DAY`` where missing."""
+    dates = pd.to_datetime(pd.Series(dates))
+    days = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+    return np.where(dates.isna().to_numpy(), MISSING_DAY, days)
+
+
+class JobDataset:
+    """Read-only job postings table shared by all sessions of the process."""
+
+    def __init__(self, frame, version=""):
+        self.frame = frame
+        self.version = version
+        self.bounds = {}
+        self.band_limits = {}  # smallest and largest finite bound, for slider extents
+        self.indexes = {}
+        for column, key in BAND_COLUMNS.items():
+            if column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype):
+                lower, upper = band_bounds(frame[column])
+                self.bounds[key] = (lower, upper)
+                self.indexes[key + '_min'] = SortedIndex(lower)
+                self.indexes[key + '_max'] = SortedIndex(upper)
+                self.band_limits[key] = _finite_extent(lower, upper)
+        if 'Number of Applicants' in frame.columns:
+            self.indexes['applicants'] = SortedIndex(frame['Number of Applicants'].fillna(-1).to_numpy())
+        if all(column in frame.columns for column in DATE_COLUMNS):
+            self.indexes['open'] = IntervalIndex(day_numbers(frame['Posted Date']),
+                                                 day_numbers(frame['Application Deadline']))
+        self._selection_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._freeze()
+
+    @classmethod
+    def load(cls, path=DATA_PATH):
+        frame = read_dataset(path)
+        logging.info(f"Dataset loaded: {len(frame)} rows from {path}")
+        return cls(frame, dataset_version(path))
+
+    def _freeze(self):
+        # Mark the numpy buffers behind every column read-only so an
+        # accidental in-place write raises instead of leaking into other sessions.
+        for column in self.frame.columns:
+            values = self.frame[column].to_numpy()
+            while isinstance(values.base, np.ndarray):
+                values = values.base
+            if isinstance(values, np.ndarray):
+                values.flags.writeable = False
+
+    def __len__(self):
+        return len(self.frame)
+
+    @cached_property
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    @cached_property
+    def skills(self):
+        """Posting x skill matrix, built on first use and shared like the frame."""
+        return SkillMatrix(self.frame['Skills Required'])
+
+    @cached_property
+    def skill_timeline(self):
+        """Day x skill posting counts for skill-wise forecasts and sparklines."""
+        return SkillTimeline(self.skills, self.frame['Posted Date'])
+
+    @cached_property
+    def facets(self):
+        """Per-value row bitmaps of the skills, city and experience filters."""
+        return FacetIndex(self.frame, self.skills)
+
+    def facet_counts(self, skills=(), cities=(), experience=(), **filters):
+        """Live counts for every skill, city and experience band under the other active filters.
+
+        ``filters`` are the remaining ``filter_rows`` arguments.
+        """
+        rows = self.filter_rows(**filters)
+        base = None if rows is None else self._positions_mask(rows)
+        return self.facets.counts({'skills': skills, 'cities': cities, 'experience': experience}, base)
+
+    @cached_property
+    def duplicates(self):
+        """Cross-portal duplicate postings (MinHash/LSH clusters), built on first use."""
+        return DuplicateDetector(self.frame)
+
+    def cached(self, name, fingerprint, compute):
+        """Return ``compute()``, memoised per filter ``fingerprint`` in a small LRU shared by all sessions."""
+        key = (name, fingerprint)
+        with self._lock:
+            hit = key in self._selection_cache
+            if hit:
+                self._selection_cache.move_to_end(key)
+                result = self._selection_cache[key]
+        TELEMETRY.cache_event("JobDataset." + name, hit)
+        if hit:
+            return result
+        result = compute()
+        with self._lock:
+            self._selection_cache[key] = result
+            while len(self._selection_cache) > SELECTION_CACHE_SIZE:
+                self._selection_cache.popitem(last=False)
+        return result
+
+    def skill_trends(self, rows=None, fingerprint=None):
+        """Emerging/declining skill scores for the selected rows, cached per filter fingerprint.
+
+        With no filter the result follows ``skill_timeline`` incrementally.
+        """
+        return self.cached("skill_trends", fingerprint if rows is not None else None,
+                           lambda: SkillTrends(self.skill_timeline, rows, self.skill_counts_by_day(rows, fingerprint)))
+
+    def skill_counts_by_day(self, rows=None, fingerprint=None):
+        """Day x skill counts of the selected rows, for sparklines, cached per filter fingerprint."""
+        if rows is None:
+            return self.skill_timeline.matrix
+        if fingerprint is None:
+            return self.skill_timeline.counts(rows)
+        return self.cached("skill_counts_by_day", fingerprint, lambda: self.skill_timeline.counts(rows))
+
+    def cooccurrence(self, rows=None, fingerprint=None):
+        """Skill co-occurrence of the selected rows, cached per filter fingerprint."""
+        return self.cached("cooccurrence", fingerprint, lambda: SkillCooccurrence(self.skills, rows))
+
+    @cached_property
+    def role_skills(self):
+        return RoleSkillProfile(self.skills, self.frame['Job Title'])
+
+    @cached_property
+    def recommender(self):
+        return JobRecommender(self)
+
+    @cached_property
+    def _id_index(self):
+        return pd.Index(self.frame['Job ID'])
+
+    def positions_of(self, job_ids):
+        """Row positions of the given Job IDs (-1 where an ID is unknown)."""
+        return self._id_index.get_indexer(pd.Index(job_ids))
+
+    @cached_property
+    def search_index(self):
+        """Word index over title, company, city and skills, built on first use."""
+        return SearchIndex(self.frame)
+
+    def find(self, text, rows=None, limit=50):
+        """The ``limit`` best-ranked positions matching every word of ``text`` (see search.py)."""
+        return self.search_index.search(text, rows, limit)[0]
+
+    def select(self, rows):
+        """Return the rows at the given positions (``None`` means all rows)."""
+        if rows is None:
+            return self.frame
+        return self.frame.take(rows)
+
+    def _positions_mask(self, positions):
+        mask = np.zeros(len(self.frame), dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def band_mask(self, key, low, high):
+        """Rows whose band ``[min, max)`` overlaps the selected ``[low, high]``.
+
+        Bands share endpoints ("5-8", "8-12"), so a band only matches when it
+        extends past ``low``; a ``high`` at the top of the scale also keeps
+        open-ended bands such as "20+".
+        """
+        mask = self._positions_mask(self.indexes[key + '_max'].between(low + 1, None))
+        if high >= self.band_limits[key][1]:
+            below = self.indexes[key + '_min'].between(0, None)
+        elif low == high:
+            below = self.indexes[key + '_min'].between(0, high)
+        else:
+            below = self.indexes[key + '_min'].between(0, high - 1)
+        return mask & self._positions_mask(below)
+
+    def open_on(self, date):
+        """Positions of postings whose [Posted Date, Application Deadline] window contains ``date``."""
+        return self.indexes['open'].containing(day_numbers([pd.Timestamp(date)])[0])
+
+    def applicants(self, rows=None):
+        """Applicants per selected posting, with missing counts as zero."""
+        applicants = self.frame['Number of Applicants'].fillna(0).to_numpy(dtype=np.float64)
+        return applicants if rows is None else applicants[rows]
+
+    def competitiveness(self, by, rows=None):
+        """Postings, applicants and applicants per posting for each value of column ``by`` or each 'Skill'."""
+        applicants = self.applicants(rows)
+        if by == 'Skill':
+            labels = self.skills.vocabulary
+            postings = self.skills.counts(rows)
+            totals = self.skills.counts(rows, applicants)
+        else:
+            column = self.select(rows)[by].astype('category')
+            labels = list(column.cat.categories)
+            codes = column.cat.codes.to_numpy()
+            valid = codes >= 0
+            postings = np.bincount(codes[valid], minlength=len(labels))
+            totals = np.bincount(codes[valid], weights=applicants[valid], minlength=len(labels))
+        result = pd.DataFrame({by: labels, 'Postings': postings, 'Applicants': totals.astype(np.int64),
+                               'Applicants per Posting': np.divide(totals, postings, out=np.zeros(len(labels)),
+                                                                   where=postings > 0)})
+        result = result[result['Postings'] > 0]
+        return result.sort_values('Applicants per Posting', ascending=False, kind='stable')
+
+    def filter_rows(self, skills=(), cities=(), experience=(), salary_range=None, experience_range=None,
+                    applicants_range=None, open_on=None, distinct=False, query=""):
+        """Return the positions of rows matching the sidebar filters.
+
+        Range arguments are ``(low, high)`` tuples or ``None`` when inactive;
+        ``open_on`` keeps postings still open for applications on that date
+        and ``distinct`` drops postings that duplicate a job on another portal.
+        A search ``query`` keeps postings matching all of its words; one
+        without any words (blank or only punctuation) is no filter.
+        ``None`` is returned when no filter is active so callers can use the
+        shared frame directly instead of taking a full copy of it.
+        """
+        if not (skills or cities or experience or salary_range or experience_range or applicants_range or open_on
+                or distinct or tokenize(query)):
+            return None
+        mask = np.ones(len(self.frame), dtype=bool)
+        if skills:
+            mask &= self.facets.mask('skills', skills)
+        if cities:
+            mask &= self.facets.mask('cities', cities)
+        if experience:
+            mask &= self.facets.mask('experience', experience)
+        if salary_range:
+            mask &= self.band_mask('salary', *salary_range)
+        if experience_range:
+            mask &= self.band_mask('experience', *experience_range)
+        if applicants_range:
+            mask &= self._positions_mask(self.indexes['applicants'].between(*applicants_range))
+        if open_on:
+            mask &= self._positions_mask(self.open_on(open_on))
+        if distinct:
+            mask &= ~self.duplicates.flags
+        if tokenize(query):
+            mask &= self._positions_mask(self.search_index.search(query, limit=None)[0])
+        return np.flatnonzero(mask).astype(np.int32)
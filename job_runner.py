@@ -0,0 +1,108 @@
+"""Background execution of long-running computations such as Prophet fits.
+
+Jobs are keyed by what they compute, so identical requests from any
+session share one in-flight job and its stored result. The Streamlit
+script only submits and polls; a rerun never cancels or restarts a job.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from telemetry import TELEMETRY
+
+
+def job_id_for(key):
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:12]
+
+
+class Job:
+    """A submitted computation and, once finished, its result or error."""
+
+    def __init__(self, job_id, name, future):
+        self.id = job_id
+        self.name = name
+        self.future = future
+        self.submitted = time.time()
+        self.finished = None
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def result(self):
+        return self.future.result()
+
+    @property
+    def error(self):
+        return self.future.exception() if self.future.done() else None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.submitted
+
+
+class JobRunner:
+    """Thread (or process) pool with job IDs, deduplication and result storage.
+
+    Threads suit Prophet, whose sampling runs in a CmdStan subprocess;
+    ``processes=True`` is available for pure-Python work, in which case the
+    submitted function and its arguments must be picklable. At most
+    ``keep`` finished jobs are retained, oldest first out.
+    """
+
+    def __init__(self, max_workers=2, processes=False, keep=64):
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._executor = pool(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self.keep = keep
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Start ``fn(*args, **kwargs)`` unless a job for ``key`` exists; return its ID.
+
+        A failed job is replaced so the request can be retried.
+        """
+        job_id = job_id_for(key)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status != "failed":
+                TELEMETRY.cache_event("JobRunner.submit", hit=True)
+                return job_id
+            name = str(key[0]) if isinstance(key, tuple) and key else getattr(fn, "__name__", "job")
+            job = Job(job_id, name, self._executor.submit(fn, *args, **kwargs))
+            self._jobs[job_id] = job
+            self._evict()
+        TELEMETRY.cache_event("JobRunner.submit", hit=False)
+        job.future.add_done_callback(lambda _: self._finish(job))
+        return job_id
+
+    def _finish(self, job):
+        job.finished = time.time()
+        TELEMETRY.record("Jobs", job.name, job.elapsed)
+
+    def _evict(self):
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda job: job.submitted)
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def summary(self):
+        """One row per known job, for the Diagnostics page."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [{"Job": job.id, "Name": job.name, "Status": job.status, "Seconds": round(job.elapsed, 2)}
+                for job in sorted(jobs, key=lambda job: job.submitted, reverse=True)]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,357 @@
+"""Multi-session load test of the dashboard's rerun latency.
+
+Starts the dashboard with ``streamlit run`` (or targets one already running
+with ``--url``) and drives N simulated browser sessions concurrently over
+Streamlit's websocket protocol. Each session sends the rerun requests a
+browser sends, carrying the same widget states, and waits until the script
+run finishes. The sessions therefore share one server process with its
+``st.cache_resource``/``st.cache_data`` caches, selection caches and job
+runner, as real users do; every widget change is one timed rerun::
+
+    python loadtest.py                                   # 1, 2, 4 and 8 sessions
+    python loadtest.py --sessions 1 4 16 --iterations 3 --size 200k
+    python loadtest.py --scenarios filter --compare loadtest_baseline.json
+    python loadtest.py --url http://127.0.0.1:8501       # an already running server
+
+For each concurrency level the results give rerun latency percentiles
+(p50/p95/p99) overall and per step, throughput in reruns per second,
+errors (script exceptions, and filter steps that left the facet counts
+unchanged), and the server's RSS at the start, peak and end of the level.
+Levels run one after another against the same server, so later levels
+start with warm caches. ``--compare`` flags levels whose p95 grew by more
+than ``--threshold``.
+
+Latency is measured from sending the rerun request to the server's
+"script finished" message: browser rendering, timed fragment reruns (the
+job progress poll) and static assets are not included, and memory is only
+reported for a server started here. Needs the ``websockets`` package,
+installed with Streamlit's server dependencies.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import parse_size, write_csv
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+# A step is (action, target, value). Widgets are found by their key, or by label when they have none;
+# pages match by substring of the navigation label, and a multiselect value n picks the first n options,
+# so scenarios work on any dataset.
+SCENARIOS = {
+    'browse': [('page', 'Home', None), ('page', 'Company Insights', None), ('page', 'Skill Insights', None),
+               ('page', 'Competitiveness', None), ('page', 'Home', None)],
+    'filter': [('page', 'Home', None), ('multiselect', 'facet_skills', 1), ('multiselect', 'facet_cities', 2),
+               ('text_input', 'search_query', 'engineer'), ('toggle', 'deduplicate', True),
+               ('page', 'Company Insights', None), ('multiselect', 'facet_skills', 0),
+               ('text_input', 'search_query', ''), ('toggle', 'deduplicate', False)],
+    'analyst': [('page', 'Skill Insights', None), ('page', 'Forecasting', None), ('rerun', None, None),
+                ('page', 'Chatbot Assistant', None), ('page', 'Skill Gap Analysis', None)],
+}
+NAVIGATION_LABEL = "Go to"
+WIDGET_TYPES = ('radio', 'multiselect', 'text_input', 'checkbox')
+SERVER_START_TIMEOUT = 120
+RSS_INTERVAL = 0.05
+
+
+def percentiles(seconds):
+    values = np.asarray(seconds) if len(seconds) else np.zeros(1)
+    return {"count": len(seconds), "mean_ms": round(1000 * float(values.mean()), 2),
+            "p50_ms": round(1000 * float(np.percentile(values, 50)), 2),
+            "p95_ms": round(1000 * float(np.percentile(values, 95)), 2),
+            "p99_ms": round(1000 * float(np.percentile(values, 99)), 2),
+            "max_ms": round(1000 * float(values.max()), 2)}
+
+
+def process_rss(pid):
+    """Resident set size of process ``pid`` in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def widget_key(widget):
+    # Element IDs end in the widget's key ("None" for widgets without one).
+    key = widget.id.rsplit('-', 1)[-1]
+    return widget.label if key == "None" else key
+
+
+class SimulatedSession:
+    """One browser session: a websocket connection stepping through a scenario."""
+
+    def __init__(self, url, scenario, timeout):
+        self.url = url
+        self.scenario = scenario
+        self.timeout = timeout
+        self.states = {}  # widget ID -> WidgetState, sent with every rerun as the frontend does
+        self.widgets = {}  # key or label -> widget proto from the last run
+        self.captions = []
+        self.samples = []  # (step label, seconds, failed)
+        self._socket = None
+
+    async def _rerun(self, label, check_effect=False):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        widgets, captions, failed = {}, [], False
+        start = time.perf_counter()
+        try:
+            await self._socket.send(message.SerializeToString())
+            while True:
+                reply = ForwardMsg()
+                reply.ParseFromString(await asyncio.wait_for(self._socket.recv(), self.timeout))
+                kind = reply.WhichOneof('type')
+                if kind == 'delta' and reply.delta.WhichOneof('type') == 'new_element':
+                    element = reply.delta.new_element
+                    element_type = element.WhichOneof('type')
+                    if element_type == 'exception':
+                        failed = True
+                    elif element_type == 'markdown' and element.markdown.element_type == element.markdown.CAPTION:
+                        captions.append(element.markdown.body)
+                    elif element_type in WIDGET_TYPES:
+                        widget = getattr(element, element_type)
+                        widgets[widget_key(widget)] = widget
+                # A run ended by st.rerun() is followed by the run it requested.
+                elif kind == 'script_finished' and reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    failed |= reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR
+                    break
+        except Exception as e:
+            logging.error(f"Session rerun failed at {label}: {str(e)}")
+            failed = True
+        seconds = time.perf_counter() - start
+        if check_effect and not failed and captions == self.captions:
+            logging.warning(f"{label} left the facet counts unchanged; the filter was not applied")
+            failed = True
+        self.samples.append((label, seconds, failed))
+        self.widgets.update(widgets)
+        self.captions = captions
+
+    def _widget(self, target):
+        widget = self.widgets.get(target)
+        if widget is None:
+            raise LookupError(f"Scenario {self.scenario}: no widget {target!r} on the current page")
+        return widget
+
+    async def step(self, action, target, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        check_effect = False
+        if action == 'rerun':
+            await self._rerun(action)
+            return
+        if action == 'page':
+            navigation = self._widget(NAVIGATION_LABEL)
+            pages = [option for option in navigation.options if target in option]
+            if not pages:
+                raise LookupError(f"Scenario {self.scenario}: no page matching {target!r}")
+            state = WidgetState(id=navigation.id, string_value=pages[0])
+        else:
+            widget = self._widget(target)
+            state = WidgetState(id=widget.id)
+            if action == 'multiselect':
+                # Choices travel as option labels, exactly as the browser sends them.
+                selection = list(widget.options[:value])
+                if len(selection) != value:
+                    raise LookupError(f"Scenario {self.scenario}: {target} has fewer than {value} options")
+                state.string_array_value.data[:] = selection
+                check_effect = bool(selection)
+            elif action == 'text_input':
+                state.string_value = value
+            elif action == 'toggle':
+                state.bool_value = value
+        self.states[state.id] = state
+        await self._rerun(action + " " + str(target), check_effect)
+
+    async def run(self, iterations, start):
+        from websockets.asyncio.client import connect
+        async with connect(self.url, max_size=None) as self._socket:
+            await start.wait()
+            await self._rerun('initial load')
+            for _ in range(iterations):
+                for action, target, value in SCENARIOS[self.scenario]:
+                    await self.step(action, target, value)
+
+
+async def sample_rss(pid, stop, samples):
+    while not stop.is_set():
+        samples.append(process_rss(pid) or 0)
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(url, sessions, scenarios, iterations, timeout, pid=None):
+    """Run ``sessions`` concurrent sessions (scenarios assigned round-robin) and summarise them."""
+    simulated = [SimulatedSession(url, scenarios[i % len(scenarios)], timeout) for i in range(sessions)]
+    start, stop, rss = asyncio.Event(), asyncio.Event(), []
+    tasks = [asyncio.create_task(session.run(iterations, start)) for session in simulated]
+    sampler = asyncio.create_task(sample_rss(pid, stop, rss)) if pid else None
+    rss_start = process_rss(pid) if pid else None
+    await asyncio.sleep(0)
+    began = time.perf_counter()
+    start.set()
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    wall = time.perf_counter() - began
+    stop.set()
+    if sampler:
+        await sampler
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            raise outcome
+
+    samples = [sample for session in simulated for sample in session.samples]
+    by_step = {}
+    for label, seconds, _ in samples:
+        by_step.setdefault(label, []).append(seconds)
+    return {"sessions": sessions, "scenarios": [session.scenario for session in simulated],
+            "reruns": len(samples), "errors": sum(failed for _, _, failed in samples),
+            "wall_s": round(wall, 3), "throughput_rps": round(len(samples) / wall, 2) if wall else None,
+            "latency": percentiles([seconds for _, seconds, _ in samples]),
+            "steps": {label: percentiles(seconds) for label, seconds in by_step.items()},
+            "rss_start_bytes": rss_start, "rss_peak_bytes": max(rss, default=rss_start),
+            "rss_end_bytes": process_rss(pid) if pid else None}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, data=None):
+    """``streamlit run app.py`` on ``port``; returns the process once its health check answers."""
+    env = dict(os.environ)
+    if data:
+        # Read by app.py when it loads the dataset.
+        env["JOB_MARKET_DATA"] = os.path.abspath(data)
+    server = subprocess.Popen([sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+                               "--server.port", str(port), "--server.fileWatcherType", "none",
+                               "--browser.gatherUsageStats", "false"],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              cwd=os.path.dirname(APP_PATH))
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not answer on port {port} within {SERVER_START_TIMEOUT}s")
+
+
+def stream_url(url):
+    return url.rstrip('/').replace("http://", "ws://", 1).replace("https://", "wss://", 1) + "/_stcore/stream"
+
+
+def compare(previous, current, threshold):
+    """Print p95 changes per concurrency level; return the number of regressions."""
+    before = {level["sessions"]: level["latency"]["p95_ms"] for level in previous["levels"]}
+    regressions = 0
+    print(f"{'sessions':>8} {'before p95 ms':>14} {'after p95 ms':>13} {'ratio':>7}")
+    for level in current["levels"]:
+        old = before.get(level["sessions"])
+        if not old:
+            continue
+        ratio = level["latency"]["p95_ms"] / old
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{level['sessions']:>8} {old:>14.2f} {level['latency']['p95_ms']:>13.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+async def run_levels(url, args, results, pid):
+    # One warm-up session loads the dataset and builds the shared indexes outside the measurements.
+    warmup = await run_level(url, 1, ['browse'], 0, args.timeout, pid)
+    results["warmup_s"] = warmup["wall_s"]
+    for sessions in args.sessions:
+        results["levels"].append(await run_level(url, sessions, args.scenarios, args.iterations, args.timeout, pid))
+        with open(args.output, "w", encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="concurrency levels (default: %(default)s)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="scenarios assigned to sessions round-robin (default: all)")
+    parser.add_argument("--iterations", type=int, default=2, help="passes through the scenario per session")
+    parser.add_argument("--url", help="load-test a running dashboard instead of starting one")
+    parser.add_argument("--port", type=int, help="port for the started dashboard (default: a free one)")
+    parser.add_argument("--data", help="dataset CSV for the started dashboard (default: the app's own dataset)")
+    parser.add_argument("--size", help="generate and use a synthetic dataset of this size, e.g. 200k")
+    parser.add_argument("--data-dir", default="bench_data", help="where synthetic CSVs are kept")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per rerun")
+    parser.add_argument("--output", default="loadtest_results.json")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="p95 ratio above which a level counts as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        raise SystemExit("The load test needs websockets: pip install websockets")
+
+    data = args.data
+    if args.size:
+        rows = parse_size(args.size)
+        data = os.path.join(args.data_dir, f"synthetic_{rows}_seed0.csv")
+        if not os.path.exists(data):
+            write_csv(rows, data)
+    if args.url and data:
+        raise SystemExit("--data and --size only apply to a dashboard started by the load test, not --url")
+
+    from benchmark import git_commit
+    results = {"timestamp": time.time(), "git_commit": git_commit(), "data": data, "url": args.url,
+               "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                               "pandas": pd.__version__, "numpy": np.__version__, "cpus": os.cpu_count()},
+               "iterations": args.iterations, "levels": []}
+    server = None
+    url = args.url
+    if url is None:
+        port = args.port or free_port()
+        server = start_server(port, data)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(run_levels(stream_url(url), args, results, server.pid if server else None))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'peak RSS MB':>12}")
+    for level in results["levels"]:
+        latency = level["latency"]
+        print(f"{level['sessions']:>8} {level['reruns']:>7} {level['errors']:>6} {level['throughput_rps']:>7.2f} "
+              f"{latency['p50_ms']:>9.1f} {latency['p95_ms']:>9.1f} {latency['p99_ms']:>9.1f} "
+              f"{(level['rss_peak_bytes'] or 0) / 2 ** 20:>12.1f}")
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            return 1 if compare(json.load(f), results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
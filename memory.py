@@ -0,0 +1,71 @@
+"""Memory accounting for shared resources, caches and user sessions."""
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def deep_sizeof(obj, _seen=None):
+    """Estimate the bytes held by ``obj``, following containers and frames."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) if obj.base is None else obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), _seen)
+    return size
+
+
+def session_footprint(state):
+    """Return ``{key: bytes}`` for every entry of a session's state."""
+    return {str(key): deep_sizeof(state[key]) for key in list(state.keys())}
+
+
+def format_bytes(n):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(n) < 1024 or unit == 'GB':
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+class SessionRegistry:
+    """Process-wide record of the memory each live session holds.
+
+    Every rerun reports its session's footprint; sessions that have not
+    rerun for ``ttl`` seconds are assumed closed and dropped.
+    """
+
+    def __init__(self, ttl=1800):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def record(self, session_id, footprint):
+        with self._lock:
+            self._sessions[session_id] = (dict(footprint), time.time())
+
+    def snapshot(self):
+        """Return one row per live session, largest first."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for session_id in [s for s, (_, seen) in self._sessions.items() if seen < cutoff]:
+                del self._sessions[session_id]
+            rows = [
+                {"Session": session_id[:8], "Bytes": sum(footprint.values()), "Keys": len(footprint),
+                 "Last Rerun": time.strftime('%H:%M:%S', time.localtime(seen))}
+                for session_id, (footprint, seen) in self._sessions.items()
+            ]
+        return sorted(rows, key=lambda row: row["Bytes"], reverse=True)
@@ -0,0 +1,103 @@
+"""Scatter plots whose browser payload stays bounded for any number of postings.
+
+Plotly sends every point to the browser and, by default, draws 2-D
+scatters as SVG, one DOM node per point. ``scatter_data`` picks one of
+three regimes by point count:
+
+- up to ``WEBGL_THRESHOLD`` points the frame is drawn as is, as SVG;
+- up to ``MAX_SCATTER_POINTS`` every point is drawn with WebGL (``scattergl``);
+- beyond that the points are reduced on the server first, either to a
+  density grid of at most ``DENSITY_BINS`` x ``DENSITY_BINS`` cells (one
+  marker per non-empty cell, sized by its count and coloured by its most
+  common group) or to a stratified sample that keeps each colour group's
+  share and at least ``MIN_GROUP_POINTS`` points of small groups.
+
+3-D scatters are always WebGL and are only ever sampled. Grids and samples
+are cheap (one ``np.unique`` over integer cell keys) and deterministic, so
+callers cache them next to the data they summarise.
+"""
+import numpy as np
+import pandas as pd
+
+WEBGL_THRESHOLD = 1_000
+MAX_SCATTER_POINTS = 20_000
+DENSITY_BINS = 100
+MIN_GROUP_POINTS = 50
+COUNT_COLUMN = 'Points'
+REDUCTIONS = ('bins', 'sample')
+
+
+def stratified_sample(groups, n, seed=0, min_group=MIN_GROUP_POINTS):
+    """Sorted positions of about ``n`` rows, keeping each group's share of ``groups``."""
+    _, inverse, counts = np.unique(np.asarray(groups), return_inverse=True, return_counts=True)
+    quota = np.maximum(np.round(counts * n / max(len(inverse), 1)), np.minimum(counts, min_group))
+    quota = np.minimum(quota, counts).astype(np.int64)
+    # Rows in random order within each group; the first ``quota`` of every group are kept.
+    shuffled = np.random.default_rng(seed).permutation(len(inverse))
+    order = shuffled[np.argsort(inverse[shuffled], kind='stable')]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    group = inverse[order]
+    rank = np.arange(len(order)) - starts[group]
+    return np.sort(order[rank < quota[group]])
+
+
+def _cells(values, bins):
+    values = np.asarray(values, dtype=float)
+    low, high = np.nanmin(values), np.nanmax(values)
+    width = (high - low) / bins if high > low else 1.0
+    cells = np.clip(((values - low) / width).astype(np.int64), 0, bins - 1)
+    return cells, low, width
+
+
+def density_grid(frame, x, y, color=None, bins=DENSITY_BINS):
+    """Non-empty cells of a ``bins`` x ``bins`` grid over ``x``/``y``.
+
+    Each cell is placed at its centre with its point count in
+    ``COUNT_COLUMN`` and, with ``color``, the cell's most common group.
+    """
+    frame = frame[np.isfinite(frame[x].to_numpy(dtype=float)) & np.isfinite(frame[y].to_numpy(dtype=float))]
+    columns = [x, y] + ([color] if color else []) + [COUNT_COLUMN]
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+    ix, x_low, x_width = _cells(frame[x], bins)
+    iy, y_low, y_width = _cells(frame[y], bins)
+    cell = ix * bins + iy
+    if color:
+        codes, labels = pd.factorize(frame[color], sort=True)
+        keys, counts = np.unique(cell * (len(labels) + 1) + codes + 1, return_counts=True)
+        key_cells, key_codes = keys // (len(labels) + 1), keys % (len(labels) + 1) - 1
+        # Keys are sorted by cell; within a cell the largest count (first code on ties) wins.
+        order = np.lexsort((key_codes, -counts, key_cells))
+        first = np.concatenate([[True], key_cells[order][1:] != key_cells[order][:-1]])
+        cells = key_cells[order][first]
+        dominant = key_codes[order][first]
+        totals = np.bincount(np.searchsorted(cells, key_cells), weights=counts).astype(np.int64)
+    else:
+        cells, totals = np.unique(cell, return_counts=True)
+    grid = pd.DataFrame({x: x_low + (cells // bins + 0.5) * x_width, y: y_low + (cells % bins + 0.5) * y_width})
+    if color:
+        grid[color] = np.where(dominant >= 0, np.asarray(labels, dtype=object)[np.maximum(dominant, 0)], None)
+        if pd.api.types.is_numeric_dtype(labels):
+            grid[color] = grid[color].astype(labels.dtype)
+    grid[COUNT_COLUMN] = totals
+    return grid[columns]
+
+
+def scatter_data(frame, x, y, color=None, z=None, reduce='bins', max_points=MAX_SCATTER_POINTS,
+                 bins=DENSITY_BINS, seed=0):
+    """The frame to hand to ``px.scatter``/``px.scatter_3d`` and the extra arguments to draw it with.
+
+    ``reduce`` chooses between a density grid (``'bins'``, 2-D only) and a
+    stratified ``'sample'`` once there are more than ``max_points`` points.
+    """
+    if reduce not in REDUCTIONS:
+        raise ValueError("reduce must be one of " + ", ".join(REDUCTIONS))
+    if len(frame) > max_points:
+        if reduce == 'bins' and z is None:
+            frame = density_grid(frame, x, y, color, bins)
+            return frame, {'size': COUNT_COLUMN, 'render_mode': 'webgl' if len(frame) > WEBGL_THRESHOLD else 'svg'}
+        groups = frame[color].to_numpy() if color else np.zeros(len(frame))
+        frame = frame.iloc[stratified_sample(groups, max_points, seed)]
+    if z is not None:
+        return frame, {}
+    return frame, {'render_mode': 'webgl' if len(frame) > WEBGL_THRESHOLD else 'svg'}
@@ -0,0 +1,143 @@
+"""Top-k job recommendations for user profiles.
+
+Every posting is encoded once into a sparse feature row: TF-IDF weighted
+skills (L2-normalised) followed by one-hot blocks for city, experience band
+and work mode. A profile becomes a dense query vector over the same
+features, so scoring all postings is a single sparse matrix-vector product
+followed by a partial (argpartition) top-k selection.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from telemetry import TELEMETRY
+
+DEFAULT_RECOMMENDATIONS = 10
+DEFAULT_WEIGHTS = {'skills': 0.6, 'city': 0.2, 'experience': 0.1, 'remote': 0.1}
+
+
+def _one_hot(column):
+    column = column.astype('category')
+    codes = column.cat.codes.to_numpy()
+    present = np.flatnonzero(codes >= 0)
+    matrix = sparse.csr_matrix((np.ones(len(present), dtype=np.float32), (present, codes[present])),
+                               shape=(len(codes), len(column.cat.categories)))
+    return matrix, list(column.cat.categories)
+
+
+def profile_key(profile, k):
+    return (tuple(sorted(skill.lower() for skill in profile.get('preferred_skills', []))),
+            profile.get('preferred_city', ''), profile.get('experience', ''),
+            profile.get('remote_preference', ''), k)
+
+
+class JobRecommender:
+    """Ranks postings of a dataset against user profiles."""
+
+    def __init__(self, dataset, weights=None, cache_size=256):
+        self.dataset = dataset
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        frame = dataset.frame
+        skill_matrix = dataset.skills
+        self.skills = skill_matrix
+
+        # Skills block: indicator x IDF, each posting row scaled to unit length.
+        doc_freq = np.asarray(skill_matrix.postings.sum(axis=0)).ravel()
+        self.idf = np.log((1 + len(frame)) / (1 + doc_freq)).astype(np.float32) + 1
+        tfidf = skill_matrix.postings @ sparse.diags(self.idf)
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        tfidf = sparse.diags(1 / np.maximum(norms, 1e-12)) @ tfidf
+
+        blocks = [tfidf]
+        self.offsets = {'skills': 0}
+        self.labels = {}
+        offset = tfidf.shape[1]
+        for block, column in [('city', 'Job Location'), ('experience', 'Experience Required'),
+                              ('remote', 'Remote/Onsite')]:
+            matrix, labels = _one_hot(frame[column])
+            blocks.append(matrix)
+            self.offsets[block] = offset
+            self.labels[block] = labels
+            offset += matrix.shape[1]
+        self.features = sparse.hstack(blocks, format='csr', dtype=np.float32)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def query_vector(self, profile):
+        """Encode a profile dict as a weighted query over the posting features."""
+        query = np.zeros(self.features.shape[1], dtype=np.float32)
+        skills = self.skills.indices(profile.get('preferred_skills', []))
+        if skills:
+            weights = self.idf[skills]
+            query[skills] = self.weights['skills'] * weights / np.linalg.norm(weights)
+        city = profile.get('preferred_city')
+        if city in self.labels['city']:
+            query[self.offsets['city'] + self.labels['city'].index(city)] = self.weights['city']
+        experience = profile.get('experience')
+        if experience in self.labels['experience']:
+            # Neighbouring bands still count for half, since the labels are ordered.
+            position = self.labels['experience'].index(experience)
+            for neighbour, share in [(position - 1, 0.5), (position, 1.0), (position + 1, 0.5)]:
+                if 0 <= neighbour < len(self.labels['experience']):
+                    query[self.offsets['experience'] + neighbour] = self.weights['experience'] * share
+        remote = profile.get('remote_preference')
+        if remote in self.labels['remote']:
+            query[self.offsets['remote'] + self.labels['remote'].index(remote)] = self.weights['remote']
+        return query
+
+    @staticmethod
+    def _top_k(scores, k):
+        k = min(k, len(scores))
+        if k == 0:
+            return np.array([], dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.lexsort((top, -scores[top]))]
+
+    def recommend(self, profile, k=DEFAULT_RECOMMENDATIONS):
+        """Return the ``k`` best postings for ``profile`` with a 'Match Score' column."""
+        key = profile_key(profile, k)
+        with self._lock:
+            hit = key in self._cache
+            if hit:
+                self._cache.move_to_end(key)
+                result = self._cache[key]
+        TELEMETRY.cache_event("JobRecommender.recommend", hit)
+        if hit:
+            return result
+        scores = self.features @ self.query_vector(profile)
+        top = self._top_k(scores, k)
+        result = self.dataset.frame.take(top).assign(**{'Match Score': scores[top]})
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def recommend_batch(self, profiles, k=DEFAULT_RECOMMENDATIONS, chunk_size=64):
+        """Recommend for many profiles, scoring them together as a sparse x dense product.
+
+        Returns a long frame with a 'Profile' column holding the index of the
+        profile in ``profiles``. Each profile's result is also cached, so a
+        batch over saved profiles warms ``recommend``.
+        """
+        results = []
+        for start in range(0, len(profiles), chunk_size):
+            chunk = profiles[start:start + chunk_size]
+            queries = np.stack([self.query_vector(profile) for profile in chunk], axis=1)
+            scores = np.asarray(self.features @ queries)
+            for offset in range(len(chunk)):
+                top = self._top_k(scores[:, offset], k)
+                result = self.dataset.frame.take(top).assign(**{'Match Score': scores[top, offset]})
+                self._remember(profile_key(chunk[offset], k), result)
+                results.append(result.assign(Profile=start + offset))
+        if not results:
+            return pd.DataFrame(columns=list(self.dataset.frame.columns) + ['Match Score', 'Profile'])
+        return pd.concat(results, ignore_index=True)
@@ -0,0 +1,300 @@
+"""Summary reports and chart exports for a selection of postings.
+
+Kept free of Streamlit so the dashboard's "Download Summary Report" button
+and the command-line entry point (cli.py) produce the same reports. A
+selection is a ``JobDataset`` plus the row positions returned by
+``JobDataset.filter_rows`` (``None`` for all rows).
+
+Batch reports for every value of a column (every city, company, ...) are
+computed in one grouped pass: segment x city and segment x company counts
+come from a single ``bincount`` each, and segment x skill counts from one
+sparse product with the posting x skill matrix. Reports are rendered from
+the ``string.Template`` templates below.
+"""
+import html
+import io
+import re
+import zipfile
+from string import Template
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from job_data import count_values
+
+TOP_N = 5
+
+SUMMARY_MARKDOWN = Template("""# $title
+*Generated on*: $generated
+
+## Overview
+- *Total Job Postings*: $total
+
+## Top $skill_count In-Demand Skills
+$skills
+
+## Top $city_count Job Locations
+$cities
+
+## Top $company_count Hiring Companies
+$companies
+""")
+ITEM_MARKDOWN = Template("- $name: $count postings")
+
+SUMMARY_HTML = Template("""<!DOCTYPE html>
+<html><head><meta charset='utf-8'><title>$title</title></head><body>
+<h1>$title</h1>
+<p><em>Generated on</em>: $generated</p>
+<h2>Overview</h2>
+<ul><li><em>Total Job Postings</em>: $total</li></ul>
+<h2>Top $skill_count In-Demand Skills</h2>
+<ul>$skills</ul>
+<h2>Top $city_count Job Locations</h2>
+<ul>$cities</ul>
+<h2>Top $company_count Hiring Companies</h2>
+<ul>$companies</ul>
+</body></html>
+""")
+ITEM_HTML = Template("<li>$name: $count postings</li>")
+
+INDEX_MARKDOWN = Template("""# $title
+*Generated on*: $generated
+
+$sections
+""")
+INDEX_SECTION_MARKDOWN = Template("""## By $column
+
+| Segment | Postings |
+|---|---|
+$rows
+""")
+INDEX_ROW_MARKDOWN = Template("| [$name]($link) | $total |")
+
+INDEX_HTML = Template("""<!DOCTYPE html>
+<html><head><meta charset='utf-8'><title>$title</title></head><body>
+<h1>$title</h1>
+<p><em>Generated on</em>: $generated</p>
+$sections
+</body></html>
+""")
+INDEX_SECTION_HTML = Template("""<h2>By $column</h2>
+<table><tr><th>Segment</th><th>Postings</th></tr>
+$rows
+</table>""")
+INDEX_ROW_HTML = Template("<tr><td><a href='$link'>$name</a></td><td>$total</td></tr>")
+
+
+def slugify(name):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(name)).strip('-').lower() or 'segment'
+
+
+def unique_slugs(names):
+    """``slugify`` of each name, with "-2", "-3", ... appended where a slug is already taken ("C++" and "C")."""
+    slugs, taken = [], set()
+    for name in names:
+        slug = base = slugify(name)
+        suffix = 1
+        while slug in taken:
+            suffix += 1
+            slug = base + "-" + str(suffix)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def _codes(column, positions):
+    column = column.astype('category')
+    return column.cat.codes.to_numpy()[positions], list(column.cat.categories)
+
+
+def _crosstab(segments, n_segments, column, positions):
+    """Segment x value counts of ``column`` from a single bincount."""
+    codes, labels = _codes(column, positions)
+    valid = codes >= 0
+    flat = segments[valid].astype(np.int64) * len(labels) + codes[valid]
+    return np.bincount(flat, minlength=n_segments * len(labels)).reshape(n_segments, len(labels)), labels
+
+
+def _top(counts, labels, top):
+    """The ``top`` largest non-zero counts, ties kept in label order."""
+    order = np.argsort(-counts, kind='stable')[:top]
+    return [(labels[i], int(counts[i])) for i in order if counts[i] > 0]
+
+
+def _grouped_summaries(dataset, segments, positions, n_segments, top):
+    """Summaries for every segment code in ``segments`` (aligned with row ``positions``)."""
+    frame = dataset.frame
+    totals = np.bincount(segments, minlength=n_segments)
+    membership = sparse.csr_matrix((np.ones(len(segments), dtype=np.int64), (segments, positions)),
+                                   shape=(n_segments, len(frame)))
+    # The product with the float32 skill matrix comes out float64, exact for any row count.
+    skill_counts = (membership @ dataset.skills.postings).toarray()
+    city_counts, cities = _crosstab(segments, n_segments, frame['Job Location'], positions)
+    company_counts, companies = _crosstab(segments, n_segments, frame['Company Name'], positions)
+    return [{"Total Jobs": int(totals[s]),
+             "Top Skills": _top(skill_counts[s], dataset.skills.vocabulary, top),
+             "Top Cities": dict(_top(city_counts[s], cities, top)),
+             "Top Companies": dict(_top(company_counts[s], companies, top))}
+            for s in range(n_segments)]
+
+
+def _positions(dataset, rows):
+    return np.arange(len(dataset)) if rows is None else np.asarray(rows)
+
+
+def summarize(dataset, rows=None, top=TOP_N):
+    """Totals and top skills, cities and companies of the selected postings."""
+    positions = _positions(dataset, rows)
+    return _grouped_summaries(dataset, np.zeros(len(positions), dtype=np.int64), positions, 1, top)[0]
+
+
+def summarize_by(dataset, column, rows=None, top=TOP_N):
+    """``[(value, summary)]`` for every value of ``column`` within the selection, largest first.
+
+    All segments are summarised together in one grouped pass over the rows.
+    """
+    positions = _positions(dataset, rows)
+    segments, labels = _codes(dataset.frame[column], positions)
+    present = segments >= 0
+    summaries = _grouped_summaries(dataset, segments[present].astype(np.int64), positions[present],
+                                   len(labels), top)
+    order = np.argsort([-summary["Total Jobs"] for summary in summaries], kind='stable')
+    return [(labels[s], summaries[s]) for s in order if summaries[s]["Total Jobs"] > 0]
+
+
+def _timestamp(generated):
+    return (generated or pd.Timestamp.now()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _fields(summary, title, generated, item, escape):
+    def items(pairs):
+        return "\n".join(item.substitute(name=escape(str(name)), count=count) for name, count in pairs)
+    return {"title": escape(title), "generated": _timestamp(generated), "total": summary['Total Jobs'],
+            "skill_count": len(summary['Top Skills']), "skills": items(summary['Top Skills']),
+            "city_count": len(summary['Top Cities']), "cities": items(summary['Top Cities'].items()),
+            "company_count": len(summary['Top Companies']), "companies": items(summary['Top Companies'].items())}
+
+
+def summary_markdown(summary, title="Job Market Summary Report", generated=None):
+    return SUMMARY_MARKDOWN.substitute(_fields(summary, title, generated, ITEM_MARKDOWN, str))
+
+
+def summary_html(summary, title="Job Market Summary Report", generated=None):
+    return SUMMARY_HTML.substitute(_fields(summary, title, generated, ITEM_HTML, html.escape))
+
+
+def summary_table(summary):
+    """Long-format table of the summary (Section, Item, Postings) for CSV export."""
+    records = [("Overview", "Total Job Postings", summary['Total Jobs'])]
+    for section, key in [("Top Skills", 'Top Skills'), ("Top Cities", 'Top Cities'),
+                         ("Top Companies", 'Top Companies')]:
+        items = summary[key].items() if isinstance(summary[key], dict) else summary[key]
+        records += [(section, name, count) for name, count in items]
+    return pd.DataFrame(records, columns=['Section', 'Item', 'Postings'])
+
+
+def report_bundle(dataset, columns, rows=None, formats=('md', 'html', 'csv'), top=TOP_N,
+                  title="Job Market Segment Reports", generated=None):
+    """Zip archive (bytes) with a report per value of each of ``columns`` and an index.
+
+    Reports are stored as ``<column>/<value>.md|.html``; ``segments.csv``
+    holds every summary in long format.
+    """
+    generated = generated or pd.Timestamp.now()
+    buffer = io.BytesIO()
+    tables, md_sections, html_sections = [], [], []
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for column in columns:
+            md_rows, html_rows = [], []
+            summaries = summarize_by(dataset, column, rows, top)
+            for (value, summary), slug in zip(summaries, unique_slugs(value for value, _ in summaries)):
+                stem = slugify(column) + "/" + slug
+                segment_title = "Job Market Summary Report: " + column + " = " + str(value)
+                if 'md' in formats:
+                    bundle.writestr(stem + ".md", summary_markdown(summary, segment_title, generated))
+                if 'html' in formats:
+                    bundle.writestr(stem + ".html", summary_html(summary, segment_title, generated))
+                if 'csv' in formats:
+                    tables.append(summary_table(summary).assign(Group=column, Segment=value))
+                total = summary['Total Jobs']
+                md_rows.append(INDEX_ROW_MARKDOWN.substitute(name=value, link=stem + ".md", total=total))
+                html_rows.append(INDEX_ROW_HTML.substitute(name=html.escape(str(value)), link=stem + ".html",
+                                                           total=total))
+            md_sections.append(INDEX_SECTION_MARKDOWN.substitute(column=column, rows="\n".join(md_rows)))
+            html_sections.append(INDEX_SECTION_HTML.substitute(column=html.escape(column), rows="\n".join(html_rows)))
+        if 'md' in formats:
+            bundle.writestr("index.md", INDEX_MARKDOWN.substitute(title=title, generated=_timestamp(generated),
+                                                                  sections="\n".join(md_sections)))
+        if 'html' in formats:
+            bundle.writestr("index.html", INDEX_HTML.substitute(title=html.escape(title),
+                                                                generated=_timestamp(generated),
+                                                                sections="\n".join(html_sections)))
+        if tables:
+            combined = pd.concat(tables, ignore_index=True)[['Group', 'Segment', 'Section', 'Item', 'Postings']]
+            bundle.writestr("segments.csv", combined.to_csv(index=False))
+    return buffer.getvalue()
+
+
+# Chart exports, matching the download buttons of the Company and Skill Insights pages.
+# plotly is imported on first use so report-only runs start quickly.
+
+def _count_chart(dataset, rows, column, label, value, top=None):
+    counts = count_values(dataset.select(rows)[column])
+    if top:
+        counts = counts.head(top)
+    chart = counts.reset_index()
+    chart.columns = [label, value]
+    return chart
+
+
+def _top_companies(dataset, rows):
+    import plotly.express as px
+    chart = _count_chart(dataset, rows, 'Company Name', 'Company', 'Postings', top=10)
+    return px.bar(chart, x='Company', y='Postings', color='Postings', color_continuous_scale='Viridis')
+
+
+def _job_titles(dataset, rows):
+    import plotly.express as px
+    chart = _count_chart(dataset, rows, 'Job Title', 'Title', 'Count', top=10)
+    return px.bar(chart, x='Title', y='Count', color='Count', color_continuous_scale='Plasma')
+
+
+def _jobs_by_city(dataset, rows):
+    import plotly.express as px
+    chart = _count_chart(dataset, rows, 'Job Location', 'City', 'Count', top=10)
+    return px.pie(chart, names='City', values='Count', color_discrete_sequence=px.colors.qualitative.Pastel)
+
+
+def _experience_demand(dataset, rows):
+    import plotly.express as px
+    chart = _count_chart(dataset, rows, 'Experience Required', 'Experience', 'Count')
+    return px.line(chart.sort_values('Experience'), x='Experience', y='Count', markers=True,
+                   color_discrete_sequence=['#FF5722'])
+
+
+def _job_types(dataset, rows):
+    import plotly.express as px
+    chart = _count_chart(dataset, rows, 'Job Type', 'Job Type', 'Count')
+    return px.pie(chart, names='Job Type', values='Count', color_discrete_sequence=px.colors.qualitative.Set2)
+
+
+def _top_skills(dataset, rows):
+    import plotly.express as px
+    chart = dataset.skills.top(rows, 10).rename_axis('Skill').reset_index(name='Count')
+    return px.bar(chart, x='Skill', y='Count', color='Count', color_continuous_scale='Viridis')
+
+
+CHARTS = {
+    "top_companies": _top_companies,
+    "job_titles": _job_titles,
+    "jobs_by_city": _jobs_by_city,
+    "experience_demand": _experience_demand,
+    "job_types": _job_types,
+    "top_skills": _top_skills,
+}
+
+
+def export_chart(name, dataset, rows=None, include_plotlyjs=True):
+    """Build chart ``name`` from ``CHARTS`` for the selection and return it as standalone HTML."""
+    return CHARTS[name](dataset, rows).to_html(include_plotlyjs=include_plotlyjs)
@@ -0,0 +1,165 @@
+"""Ranked keyword search over job title, company, city and skills.
+
+Text columns hold few distinct values (a few dozen titles, a few thousand
+skill lists), so the inverted index maps each word to the distinct field
+values containing it rather than to rows, and rows reach their values
+through integer codes. A query is answered with one sparse product per
+field (values x words times the query's word weights) and a gather over the
+candidate rows; no column is ever scanned with ``str.contains``.
+
+Each query term matches indexed words exactly, by prefix ("pyth" finds
+"python") or, from three characters on, anywhere inside a word through a
+character trigram index ("script" finds "javascript"). A posting must match
+every term; its score sums, per term, the best field weight x match quality
+x IDF, so rare words and title matches rank first.
+"""
+import re
+import threading
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+FIELD_WEIGHTS = {'Job Title': 3.0, 'Company Name': 2.0, 'Skills Required': 1.5, 'Job Location': 1.0}
+EXACT, PREFIX, INFIX = 1.0, 0.8, 0.5
+_WORD_RE = re.compile(r"[\w+#]+(?:\.[\w+#]+)*")
+
+
+def tokenize(text):
+    """Lower-case words, keeping "c++", "c#" and "node.js" whole."""
+    return _WORD_RE.findall(str(text).lower())
+
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class SearchIndex:
+    """Inverted index from words to field values, with prefix and trigram lookup."""
+
+    def __init__(self, frame):
+        self.words = []  # word id -> word
+        self._word_ids = {}
+        self._sorted = []  # words in sorted order, for prefix ranges
+        self._grams = {}  # trigram -> ids of words containing it
+        self._values = {field: {} for field in FIELD_WEIGHTS}  # value -> code (0 is missing)
+        self._value_words = {field: [[]] for field in FIELD_WEIGHTS}
+        self._matrices = {}
+        self._codes = {field: np.empty(0, dtype=np.int32) for field in FIELD_WEIGHTS}
+        self._value_rows = {field: np.zeros(1, dtype=np.int64) for field in FIELD_WEIGHTS}
+        self._idf = None
+        self.revision = 0
+        self._lock = threading.Lock()
+        self.add(frame)
+
+    def __len__(self):
+        return len(next(iter(self._codes.values())))
+
+    def _word_id(self, word):
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = self._word_ids[word] = len(self.words)
+            self.words.append(word)
+            for gram in trigrams(word):
+                self._grams.setdefault(gram, set()).add(word_id)
+        return word_id
+
+    def add(self, frame):
+        """Index newly appended postings; only values not seen before are tokenised."""
+        with self._lock:
+            for field in FIELD_WEIGHTS:
+                column = (frame[field] if field in frame.columns else pd.Series(np.nan, index=frame.index))
+                column = column.astype('category')
+                values, value_words = self._values[field], self._value_words[field]
+                for value in column.cat.categories:
+                    if value not in values:
+                        values[value] = len(value_words)
+                        value_words.append(sorted({self._word_id(word) for word in tokenize(value)}))
+                lookup = np.array([values[value] for value in column.cat.categories] + [0], dtype=np.int32)
+                codes = lookup[column.cat.codes.to_numpy()]
+                self._codes[field] = np.concatenate([self._codes[field], codes])
+                counts = self._value_rows[field]
+                counts = np.concatenate([counts, np.zeros(len(value_words) - len(counts), dtype=np.int64)])
+                self._value_rows[field] = counts + np.bincount(codes, minlength=len(value_words))
+            self._sorted = sorted(self.words)
+            self._matrices = {}
+            self._idf = None
+            self.revision += 1
+
+    def _matrix(self, field):
+        """Binary field value x word matrix, rebuilt lazily after new values or words arrive."""
+        matrix = self._matrices.get(field)
+        if matrix is None:
+            value_words = self._value_words[field]
+            indptr = np.cumsum([0] + [len(words) for words in value_words])
+            indices = np.fromiter((word for words in value_words for word in words), dtype=np.int32,
+                                  count=indptr[-1])
+            matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float64), indices, indptr),
+                                       shape=(len(value_words), len(self.words)))
+            self._matrices[field] = matrix
+        return matrix
+
+    def idf(self):
+        """Smoothed inverse document frequency of every word, counting postings per field."""
+        if self._idf is None:
+            postings = sum(self._matrix(field).T @ self._value_rows[field] for field in FIELD_WEIGHTS)
+            self._idf = np.log((1 + len(self)) / (1 + postings)) + 1
+        return self._idf
+
+    def matches(self, term):
+        """``{word id: match quality}`` for the indexed words a query term matches."""
+        found = {}
+        exact = self._word_ids.get(term)
+        start = bisect_left(self._sorted, term)
+        for word in self._sorted[start:]:
+            if not word.startswith(term):
+                break
+            found[self._word_ids[word]] = PREFIX
+        if len(term) >= 3:
+            grams = [self._grams.get(gram, set()) for gram in trigrams(term)]
+            for word_id in set.intersection(*grams):
+                if term in self.words[word_id]:
+                    found.setdefault(word_id, INFIX)
+        if exact is not None:
+            found[exact] = EXACT
+        return found
+
+    def search(self, query, rows=None, limit=50):
+        """Positions (best first) and scores of postings among ``rows`` matching every query term.
+
+        ``limit=None`` returns all matches, in position order. A query without
+        any words matches every row, with a score of zero.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            positions = np.arange(len(self), dtype=np.int32) if rows is None else np.asarray(rows, dtype=np.int32)
+            return positions[:limit], np.zeros(len(positions[:limit]))
+        with self._lock:
+            idf = self.idf()
+            positions = None if rows is None else np.asarray(rows, dtype=np.int32)
+            scores = None
+            for term in terms:
+                weights = np.zeros(len(self.words))
+                for word_id, quality in self.matches(term).items():
+                    weights[word_id] = quality * idf[word_id]
+                best = np.zeros(len(self) if positions is None else len(positions))
+                for field, field_weight in FIELD_WEIGHTS.items():
+                    value_scores = self._matrix(field) @ weights
+                    if value_scores.any():
+                        codes = self._codes[field] if positions is None else self._codes[field][positions]
+                        np.maximum(best, field_weight * value_scores[codes], out=best)
+                # Rows missing a term drop out before the next term is scored.
+                hit = np.flatnonzero(best)
+                positions = hit.astype(np.int32) if positions is None else positions[hit]
+                scores = best[hit] if scores is None else scores[hit] + best[hit]
+        if limit is None:
+            return positions, scores
+        if len(scores) > limit:
+            # Partial selection: everything above the limit-th best score, then ties in position order.
+            cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            above = np.flatnonzero(scores > cutoff)
+            keep = np.concatenate([above, np.flatnonzero(scores == cutoff)[:limit - len(above)]])
+            positions, scores = positions[keep], scores[keep]
+        order = np.lexsort((positions, -scores))
+        return positions[order], scores[order]
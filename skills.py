@@ -0,0 +1,389 @@
+"""Skill vocabulary and sparse skill matrices built from 'Skills Required'.
+
+``Skills Required`` holds comma-joined lists ("C++, SQL, Python"). Each
+distinct list is tokenised once; postings then map onto a sparse
+posting x skill indicator matrix through their categorical codes, so no
+page has to re-split skill strings.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def split_skills(text):
+    return [skill.strip() for skill in str(text).split(',') if skill.strip()]
+
+
+class SkillMatrix:
+    """Canonical skill vocabulary plus a CSR posting x skill indicator matrix."""
+
+    def __init__(self, skills_column):
+        column = skills_column.astype('category')
+        combos = list(column.cat.categories)
+        names = {}
+        for combo in combos:
+            for skill in split_skills(combo):
+                names.setdefault(skill.lower(), skill)
+        self.vocabulary = sorted(names.values(), key=str.lower)
+        self.lookup = {skill.lower(): i for i, skill in enumerate(self.vocabulary)}
+
+        # Distinct skill list x skill, then gathered per posting by category code.
+        rows, cols = [], []
+        for i, combo in enumerate(combos):
+            for j in {self.lookup[skill.lower()] for skill in split_skills(combo)}:
+                rows.append(i)
+                cols.append(j)
+        combo_matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                                         shape=(len(combos) + 1, len(self.vocabulary)))
+        codes = column.cat.codes.to_numpy().astype(np.int64)
+        codes[codes < 0] = len(combos)  # missing values map to the trailing empty row
+        self.postings = combo_matrix[codes]
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def indices(self, skills):
+        return [self.lookup[skill.lower()] for skill in skills if skill.lower() in self.lookup]
+
+    def vector(self, skills):
+        """Binary indicator vector over the vocabulary for a set of skill names."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        vector[self.indices(skills)] = 1
+        return vector
+
+    def counts(self, rows=None, weights=None):
+        """Number of postings requiring each skill, over all rows or the given positions.
+
+        With ``weights`` (one per selected posting, e.g. applicants) each
+        posting counts for its weight instead of one.
+        """
+        matrix = self.postings if rows is None else self.postings[rows]
+        if weights is not None:
+            weights = np.asarray(weights)
+            totals = matrix.T @ weights.astype(np.float64)
+            return totals.astype(np.int64) if np.issubdtype(weights.dtype, np.integer) else totals
+        return np.asarray(matrix.sum(axis=0)).ravel().astype(np.int64)
+
+    def top(self, rows=None, n=10, weights=None):
+        counts = pd.Series(self.counts(rows, weights), index=self.vocabulary)
+        return counts[counts > 0].sort_values(ascending=False, kind='stable').head(n)
+
+
+class RoleSkillProfile:
+    """Role x skill demand matrix: the share of each role's postings requiring each skill."""
+
+    def __init__(self, skill_matrix, roles_column):
+        roles_column = roles_column.astype('category')
+        self.skills = skill_matrix
+        self.roles = list(roles_column.cat.categories)
+        self.role_lookup = {role: i for i, role in enumerate(self.roles)}
+        codes = roles_column.cat.codes.to_numpy()
+        present = np.flatnonzero(codes >= 0)
+        membership = sparse.csr_matrix((np.ones(len(present), dtype=np.float32), (codes[present], present)),
+                                       shape=(len(self.roles), len(codes)))
+        self.postings = np.bincount(codes[present], minlength=len(self.roles))
+        counts = (membership @ skill_matrix.postings).tocsr()
+        self.frequency = (sparse.diags(1.0 / np.maximum(self.postings, 1)) @ counts).tocsr()
+        self.demand = np.asarray(self.frequency.sum(axis=1)).ravel()
+
+    def score(self, user_skills):
+        """Score a skill set against every role in one sparse matrix-vector pass.
+
+        Coverage is the demand-weighted share of a role's skills the user has;
+        Jaccard is the weighted Jaccard similarity between the user's binary
+        skill vector and the role's frequency vector.
+        """
+        vector = self.skills.vector(user_skills)
+        matched = self.frequency @ vector
+        coverage = np.divide(matched, self.demand, out=np.zeros_like(matched), where=self.demand > 0)
+        union = self.demand + vector.sum() - matched
+        jaccard = np.divide(matched, union, out=np.zeros_like(matched), where=union > 0)
+        return pd.DataFrame({'Role': self.roles, 'Coverage': coverage, 'Jaccard': jaccard,
+                             'Postings': self.postings})
+
+    def closest_roles(self, user_skills, k=5):
+        scores = self.score(user_skills)
+        k = min(k, len(scores))
+        if k == 0:
+            return scores
+        top = np.argpartition(-scores['Coverage'].to_numpy(), k - 1)[:k]
+        return scores.iloc[top].sort_values(['Coverage', 'Jaccard'], ascending=False)
+
+    def role_demand(self, role):
+        """Skills demanded by ``role`` with the share of its postings requiring each."""
+        row = self.frequency.getrow(self.role_lookup[role])
+        demand = pd.Series(row.data, index=[self.skills.vocabulary[j] for j in row.indices])
+        return demand.sort_values(ascending=False, kind='stable')
+
+    def gap(self, role, user_skills):
+        """Split a role's demanded skills into matched and missing, most demanded first."""
+        demand = self.role_demand(role)
+        have = demand.index.str.lower().isin([skill.lower() for skill in user_skills])
+        return demand[have], demand[~have]
+
+
+class SkillCooccurrence:
+    """Skill x skill co-occurrence of a selection of postings, computed as Xᵀ·X.
+
+    ``counts[i, j]`` is the number of selected postings requiring both skills
+    and the diagonal holds each skill's own posting count, so lift and PMI
+    follow from the matrix without another pass over the postings.
+    """
+
+    def __init__(self, skill_matrix, rows=None):
+        postings = skill_matrix.postings if rows is None else skill_matrix.postings[rows]
+        postings = postings.astype(np.int32)  # exact counts beyond float32's 2**24
+        self.vocabulary = skill_matrix.vocabulary
+        self.lookup = skill_matrix.lookup
+        self.total = postings.shape[0]
+        self.counts = (postings.T @ postings).tocsr()
+        self.support = self.counts.diagonal()
+
+    def related(self, skill, k=10, min_count=1, by='Lift'):
+        """Skills most associated with ``skill``, ranked by lift or by postings ``'Together'``.
+
+        Lift is P(a, b) / (P(a) P(b)); PMI is its base-2 logarithm, so it ranks
+        the same. Confidence P(b | a) is the count over a fixed total and ranks
+        like 'Together'. Pairs seen fewer than ``min_count`` times are left out
+        as too noisy to rank.
+        """
+        if by not in ('Lift', 'Together'):
+            raise ValueError("by must be 'Lift' or 'Together'")
+        columns = ['Skill', 'Together', 'Confidence', 'Lift', 'PMI']
+        i = self.lookup.get(skill.lower())
+        if i is None or self.support[i] == 0:
+            return pd.DataFrame(columns=columns)
+        row = self.counts.getrow(i)
+        keep = (row.indices != i) & (row.data >= min_count)
+        others, together = row.indices[keep], row.data[keep]
+        lift = together * self.total / (self.support[i] * self.support[others])
+        related = pd.DataFrame({'Skill': [self.vocabulary[j] for j in others], 'Together': together.astype(np.int64),
+                                'Confidence': together / self.support[i], 'Lift': lift, 'PMI': np.log2(lift)},
+                               columns=columns)
+        order = [by, 'Together' if by == 'Lift' else 'Lift']
+        return related.sort_values(order, ascending=False, kind='stable').head(k)
+
+    def top_skills(self, n):
+        order = np.argsort(-self.support, kind='stable')[:n]
+        return [self.vocabulary[i] for i in order if self.support[i] > 0]
+
+    def matrix(self, skills, metric='count'):
+        """Dense co-occurrence counts (or lift) among ``skills``, for heatmaps."""
+        index = [self.lookup[skill.lower()] for skill in skills]
+        counts = self.counts[index][:, index].toarray().astype(np.float64)
+        if metric == 'lift':
+            support = self.support[index].astype(np.float64)
+            expected = np.outer(support, support) / max(self.total, 1)
+            counts = np.divide(counts, expected, out=np.zeros_like(counts), where=expected > 0)
+            np.fill_diagonal(counts, np.nan)
+        return pd.DataFrame(counts, index=skills, columns=skills)
+
+    def pairs(self, skills, min_lift=1.0):
+        """Edges among ``skills``: (skill, skill, postings together, lift) with lift above ``min_lift``."""
+        lift = self.matrix(skills, 'lift').to_numpy()
+        counts = self.matrix(skills).to_numpy()
+        upper = np.triu_indices(len(skills), k=1)
+        keep = (counts[upper] > 0) & (lift[upper] > min_lift)
+        return pd.DataFrame({'Source': np.array(skills, dtype=object)[upper[0][keep]],
+                             'Target': np.array(skills, dtype=object)[upper[1][keep]],
+                             'Together': counts[upper][keep].astype(np.int64), 'Lift': lift[upper][keep]})
+
+
+class SkillTimeline:
+    """Dense day x skill posting counts over the whole date range of the dataset.
+
+    Built from the exact-token posting x skill matrix, so "Java" never counts
+    "JavaScript" postings. Every (day, skill) pair of the matrix's non-zeros
+    is folded into one flat index and counted with a single ``bincount``;
+    each skill's daily series is then a column slice.
+    """
+
+    def __init__(self, skill_matrix, dates):
+        self.skills = skill_matrix
+        dates = pd.to_datetime(pd.Series(dates)).dt.normalize()
+        valid = dates.notna().to_numpy()
+        self.start = dates.min() if valid.any() else pd.Timestamp.now().normalize()
+        end = dates.max() if valid.any() else self.start
+        self.dates = pd.date_range(self.start, end, freq='D')
+        self._days = np.full(len(dates), -1, dtype=np.int64)
+        self._days[valid] = (dates[valid] - self.start).dt.days.to_numpy()
+        self.matrix = self._count(skill_matrix.postings, self._days)
+        self.totals = np.bincount(self._days[valid], minlength=len(self.dates))
+        self.revision = 0
+        self._changes = []  # (revision, earliest day touched) per add()
+        self._lock = threading.Lock()  # the timeline is shared by every session of the process
+
+    def _count(self, postings, days):
+        postings = postings.tocsr()
+        rows = np.repeat(np.arange(postings.shape[0]), np.diff(postings.indptr))
+        keep = days[rows] >= 0
+        flat = days[rows[keep]] * len(self.skills) + postings.indices[keep]
+        return np.bincount(flat, minlength=len(self.dates) * len(self.skills)).reshape(
+            len(self.dates), len(self.skills))
+
+    def counts(self, rows=None):
+        """Day x skill counts over all postings or only those at the given positions."""
+        if rows is None:
+            return self.matrix
+        return self._count(self.skills.postings[rows], self._days[rows])
+
+    def day_totals(self, rows=None):
+        """Postings per day over all postings or only those at the given positions."""
+        if rows is None:
+            return self.totals
+        days = self._days[rows]
+        return np.bincount(days[days >= 0], minlength=len(self.dates))
+
+    def add(self, skill_lists, dates):
+        """Count postings that arrived after the dataset was loaded.
+
+        ``skill_lists`` holds "A, B, C" strings; skills outside the vocabulary
+        are ignored. Later days extend the date range and only the touched days
+        change; ``changed_since`` tells consumers such as ``SkillTrends`` which.
+        Per-row queries (``counts(rows)``) still cover the loaded rows only.
+        """
+        dates = pd.to_datetime(pd.Series(dates)).dt.normalize().reset_index(drop=True)
+        days = (dates - self.start).dt.days
+        if days.lt(0).any():
+            raise ValueError("Postings dated before the start of the timeline cannot be added")
+        valid = days.notna().to_numpy()
+        if not valid.any():
+            return
+        days = days[valid].astype(np.int64).to_numpy()
+        skill_lists = pd.Series(list(skill_lists))[valid].reset_index(drop=True)
+        columns = [np.unique(self.skills.indices(split_skills(text))) for text in skill_lists]
+        with self._lock:
+            grow = days.max() + 1 - len(self.dates)
+            if grow > 0:
+                self.dates = pd.date_range(self.start, periods=len(self.dates) + grow, freq='D')
+                self.matrix = np.vstack([self.matrix, np.zeros((grow, len(self.skills)), dtype=self.matrix.dtype)])
+                self.totals = np.concatenate([self.totals, np.zeros(grow, dtype=self.totals.dtype)])
+            np.add.at(self.totals, days, 1)
+            for day, column in zip(days, columns):
+                self.matrix[day, column] += 1
+            self.revision += 1
+            self._changes.append((self.revision, int(days.min())))
+
+    def changed_since(self, revision):
+        """Earliest day changed by ``add`` after ``revision``, or ``None`` if nothing changed."""
+        days = [day for changed, day in self._changes if changed > revision]
+        return min(days) if days else None
+
+    def changes_since(self, revision, days):
+        """What a consumer holding ``days`` days as of ``revision`` must fold in.
+
+        Returns ``(revision, first day, day x skill counts, day totals)`` with
+        the counts and totals from that day on, copied under the lock; the first
+        day is ``None`` when nothing changed. Days past ``days`` that ``add``
+        appended count as changed even when no posting landed on them.
+        """
+        with self._lock:
+            start = self.changed_since(revision)
+            if start is None:
+                return self.revision, None, None, None
+            start = min(start, days)
+            return self.revision, start, self.matrix[start:].copy(), self.totals[start:].copy()
+
+    def series(self, skill, rows=None):
+        """Daily postings requiring ``skill`` (exact, case-insensitive), zeros included."""
+        column = self.skills.lookup.get(skill.lower())
+        values = self.counts(rows)[:, column] if column is not None else np.zeros(len(self.dates), dtype=np.int64)
+        return pd.Series(values, index=self.dates)
+
+    def daily_counts(self, skill, rows=None):
+        """The skill's daily series as the ``ds``/``y`` frame Prophet expects."""
+        series = self.series(skill, rows)
+        return pd.DataFrame({'ds': series.index, 'y': series.to_numpy()})
+
+    def trends(self, skills, rows=None, days=90, counts=None):
+        """Last ``days`` daily counts of each skill, as lists for sparkline columns.
+
+        ``counts`` is ``counts(rows)`` when the caller already has it.
+        """
+        counts = (self.counts(rows) if counts is None else counts)[-days:]
+        return {skill: counts[:, self.skills.lookup[skill.lower()]].tolist()
+                for skill in skills if skill.lower() in self.skills.lookup}
+
+
+class SkillTrends:
+    """Emerging and declining skills: posting share in a recent window against the window before.
+
+    Cumulative day x skill sums make every window sum a difference of two
+    rows, so all skills and all window lengths are scored together. For the
+    whole dataset the sums follow the timeline incrementally: ``refresh``
+    only recomputes them from the earliest day changed by ``SkillTimeline.add``.
+    """
+
+    WINDOWS = (7, 30, 90)
+
+    def __init__(self, timeline, rows=None, counts=None):
+        self.timeline = timeline
+        self.rows = rows
+        self._revision = timeline.revision
+        counts = timeline.counts(rows) if counts is None else counts
+        totals = timeline.day_totals(rows)
+        self._cumulative = np.vstack([np.zeros((1, counts.shape[1]), dtype=np.int64),
+                                      np.cumsum(counts, axis=0, dtype=np.int64)])
+        self._cumulative_totals = np.concatenate([[0], np.cumsum(totals, dtype=np.int64)])
+        self._lock = threading.Lock()
+
+    @property
+    def days(self):
+        return len(self._cumulative_totals) - 1
+
+    def refresh(self):
+        """Fold postings added to the timeline since the last refresh into the cumulative sums."""
+        if self.rows is not None:
+            return
+        with self._lock:
+            self._revision, start, counts, totals = self.timeline.changes_since(self._revision, self.days)
+            if start is None:
+                return
+            self._cumulative = np.vstack([self._cumulative[:start + 1],
+                                          self._cumulative[start] + np.cumsum(counts, axis=0, dtype=np.int64)])
+            self._cumulative_totals = np.concatenate([self._cumulative_totals[:start + 1],
+                                                      self._cumulative_totals[start] + np.cumsum(totals)])
+
+    def _window(self, end, length):
+        start = max(end - length, 0)
+        return (self._cumulative[end] - self._cumulative[start],
+                self._cumulative_totals[end] - self._cumulative_totals[start])
+
+    def scores(self, window=30):
+        """Share of postings requiring each skill in the last ``window`` days vs. the ``window`` days before.
+
+        Growth is the relative change in share; Z is a two-proportion z-score,
+        so large growth on a handful of postings is not mistaken for a trend.
+        """
+        self.refresh()
+        current, current_total = self._window(self.days, window)
+        previous, previous_total = self._window(max(self.days - window, 0), window)
+        share = current / max(current_total, 1)
+        previous_share = previous / max(previous_total, 1)
+        growth = np.divide(share - previous_share, previous_share, out=np.full(len(share), np.nan),
+                           where=previous_share > 0)
+        pooled = (current + previous) / max(current_total + previous_total, 1)
+        spread = np.sqrt(pooled * (1 - pooled) * (1 / max(current_total, 1) + 1 / max(previous_total, 1)))
+        z = np.divide(share - previous_share, spread, out=np.zeros(len(share)), where=spread > 0)
+        if previous_total == 0:
+            z[:] = 0
+        return pd.DataFrame({'Skill': self.timeline.skills.vocabulary, 'Postings': current,
+                             'Previous Postings': previous, 'Share': share, 'Previous Share': previous_share,
+                             'Growth': growth, 'Z': z})
+
+    def emerging(self, window=30, k=10, min_postings=1):
+        """The ``k`` skills whose share rose most significantly; ``declining`` is the reverse."""
+        scores = self.scores(window)
+        scores = scores[(scores['Postings'] >= min_postings) & (scores['Z'] > 0)]
+        return scores.sort_values('Z', ascending=False, kind='stable').head(k)
+
+    def declining(self, window=30, k=10, min_postings=1):
+        scores = self.scores(window)
+        scores = scores[(scores['Previous Postings'] >= min_postings) & (scores['Z'] < 0)]
+        return scores.sort_values('Z', kind='stable').head(k)
+
+    def has_history(self, window):
+        """Whether the data spans two full windows, which a fair comparison needs."""
+        return self.days >= 2 * window
@@ -0,0 +1,133 @@
+"""Append-only storage for feedback, chatbot logs and user profiles.
+
+Writes from the Streamlit script thread go through ``BackgroundWriter``:
+the caller only enqueues a record, and a single daemon thread appends
+batches to disk. Because one thread owns all file handles, concurrent
+sessions can never interleave partial lines.
+"""
+import atexit
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+FEEDBACK_PATH = "feedback.csv"
+FEEDBACK_HEADER = ["Timestamp", "Rating", "Feedback"]
+UNRECOGNIZED_PATH = "unrecognized_inputs.csv"
+UNRECOGNIZED_HEADER = ["Timestamp", "Input"]
+PROFILES_PATH = "user_profiles.jsonl"
+
+_FLUSH = object()
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Queue of pending appends flushed by a background thread.
+
+    Records are written once ``flush_interval`` seconds have passed since the
+    first pending record or ``max_batch`` records are waiting, whichever comes
+    first. With ``fsync=True`` each batch is also forced to stable storage.
+    """
+
+    def __init__(self, flush_interval=1.0, max_batch=500, fsync=False):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append_csv(self, path, row, header=None):
+        """Queue one CSV row; ``header`` is written first if the file is new or empty."""
+        self._queue.put((path, 'csv', list(row), header))
+
+    def append_jsonl(self, path, record):
+        self._queue.put((path, 'jsonl', record, None))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is on disk (for shutdown and scripts)."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put((_STOP, done))
+            done.wait(timeout)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and batch[-1][0] not in (_FLUSH, _STOP):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            records = [item for item in batch if item[0] not in (_FLUSH, _STOP)]
+            try:
+                self._write(records)
+            except Exception as e:
+                logging.error(f"Background writer failed to write {len(records)} records: {str(e)}")
+            control = batch[-1]
+            if control[0] in (_FLUSH, _STOP):
+                control[1].set()
+                if control[0] is _STOP:
+                    return
+
+    def _write(self, records):
+        by_path = {}
+        for path, kind, payload, header in records:
+            by_path.setdefault(path, []).append((kind, payload, header))
+        for path, items in by_path.items():
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "a", encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                for kind, payload, header in items:
+                    if kind == 'csv':
+                        if is_new and header:
+                            writer.writerow(header)
+                        writer.writerow(payload)
+                    else:
+                        f.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+                    is_new = False
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+
+def profile_user(profile):
+    """Key a profile by email, falling back to name."""
+    return (profile.get("email") or profile.get("name") or "").strip().lower()
+
+
+def save_profile(writer, profile, path=PROFILES_PATH):
+    """Queue a per-user profile record; the latest record for a user wins on load."""
+    writer.append_jsonl(path, {"user": profile_user(profile), "saved_at": time.time(), "profile": profile})
+
+
+def load_profiles(path=PROFILES_PATH):
+    """Return ``{user: profile}`` with the most recent record for each user."""
+    profiles = {}
+    if not os.path.exists(path):
+        return profiles
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("user"):
+                profiles[record["user"]] = record["profile"]
+    return profiles
@@ -0,0 +1,164 @@
+"""Synthetic job postings with the same 15-column schema as the real dataset.
+
+Used by benchmark.py to see how the dashboard scales beyond the 20k-row
+sample. Values use the sample's formats ("JOB12", "5-8 LPA", "2-5 years",
+"C++, SQL, Python", ISO dates) but with less uniform distributions:
+companies and skills follow Zipf-like popularity, each title draws most of
+its skills from a core set, skill lists vary in length, salary follows
+experience, and posting volume grows over the period with quieter
+weekends. Rows are generated in vectorised chunks, so 20M rows can be
+written without holding them all in memory.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Job ID', 'Job Title', 'Company Name', 'Job Location', 'Job Type', 'Salary Range',
+           'Experience Required', 'Posted Date', 'Application Deadline', 'Job Portal', 'Number of Applicants',
+           'Education Requirement', 'Skills Required', 'Remote/Onsite', 'Company Size']
+SIZES = {'20k': 20_000, '200k': 200_000, '2M': 2_000_000, '20M': 20_000_000}
+
+TITLE_SKILLS = {
+    'Software Engineer': ['Python', 'Java', 'C++', 'SQL', 'AWS', 'Docker', 'Git'],
+    'Data Scientist': ['Python', 'Machine Learning', 'SQL', 'Statistics', 'Deep Learning', 'Pandas'],
+    'Product Manager': ['Product Strategy', 'Agile', 'SQL', 'Communication', 'Jira'],
+    'Business Analyst': ['Excel', 'SQL', 'Power BI', 'Tableau', 'Communication'],
+    'Cyber Security Analyst': ['Network Security', 'Linux', 'Python', 'SIEM', 'Cloud Security'],
+    'Graphic Designer': ['UI/UX', 'Photoshop', 'Illustrator', 'Figma'],
+    'Financial Analyst': ['Excel', 'Financial Modeling', 'SQL', 'Power BI', 'Accounting'],
+    'Marketing Executive': ['SEO', 'Digital Marketing', 'Content Writing', 'Excel', 'Communication'],
+    'HR Manager': ['Recruitment', 'Communication', 'Excel', 'Payroll'],
+    'Sales Representative': ['Negotiation', 'CRM', 'Communication', 'Excel'],
+    'Machine Learning Engineer': ['Python', 'Machine Learning', 'Deep Learning', 'TensorFlow', 'Docker'],
+    'DevOps Engineer': ['AWS', 'Docker', 'Kubernetes', 'Linux', 'Terraform', 'Git'],
+    'Frontend Developer': ['React', 'JavaScript', 'TypeScript', 'UI/UX', 'CSS'],
+    'Backend Developer': ['Java', 'Python', 'SQL', 'Node.js', 'AWS', 'Docker'],
+}
+TITLES = list(TITLE_SKILLS)
+SKILLS = sorted({skill for skills in TITLE_SKILLS.values() for skill in skills}
+                | {'Go', 'Rust', 'Scala', 'Spark', 'Kotlin', 'Azure', 'GCP', 'MongoDB', 'Redis', 'R'})
+COMPANIES = ['TCS', 'Infosys', 'Wipro', 'HCL', 'Accenture', 'Amazon', 'Google', 'Microsoft', 'IBM', 'Deloitte',
+             'Cognizant', 'Tech Mahindra', 'Capgemini', 'Flipkart', 'Swiggy', 'Zomato', 'Paytm', 'Razorpay',
+             'Freshworks', 'Zoho', 'Ola', 'PhonePe', 'Byju\'s', 'Meesho', 'CRED', 'Oracle', 'SAP', 'Adobe',
+             'Intel', 'Cisco', 'KPMG', 'EY', 'PwC', 'Mindtree', 'LTIMindtree', 'Mphasis', 'Hexaware',
+             'Persistent', 'Coforge', 'Zensar']
+CITIES = ['Bangalore', 'Hyderabad', 'Pune', 'Mumbai', 'Chennai', 'Delhi', 'Noida', 'Gurgaon', 'Kolkata',
+          'Ahmedabad', 'Jaipur', 'Kochi', 'Indore', 'Chandigarh', 'Coimbatore']
+JOB_TYPES = (['Full-time', 'Contract', 'Internship', 'Part-time'], [0.7, 0.15, 0.1, 0.05])
+EXPERIENCE = (['0-2 years', '2-5 years', '5-10 years', '10+ years'], [0.3, 0.4, 0.22, 0.08])
+SALARIES = ['3-5 LPA', '5-8 LPA', '8-12 LPA', '12-20 LPA', '20+ LPA']
+PORTALS = (['Naukri.com', 'LinkedIn', 'Indeed'], [0.45, 0.35, 0.2])
+EDUCATION = (['B.Tech', 'B.Sc', 'MBA', 'M.Tech', 'PhD'], [0.45, 0.2, 0.17, 0.13, 0.05])
+WORK_MODES = (['Onsite', 'Hybrid', 'Remote'], [0.5, 0.3, 0.2])
+COMPANY_SIZES = (['Small (1-50)', 'Medium (51-500)', 'Large (500+)'], [0.2, 0.35, 0.45])
+
+
+def zipf_weights(n, exponent=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def skill_pool(rng, combos_per_title=200):
+    """Distinct skill lists per title, as (title code, skills text) pairs, most common first."""
+    popularity = dict(zip(SKILLS, rng.permutation(zipf_weights(len(SKILLS), 0.8))))
+    pool = []
+    for title_code, title in enumerate(TITLES):
+        weights = np.array([popularity[skill] * (12 if skill in TITLE_SKILLS[title] else 1) for skill in SKILLS])
+        weights /= weights.sum()
+        for _ in range(combos_per_title):
+            size = int(np.clip(rng.poisson(3), 1, 6))
+            pool.append((title_code, ", ".join(rng.choice(SKILLS, size=size, replace=False, p=weights))))
+    return pool
+
+
+def day_weights(days, growth=1.0):
+    """Posting volume per day: linear growth over the period, weekends at 40%."""
+    dates = pd.date_range(end=pd.Timestamp('2025-01-22'), periods=days, freq='D')
+    weights = (1 + growth * np.linspace(0, 1, days)) * np.where(dates.dayofweek >= 5, 0.4, 1.0)
+    return dates, weights / weights.sum()
+
+
+def _choice(rng, options, n):
+    values, weights = options
+    return pd.Categorical.from_codes(rng.choice(len(values), size=n, p=weights), categories=values)
+
+
+def generate(n, seed=0, days=365, chunk_size=1_000_000):
+    """Yield ``n`` synthetic postings as DataFrame chunks of at most ``chunk_size`` rows."""
+    rng = np.random.default_rng(seed)
+    pool = skill_pool(rng)
+    skill_lists = list(dict.fromkeys(text for _, text in pool))
+    list_codes = {text: code for code, text in enumerate(skill_lists)}
+    per_title = {code: np.array([list_codes[text] for title, text in pool if title == code])
+                 for code in range(len(TITLES))}
+    dates, date_weights = day_weights(days)
+    title_weights = zipf_weights(len(TITLES), 0.6)
+    company_weights = zipf_weights(len(COMPANIES))
+    city_weights = zipf_weights(len(CITIES), 0.9)
+
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        titles = rng.choice(len(TITLES), size=size, p=title_weights)
+        # Within a title, the pool is ranked so a few skill lists dominate.
+        skill_codes = np.empty(size, dtype=np.int64)
+        for code, members in per_title.items():
+            rows = np.flatnonzero(titles == code)
+            skill_codes[rows] = members[rng.choice(len(members), size=len(rows), p=zipf_weights(len(members)))]
+        experience = rng.choice(len(EXPERIENCE[0]), size=size, p=EXPERIENCE[1])
+        salary = np.clip(experience + rng.integers(-1, 2, size=size), 0, len(SALARIES) - 1)
+        posted = dates.values[rng.choice(len(dates), size=size, p=date_weights)]
+        deadline = posted + rng.integers(7, 31, size=size).astype('timedelta64[D]')
+        applicants = np.clip(rng.lognormal(5.0, 0.8, size=size), 1, 5000).astype(np.int64)
+        yield pd.DataFrame({
+            'Job ID': 'JOB' + pd.Series(np.arange(start + 1, start + size + 1)).astype(str),
+            'Job Title': pd.Categorical.from_codes(titles, categories=TITLES),
+            'Company Name': pd.Categorical.from_codes(rng.choice(len(COMPANIES), size=size, p=company_weights),
+                                                      categories=COMPANIES),
+            'Job Location': pd.Categorical.from_codes(rng.choice(len(CITIES), size=size, p=city_weights),
+                                                      categories=CITIES),
+            'Job Type': _choice(rng, JOB_TYPES, size),
+            'Salary Range': pd.Categorical.from_codes(salary, categories=SALARIES),
+            'Experience Required': pd.Categorical.from_codes(experience, categories=EXPERIENCE[0]),
+            'Posted Date': pd.to_datetime(posted).strftime('%Y-%m-%d'),
+            'Application Deadline': pd.to_datetime(deadline).strftime('%Y-%m-%d'),
+            'Job Portal': _choice(rng, PORTALS, size),
+            'Number of Applicants': applicants,
+            'Education Requirement': _choice(rng, EDUCATION, size),
+            'Skills Required': pd.Categorical.from_codes(skill_codes, categories=skill_lists),
+            'Remote/Onsite': _choice(rng, WORK_MODES, size),
+            'Company Size': _choice(rng, COMPANY_SIZES, size),
+        }, columns=COLUMNS)
+
+
+def generate_frame(n, seed=0, days=365):
+    return pd.concat(generate(n, seed, days), ignore_index=True)
+
+
+def write_csv(n, path, seed=0, days=365, chunk_size=1_000_000):
+    """Write ``n`` synthetic postings to ``path`` chunk by chunk."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".partial"
+    for i, chunk in enumerate(generate(n, seed, days, chunk_size)):
+        chunk.to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def parse_size(text):
+    """Accept "20k", "2M" or a plain row count."""
+    if text in SIZES:
+        return SIZES[text]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1].lower(), 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic job postings CSV.")
+    parser.add_argument("rows", help='row count, e.g. 20000, "200k" or "2M"')
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+    write_csv(parse_size(args.rows), args.path, args.seed, args.days)
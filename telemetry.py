@@ -0,0 +1,193 @@
+"""Process-wide performance telemetry: stage timings, cache hit rates and RSS.
+
+``TELEMETRY`` is created once when the module is first imported, so every
+session and rerun of the Streamlit script reports into the same registry.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def current_rss():
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageStats:
+    """Running count/total/max plus a window of recent samples for percentiles."""
+
+    def __init__(self, window=200):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = np.array(self.recent) if self.recent else np.zeros(1)
+        return {"count": self.count, "total_s": round(self.total, 4),
+                "mean_ms": round(1000 * self.total / max(self.count, 1), 2),
+                "p50_ms": round(1000 * float(np.percentile(recent, 50)), 2),
+                "p95_ms": round(1000 * float(np.percentile(recent, 95)), 2),
+                "max_ms": round(1000 * self.max, 2)}
+
+
+class Telemetry:
+    """Stage timings keyed by ``(section, stage)`` and hit/miss counts per cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._caches = {}
+        self.started = time.time()
+
+    def record(self, section, stage, seconds):
+        with self._lock:
+            self._stages.setdefault((section, stage), StageStats()).add(seconds)
+
+    @contextmanager
+    def stage(self, section, stage):
+        """Time the enclosed block as ``stage`` of ``section`` (e.g. a page)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, stage, time.perf_counter() - start)
+
+    def cache_event(self, name, hit):
+        with self._lock:
+            counts = self._caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def track_cache(self, name, cache):
+        """Wrap a cache decorator such as ``st.cache_data`` to count hits and misses.
+
+        The inner function only runs on a miss, so hits are calls minus misses.
+        """
+        def decorate(func):
+            state = threading.local()
+
+            @functools.wraps(func)
+            def on_miss(*args, **kwargs):
+                state.missed = True
+                return func(*args, **kwargs)
+
+            cached = cache(on_miss)
+
+            @functools.wraps(func)
+            def call(*args, **kwargs):
+                state.missed = False
+                result = cached(*args, **kwargs)
+                self.cache_event(name, hit=not state.missed)
+                return result
+
+            call.clear = getattr(cached, "clear", None)
+            return call
+        return decorate
+
+    def snapshot(self, extra=None):
+        """Machine-readable dump of everything recorded so far."""
+        with self._lock:
+            stages = [{"section": section, "stage": stage, **stats.summary()}
+                      for (section, stage), stats in sorted(self._stages.items())]
+            caches = [{"cache": name, "hits": hits, "misses": misses,
+                       "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None}
+                      for name, (hits, misses) in sorted(self._caches.items())]
+        snapshot = {"timestamp": time.time(), "uptime_s": round(time.time() - self.started, 1),
+                    "rss_bytes": current_rss(), "stages": stages, "caches": caches}
+        snapshot.update(extra or {})
+        return snapshot
+
+    def dump(self, path, extra=None):
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump(self.snapshot(extra), f, indent=2, default=str)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._caches.clear()
+
+
+class RerunProfiler:
+    """cProfile capture of a single script run, or pyinstrument when installed.
+
+    A run ended by ``st.rerun``, ``st.stop`` or an exception never reaches
+    the end of the script, so at most one profiler runs at a time: ``start``
+    first stops whichever profiler was left running, and ``stop`` may be
+    called again to get the same report.
+    """
+
+    _active = None
+    _lock = threading.Lock()
+
+    def __init__(self, engine="cprofile"):
+        self.engine = engine
+        self.report = None
+        if engine == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        with RerunProfiler._lock:
+            previous, RerunProfiler._active = RerunProfiler._active, self
+        if previous is not None:
+            previous.stop()
+        if self.engine == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self, limit=40):
+        """Stop profiling and return a text report."""
+        with RerunProfiler._lock:
+            if self.report is not None:
+                return self.report
+            if RerunProfiler._active is self:
+                RerunProfiler._active = None
+            if self.engine == "pyinstrument":
+                self._profiler.stop()
+                self.report = self._profiler.output_text(unicode=True)
+            else:
+                self._profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+                self.report = out.getvalue()
+        return self.report
+
+
+def pyinstrument_available():
+    try:
+        import pyinstrument  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+TELEMETRY = Telemetry()
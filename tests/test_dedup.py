@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dedup import DuplicateDetector
+from job_data import compact_frame
+from synthetic_data import generate_frame
+
+
+@pytest.fixture(scope="module")
+def frame():
+    frame = generate_frame(1500, days=60)
+    # Relist a third of the postings on another portal, so there are clusters to find.
+    relisted = frame.sample(500, random_state=0).assign(**{'Job Portal': 'Elsewhere'})
+    return compact_frame(pd.concat([frame, relisted], ignore_index=True).sample(frac=1, random_state=1)
+                         .reset_index(drop=True))
+
+
+@pytest.mark.parametrize("splits", [[1000], [10, 700, 1999]])
+def test_add_matches_a_full_build(frame, splits):
+    full = DuplicateDetector(frame)
+    bounds = [0] + splits + [len(frame)]
+    detector = DuplicateDetector(frame.iloc[:bounds[1]])
+    for start, end in zip(bounds[1:], bounds[2:]):
+        detector.add(frame.iloc[start:end])
+    assert full.flags.sum() >= 400
+    np.testing.assert_array_equal(detector.clusters, full.clusters)
+    np.testing.assert_array_equal(detector.flags, full.flags)
+
+
+def posting(**changes):
+    base = {'Job Title': "Data Scientist", 'Company Name': "TCS", 'Job Location': "Pune",
+            'Skills Required': "Python, SQL", 'Posted Date': "2025-01-06", 'Job Portal': "LinkedIn"}
+    return dict(base, **changes)
+
+
+def test_threshold_on_known_near_duplicates():
+    frame = pd.DataFrame([
+        posting(),
+        posting(**{'Job Portal': "Naukri.com", 'Posted Date': "2025-01-07"}),  # same tokens: Jaccard 1
+        posting(**{'Job Portal': "Indeed", 'Skills Required': "Python, SQL, Excel"}),  # 9 of 12 tokens: 0.75
+        posting(**{'Job Portal': "Indeed", 'Job Location': "Mumbai"}),  # 8 of 12 tokens: 0.67
+    ])
+    # Two rows per band, so every pair above 0.5 similarity is a candidate and only the threshold decides.
+    strict = DuplicateDetector(frame, threshold=0.8, bands=32)
+    assert strict.clusters.tolist() == [0, 0, 2, 3]
+    assert strict.flags.tolist() == [False, True, False, False]
+    loose = DuplicateDetector(frame, threshold=0.7, bands=32)
+    assert loose.clusters.tolist() == [0, 0, 0, 3]
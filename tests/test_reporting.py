@@ -0,0 +1,18 @@
+import io
+import zipfile
+
+from job_data import JobDataset, compact_frame
+from reporting import report_bundle, unique_slugs
+from synthetic_data import generate_frame
+
+
+def test_unique_slugs_suffix_repeats():
+    assert unique_slugs(["C++", "C", "UI/UX", "UI UX", "c", "C 2"]) == ["c", "c-2", "ui-ux", "ui-ux-2", "c-3", "c-2-2"]
+
+
+def test_bundle_keeps_values_that_slug_alike_apart():
+    frame = generate_frame(200)
+    frame['Job Location'] = ["UI/UX" if i % 2 else "UI UX" for i in range(len(frame))]
+    bundle = zipfile.ZipFile(io.BytesIO(report_bundle(JobDataset(compact_frame(frame)), ['Job Location'],
+                                                      formats=('md',))))
+    assert {"job-location/ui-ux.md", "job-location/ui-ux-2.md"} <= set(bundle.namelist())
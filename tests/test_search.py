@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from job_data import JobDataset
+from search import SearchIndex
+from synthetic_data import write_csv
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    return JobDataset.load(write_csv(500, str(tmp_path_factory.mktemp("data") / "jobs.csv")))
+
+
+@pytest.mark.parametrize("query", ["", "   ", "!!!", "- / ?"])
+def test_query_without_words_is_no_filter(dataset, query):
+    assert dataset.filter_rows(query=query) is None
+    cities = tuple(dataset.frame['Job Location'].cat.categories[:1])
+    np.testing.assert_array_equal(dataset.filter_rows(cities=cities, query=query), dataset.filter_rows(cities=cities))
+
+
+@pytest.mark.parametrize("query", ["", "!!!"])
+def test_search_without_words_matches_every_row(dataset, query):
+    positions, scores = dataset.search_index.search(query, limit=None)
+    np.testing.assert_array_equal(positions, np.arange(len(dataset)))
+    assert not scores.any()
+    rows = np.array([3, 1, 4], dtype=np.int32)
+    np.testing.assert_array_equal(dataset.search_index.search(query, rows, limit=2)[0], rows[:2])
+
+
+def test_query_with_words_still_filters(dataset):
+    title = str(dataset.frame['Job Title'].iloc[0])
+    rows = dataset.filter_rows(query=title + " !!!")
+    assert 0 < len(rows) < len(dataset)
+    np.testing.assert_array_equal(rows, np.sort(dataset.search_index.search(title, limit=None)[0]))
+
+
+def test_add_indexes_new_postings_like_a_rebuild(dataset):
+    frame = dataset.frame.iloc[:300]
+    index = SearchIndex(frame)
+    new = frame.iloc[:2].astype(object).assign(**{'Job Title': ["Quantum Wrangler", "Data Scientist"],
+                                                  'Company Name': ["Zyxcorp", "Zyxcorp"]})
+    index.add(new)
+    rebuilt = SearchIndex(pd.concat([frame.astype(object), new], ignore_index=True))
+    assert len(index) == 302
+    for query, expected in [("wrangler", [300]), ("quant", [300]), ("rangl", [300]), ("zyxcorp", [300, 301]),
+                            ("corp wrangl", [300])]:
+        positions, scores = index.search(query, limit=None)
+        assert positions.tolist() == expected
+        np.testing.assert_allclose(scores, rebuilt.search(query, limit=None)[1])
+    positions, scores = index.search("data scientist")
+    expected_positions, expected_scores = rebuilt.search("data scientist")
+    np.testing.assert_array_equal(positions, expected_positions)
+    np.testing.assert_allclose(scores, expected_scores)
+    assert 301 in index.search("data scientist", limit=None)[0]
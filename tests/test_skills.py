@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from skills import SkillMatrix, SkillTimeline, SkillTrends
+from synthetic_data import generate_frame
+
+
+@pytest.fixture
+def frame():
+    return generate_frame(400, days=60)
+
+
+def added_postings(frame, dates):
+    return pd.DataFrame({'Skills Required': frame['Skills Required'].iloc[:len(dates)].to_numpy(),
+                         'Posted Date': pd.to_datetime(dates)})
+
+
+def rebuilt(frame, added):
+    # Same vocabulary: the added skill lists are taken from the frame.
+    combined = pd.concat([frame[['Skills Required', 'Posted Date']], added], ignore_index=True)
+    return SkillTimeline(SkillMatrix(combined['Skills Required']), combined['Posted Date'])
+
+
+@pytest.mark.parametrize("offsets", [[10, 10, 13], [0, 0, -3], [-1, 25]], ids=["gap", "same day", "both"])
+def test_incremental_trends_match_a_rebuild(frame, offsets):
+    timeline = SkillTimeline(SkillMatrix(frame['Skills Required']), frame['Posted Date'])
+    trends = SkillTrends(timeline)
+    trends.scores(7)
+    last_day = pd.to_datetime(frame['Posted Date']).max().normalize()
+    added = added_postings(frame, [last_day + pd.Timedelta(days=offset) for offset in offsets])
+    timeline.add(added['Skills Required'], added['Posted Date'])
+
+    expected = rebuilt(frame, added)
+    np.testing.assert_array_equal(timeline.matrix, expected.matrix)
+    np.testing.assert_array_equal(timeline.totals, expected.totals)
+    for window in SkillTrends.WINDOWS:
+        pd.testing.assert_frame_equal(trends.scores(window), SkillTrends(expected).scores(window))
@@ -0,0 +1,87 @@
+"""Persistent job application tracker backed by SQLite.
+
+Only the posting's ``Job ID`` is stored, together with the user, status,
+notes and timestamps; posting details are joined from the shared dataset
+when the tracker is displayed.
+"""
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+TRACKER_PATH = "tracker.db"
+STATUSES = ["Not Applied", "Applied", "Interview", "Offer", "Rejected"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    user TEXT NOT NULL,
+    job_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    saved_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (user, job_id)
+)
+"""
+
+
+def _now():
+    return pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class ApplicationTracker:
+    """Per-user saved jobs keyed by ``(user, Job ID)``.
+
+    A short-lived connection is opened per operation so the tracker can be
+    shared by every session thread; WAL mode lets readers run alongside a writer.
+    """
+
+    def __init__(self, path=TRACKER_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def save(self, user, job_id, status, notes=""):
+        """Insert or update one saved job, keeping its original save time."""
+        now = _now()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO applications (user, job_id, status, notes, saved_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user, job_id) DO UPDATE SET status = excluded.status, "
+                "notes = excluded.notes, updated_at = excluded.updated_at",
+                (user, int(job_id), status, notes, now, now))
+
+    def update_status(self, user, job_ids, status):
+        """Set ``status`` on several saved jobs in one transaction; returns rows changed."""
+        now = _now()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.executemany(
+                "UPDATE applications SET status = ?, updated_at = ? WHERE user = ? AND job_id = ?",
+                [(status, now, user, int(job_id)) for job_id in job_ids])
+            return cursor.rowcount
+
+    def remove(self, user, job_ids):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM applications WHERE user = ? AND job_id = ?",
+                             [(user, int(job_id)) for job_id in job_ids])
+
+    def saved(self, user):
+        """The user's saved jobs as a frame of IDs, statuses, notes and timestamps."""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT job_id AS 'Job ID', status AS 'Status', notes AS 'Notes', saved_at AS 'Saved Date', "
+                "updated_at AS 'Updated Date' FROM applications WHERE user = ? ORDER BY saved_at DESC",
+                conn, params=(user,))
+
+    def saved_with_details(self, user, dataset):
+        """Join the user's saved jobs against the postings of ``dataset``."""
+        saved = self.saved(user)
+        positions = dataset.positions_of(saved['Job ID'])
+        found = positions >= 0
+        details = dataset.frame.take(positions[found]).reset_index(drop=True)
+        return pd.concat([details, saved[found].drop(columns='Job ID').reset_index(drop=True)], axis=1)